@@ -4,7 +4,7 @@ from core.reports import (
     economic_report, economic_report_event, EventReportInput, CountryReportInput,
     generate_clarifying_questions, open_research_report, ClarifyingQuestionsInput, OpenResearchReportInput
 )
-from core.pipeline import run_pipeline, PipelineInput
+from core.pipeline import submit_pipeline, get_pipeline_job, PipelineInput
 from core.report_chat import economic_report_chat, ChatRequest
 from models import CountryData, Report
 from db.data import fetch_country_data, addable_countries, delete_country_data, update_country_data
@@ -42,17 +42,20 @@ class CountryPipelineRequest(BaseModel):
     area_of_interest: str = Field(default="")
 
 
-@router.post("/run-country-pipeline")
+@router.post("/run-country-pipeline", status_code=202)
 @limiter.limit(settings.RATE_LIMITS["run_country_pipeline"])
 async def run_country_pipeline(request: Request, input_data: CountryPipelineRequest, user: User = Depends(current_active_user)):
     """
-    Run the country pipeline for data processing.
+    Start the country pipeline for data processing, without waiting for it to finish.
+
+    The country's events appear in its data as clusters are summarized; the job can be followed
+    with GET /pipeline-jobs/{job_id}.
 
     Args:
         input_data (CountryPipelineRequest): The input data for the pipeline.
 
     Returns:
-        dict: A dictionary containing the status and result of the pipeline execution.
+        dict: A dictionary containing the status and the ID of the pipeline job.
 
     Raises:
         HTTPException: If the country is not in the addable countries list or if there's an error during execution.
@@ -82,26 +85,56 @@ async def run_country_pipeline(request: Request, input_data: CountryPipelineRequ
 
         logger.info(f"Running pipeline with user_id: {pipeline_input.user_id}")
 
-        result = await run_pipeline(pipeline_input)
+        job_id = await submit_pipeline(pipeline_input)
 
         # Add the country to the user's list if it's not already there
         if input_data.country not in user.countries:
             user.countries.append(input_data.country)
             await user.save()
 
-        return {"status": "success", "result": result}
+        return {"status": "accepted", "job_id": job_id}
     except Exception as e:
         logger.error(f"Error in run_country_pipeline: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/pipeline-jobs/{job_id}")
+async def get_country_pipeline_job(job_id: str, user: User = Depends(current_active_user)):
+    """
+    Retrieve the status and progress of a country pipeline job.
+
+    Args:
+        job_id (str): The ID of the job, as returned by /run-country-pipeline.
+
+    Returns:
+        dict: The job's status ("queued", "running", "succeeded" or "failed"), current stage,
+            per-stage progress, result and error.
+
+    Raises:
+        HTTPException: 404 if the job is unknown (e.g. lost when the pipeline server restarted)
+            or belongs to another user.
+    """
+    try:
+        job = await get_pipeline_job(job_id)
+        if job.get("params", {}).get("user_id") != str(user.id):
+            raise HTTPException(
+                status_code=404, detail="Pipeline job not found")
+        return {key: job.get(key) for key in ("id", "status", "stage", "progress", "result", "error")}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            f"Error in get_country_pipeline_job: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/countries")
 async def get_countries(user: User = Depends(current_active_user)):
     """
     Retrieve a list of all countries with their latest data.
 
     Returns:
-        list: A list of dictionaries containing country information including name, timestamp, hours, and number of relevant events.
+        list: A list of dictionaries containing country information including name, timestamp, hours, number of relevant events, and run status.
     """
     try:
         countries = await fetch_country_data(str(user.id))
@@ -111,7 +144,8 @@ async def get_countries(user: User = Depends(current_active_user)):
                     "name": country,
                     "timestamp": data.timestamp.isoformat(),
                     "hours": data.hours,
-                    "no_relevant_events": data.no_relevant_events
+                    "no_relevant_events": data.no_relevant_events,
+                    "status": data.status
                 }
                 for country, data in countries.items()
             ],
@@ -22,6 +22,9 @@ class BaseConfig(BaseSettings):
     CORS_ORIGINS: List[str] = Field(default_factory=list)
     REPORT_SERVER_URL: str = "http://report_server:8001"
     NEWS_PIPELINE_SERVER_URL: str = "http://news_pipeline_server:8002"
+    NEWS_PIPELINE_POLL_INTERVAL: float = 5.0
+    NEWS_PIPELINE_TIMEOUT: float = 450.0
+    NEWS_PIPELINE_STALE_RUN_AFTER: float = 1800.0
     REPORT_CHAT_SERVER_URL: str = "http://research_chat:8003"
     DATA_CHAT_SERVER_URL: str = "http://data_chat:8004"
     MAIL_USERNAME: str
@@ -1,4 +1,6 @@
 import httpx
+import asyncio
+import time
 from datetime import datetime
 from fastapi import HTTPException
 import os
@@ -62,20 +64,23 @@ class PipelineInput(BaseModel):
         return payload
 
 
-async def run_pipeline(pipeline_input: PipelineInput):
+async def submit_pipeline(pipeline_input: PipelineInput) -> str:
     """
-    Run the news pipeline for processing country data.
+    Submit a news pipeline run as a job to the news pipeline server, without waiting for it.
+
+    Cluster summaries are written to the database as the job runs; the job itself can be
+    followed with get_pipeline_job.
 
     Args:
         pipeline_input (PipelineInput): The input parameters for the pipeline.
 
     Returns:
-        dict: The result of the pipeline execution.
+        str: The ID of the job.
 
     Raises:
-        HTTPException: If there's an error communicating with the news pipeline server or during execution.
+        HTTPException: If there's an error communicating with the news pipeline server.
     """
-    async with httpx.AsyncClient(timeout=450.0) as client:
+    async with httpx.AsyncClient(timeout=30.0) as client:
         try:
             news_pipeline_server_url = settings.NEWS_PIPELINE_SERVER_URL
             logger.info(
@@ -84,14 +89,49 @@ async def run_pipeline(pipeline_input: PipelineInput):
             payload = pipeline_input.generate_payload()
 
             response = await client.post(
-                f"{news_pipeline_server_url}/run_pipeline",
+                f"{news_pipeline_server_url}/jobs",
                 json=payload
             )
             response.raise_for_status()
+            job_id = response.json()["job_id"]
+            logger.info(f"Submitted pipeline job {job_id}")
+            return job_id
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Graph server error: {e}")
+            raise HTTPException(
+                status_code=500, detail=f"Graph server error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise HTTPException(
+                status_code=500, detail=f"Unexpected error: {str(e)}")
 
-            result = response.json()
-            logger.info("Pipeline execution completed successfully")
-            return result
+
+async def get_pipeline_job(job_id: str) -> dict:
+    """
+    Get the status, per-stage progress and result (or error) of a pipeline job.
+
+    Args:
+        job_id (str): The ID of the job, as returned by submit_pipeline.
+
+    Returns:
+        dict: The job, as reported by the news pipeline server.
+
+    Raises:
+        HTTPException: 404 if the server does not know the job (e.g. it was lost when the server
+            restarted), or 500 if there's an error communicating with the server.
+    """
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        try:
+            response = await client.get(
+                f"{settings.NEWS_PIPELINE_SERVER_URL}/jobs/{job_id}")
+            if response.status_code == 404:
+                logger.warning(f"Pipeline job {job_id} not found")
+                raise HTTPException(
+                    status_code=404, detail="Pipeline job not found. It may have been lost when the pipeline server restarted.")
+            response.raise_for_status()
+            return response.json()
+        except HTTPException:
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"Graph server error: {e}")
             raise HTTPException(
@@ -100,3 +140,39 @@ async def run_pipeline(pipeline_input: PipelineInput):
             logger.error(f"Unexpected error: {e}")
             raise HTTPException(
                 status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+async def run_pipeline(pipeline_input: PipelineInput):
+    """
+    Run the news pipeline for processing country data, and wait for it to finish.
+
+    The job is polled every NEWS_PIPELINE_POLL_INTERVAL seconds. Prefer submit_pipeline for
+    user-facing requests, which should not wait for a whole run.
+
+    Args:
+        pipeline_input (PipelineInput): The input parameters for the pipeline.
+
+    Returns:
+        dict: The result of the pipeline execution.
+
+    Raises:
+        HTTPException: 404 if the job is lost, 500 if it fails or the news pipeline server can't be
+            reached, or 504 if it does not finish within NEWS_PIPELINE_TIMEOUT seconds.
+    """
+    job_id = await submit_pipeline(pipeline_input)
+    deadline = time.monotonic() + settings.NEWS_PIPELINE_TIMEOUT
+    while True:
+        await asyncio.sleep(settings.NEWS_PIPELINE_POLL_INTERVAL)
+        job = await get_pipeline_job(job_id)
+        if job["status"] == "succeeded":
+            logger.info("Pipeline execution completed successfully")
+            return {"status": "success", "job_id": job_id, "result": job["result"]}
+        if job["status"] == "failed":
+            logger.error(f"Pipeline job {job_id} failed: {job['error']}")
+            raise HTTPException(
+                status_code=500, detail=f"Pipeline job failed: {job['error']}")
+        if time.monotonic() > deadline:
+            raise HTTPException(
+                status_code=504, detail=f"Pipeline job {job_id} did not finish in time")
+        logger.info(
+            f"Pipeline job {job_id} is {job['status']} at stage {job['stage']}: {job['progress'].get(job['stage'])}")
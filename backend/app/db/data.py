@@ -8,7 +8,7 @@ import logging
 from config import settings
 from core.pipeline import run_pipeline, PipelineInput
 from auth.auth_db import User
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -77,19 +77,39 @@ async def fetch_country_data(user_id: str) -> Dict[str, CountryData]:
     """
     Fetch country data from the MongoDB database.
 
+    Runs that are still in progress are served with the clusters summarized so far and status
+    "running"; failed runs are skipped. A run whose document has not been updated for
+    NEWS_PIPELINE_STALE_RUN_AFTER seconds is treated as abandoned (its process died) and skipped too.
+    When a country has several runs, the latest one is used, except that a running run only
+    replaces an earlier one once it has at least one cluster.
+
     Returns:
         dict: A dictionary where keys are country names and values are CountryData objects.
     """
     try:
         collection = await get_collection()
         country_data = {}
-        async for document in collection.find({"user_id": user_id}):
+        stale_before = datetime.utcnow() - \
+            timedelta(seconds=settings.NEWS_PIPELINE_STALE_RUN_AFTER)
+        query = {
+            "user_id": user_id,
+            "$or": [
+                # Documents written before runs had a status are complete
+                {"status": {"$exists": False}},
+                {"status": "complete"},
+                {"status": "running", "updated_at": {"$gte": stale_before}},
+            ]
+        }
+        async for document in collection.find(query).sort("_id", 1):
             data = document['summaries']
             cluster_article_summaries = ClusterArticleSummaries(**data)
             metadata = cluster_article_summaries.metadata
             clusters = cluster_article_summaries.clusters
 
             country = metadata.country_name
+            if document.get('status') == 'running' and not clusters and country in country_data:
+                # Keep serving the previous run until the new one has something to show
+                continue
             events = []
 
             for cluster_id, cluster_data in clusters.items():
@@ -128,7 +148,8 @@ async def fetch_country_data(user_id: str) -> Dict[str, CountryData]:
                 timestamp=timestamp,
                 hours=metadata.hours,
                 no_relevant_events=metadata.no_financially_relevant_events,
-                user_id=user_id
+                user_id=user_id,
+                status=document.get('status', 'complete')
             )
         return country_data
     except Exception as e:
@@ -139,12 +160,33 @@ async def fetch_country_data(user_id: str) -> Dict[str, CountryData]:
 
 async def delete_country_data(country: str, user_id: str) -> bool:
     collection = await get_collection()
-    result = await collection.delete_one(
+    # Every run keeps its own document (complete, failed or abandoned), so all of them are removed
+    result = await collection.delete_many(
         {"summaries.metadata.country_name": country, "user_id": user_id})
     logger.info(f"Deleted {result.deleted_count} documents for {country}")
     return True
 
 
+async def delete_superseded_country_data(country: str, user_id: str) -> int:
+    """
+    Delete every run of a country older than its latest complete run.
+
+    Returns:
+        int: The number of deleted documents.
+    """
+    collection = await get_collection()
+    query = {"summaries.metadata.country_name": country, "user_id": user_id}
+    latest = await collection.find_one(
+        {**query, "$or": [{"status": {"$exists": False}}, {"status": "complete"}]},
+        sort=[("_id", -1)])
+    if latest is None:
+        return 0
+    result = await collection.delete_many({**query, "_id": {"$lt": latest["_id"]}})
+    logger.info(
+        f"Deleted {result.deleted_count} superseded documents for {country}")
+    return result.deleted_count
+
+
 async def update_country_data(country: str, user_id: str, hours: int, area_of_interest: str):
     # Run the pipeline with new parameters
     pipeline_input = PipelineInput(
@@ -157,7 +199,7 @@ async def update_country_data(country: str, user_id: str, hours: int, area_of_in
 
     msg = await run_pipeline(pipeline_input)
 
-    # Delete the old data
-    await delete_country_data(country, user_id)
+    # Delete the old data, now that the new run is the latest complete one
+    await delete_superseded_country_data(country, user_id)
 
     return msg
@@ -51,6 +51,7 @@ class CountryData(BaseModel):
     hours: int
     no_relevant_events: int
     user_id: str
+    status: str = "complete"
 
 
 class Report(BaseModel):
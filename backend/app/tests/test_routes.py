@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
 from main import app
 from db.data import addable_countries
 import logging
@@ -39,10 +40,8 @@ async def test_get_countries(authenticated_client):
 
 @pytest.mark.asyncio
 async def test_run_country_pipeline(authenticated_client):
-    mock_pipeline_result = "Mocked pipeline result"
-
-    with patch('api.routes.run_pipeline', new_callable=AsyncMock) as mock_run_pipeline:
-        mock_run_pipeline.return_value = mock_pipeline_result
+    with patch('api.routes.submit_pipeline', new_callable=AsyncMock) as mock_submit_pipeline:
+        mock_submit_pipeline.return_value = "job-1"
 
         response = await authenticated_client.post("/run-country-pipeline", json={
             "country": "Brazil",
@@ -50,10 +49,43 @@ async def test_run_country_pipeline(authenticated_client):
             "area_of_interest": "Technology"
         })
 
+        assert response.status_code == 202
+        assert response.json() == {'status': 'accepted', 'job_id': 'job-1'}
+        mock_submit_pipeline.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_country_pipeline_job(authenticated_client):
+    with patch('api.routes.submit_pipeline', new_callable=AsyncMock) as mock_submit_pipeline:
+        mock_submit_pipeline.return_value = "job-1"
+        await authenticated_client.post("/run-country-pipeline", json={"country": "Brazil"})
+        user_id = mock_submit_pipeline.call_args.args[0].user_id
+
+    job = {"id": "job-1", "params": {"country": "Brazil", "user_id": user_id}, "status": "running",
+           "stage": "summarizing", "progress": {"summarizing": {"done": 1, "total": 4}},
+           "result": None, "error": None}
+    with patch('api.routes.get_pipeline_job', new_callable=AsyncMock) as mock_get_pipeline_job:
+        mock_get_pipeline_job.return_value = job
+        response = await authenticated_client.get("/pipeline-jobs/job-1")
         assert response.status_code == 200
-        assert response.json() == {'status': 'success',
-                                   'result': mock_pipeline_result}
-        mock_run_pipeline.assert_called_once()
+        assert response.json()["progress"] == {"summarizing": {"done": 1, "total": 4}}
+        assert "params" not in response.json()
+
+        # Jobs of other users are hidden
+        mock_get_pipeline_job.return_value = dict(job, params={"user_id": "someone-else"})
+        response = await authenticated_client.get("/pipeline-jobs/job-1")
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_country_pipeline_job_lost(authenticated_client):
+    with patch('api.routes.get_pipeline_job', new_callable=AsyncMock) as mock_get_pipeline_job:
+        mock_get_pipeline_job.side_effect = HTTPException(
+            status_code=404, detail="Pipeline job not found")
+
+        response = await authenticated_client.get("/pipeline-jobs/lost-job")
+
+        assert response.status_code == 404
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,72 @@
+"""
+Benchmark the single-pass clean_text against the previous implementation, which parsed every
+text as HTML and filtered non-printable characters one at a time.
+
+Usage:
+    poetry run python benchmarks/bench_clean_text.py [n_words]
+"""
+import sys
+import time
+import random
+import re
+
+from bs4 import BeautifulSoup
+
+from em_news_analysis.article_summarizer import clean_article_content, clean_text
+
+
+def clean_text_legacy(text: str, level: int = 1, max_words: int = 50000) -> str:
+    """
+    The previous clean_text.
+    """
+    text = BeautifulSoup(text, "html.parser").get_text()
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = ''.join(char for char in text if char.isprintable())
+    if level >= 2:
+        text = re.sub(r'(Cookie Policy|Privacy Policy|Terms of Service|Copyright ©)',
+                      '', text, flags=re.IGNORECASE)
+        text = re.sub(
+            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    if level >= 3:
+        text = re.sub(r'\S+@\S+', '', text)
+        text = re.sub(r'[^a-zA-Z0-9\s.,;:!?()"-]', '', text)
+    words = text.split()
+    if len(words) > max_words:
+        text = ' '.join(words[:max_words])
+    return text
+
+
+def make_article(n_words: int, seed: int = 0) -> str:
+    """
+    Extracted article text with the odd URL, email, boilerplate phrase and zero-width space.
+    """
+    rng = random.Random(seed)
+    vocabulary = ["inflation", "central", "bank", "rates", "élection", "peso", "bond",
+                  "https://news.example/path?x=1", "press@news.example", "Cookie Policy",
+                  "growth​", "yields", "\xa0", "5.2%", "(GDP)", "\"quote\""]
+    return '\n'.join(' '.join(rng.choice(vocabulary) for _ in range(12))
+                     for _ in range(n_words // 12))
+
+
+def main(n_words: int = 60000):
+    article = make_article(n_words)
+    max_words = n_words // 2
+
+    for level in (1, 2, 3):
+        start = time.perf_counter()
+        expected = clean_text_legacy(article, level, max_words)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = clean_text(article, level, max_words)
+        new_time = time.perf_counter() - start
+        assert result == expected, f"Level {level} output differs from the previous implementation"
+        print(f"level {level}: previous {legacy_time * 1000:.1f}ms, "
+              f"single-pass {new_time * 1000:.1f}ms ({legacy_time / new_time:.1f}x)")
+
+    start = time.perf_counter()
+    clean_article_content(article, max_words)
+    print(f"clean_article_content: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
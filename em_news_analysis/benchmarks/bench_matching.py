@@ -0,0 +1,102 @@
+"""
+Benchmark the centroid-matrix match_clusters against the previous implementation, which
+recomputed both cluster means for every candidate/selected pair.
+
+Usage:
+    poetry run python benchmarks/bench_matching.py [n_clusters] [articles_per_cluster]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from em_news_analysis.matching import match_clusters
+
+
+def match_clusters_legacy(input_embedding, embeddings, clusters, top_n=20,
+                          similarity_threshold=0.3, diversity_weight=0.3):
+    """
+    The previous match_clusters greedy loop.
+    """
+    similarities = cosine_similarity(
+        np.array(input_embedding).reshape(1, -1), embeddings)[0]
+    similarity_df = pd.DataFrame(
+        {'similarity': similarities, 'cluster': clusters})
+    cluster_similarities = similarity_df.groupby('cluster')['similarity'].mean()
+    cluster_similarities = cluster_similarities.drop(-1, errors='ignore')
+    cluster_similarities = cluster_similarities[cluster_similarities >
+                                                similarity_threshold]
+    sorted_clusters = cluster_similarities.sort_values(ascending=False)
+
+    selected_clusters = []
+    for _ in range(min(top_n, len(sorted_clusters))):
+        if not selected_clusters:
+            next_cluster = sorted_clusters.index[0]
+        else:
+            diversity_scores = []
+            for cluster in sorted_clusters.index:
+                if cluster not in selected_clusters:
+                    avg_similarity_to_selected = np.mean([
+                        cosine_similarity(
+                            embeddings[clusters == cluster].mean(
+                                axis=0).reshape(1, -1),
+                            embeddings[clusters == sc].mean(
+                                axis=0).reshape(1, -1)
+                        )[0][0] for sc in selected_clusters
+                    ])
+                    diversity_score = diversity_weight * (1 - avg_similarity_to_selected) + \
+                        (1 - diversity_weight) * sorted_clusters[cluster]
+                    diversity_scores.append((cluster, diversity_score))
+            next_cluster = max(diversity_scores, key=lambda x: x[1])[0]
+        selected_clusters.append(next_cluster)
+        sorted_clusters = sorted_clusters.drop(next_cluster)
+    return selected_clusters
+
+
+def make_clustered_embeddings(n_clusters: int, articles_per_cluster: int, dim: int = 256, seed: int = 0):
+    """
+    Random unit-norm embeddings around n_clusters centers sharing a common direction,
+    so that most clusters pass the similarity threshold. A tenth of the points are noise.
+    """
+    rng = np.random.default_rng(seed)
+    shared = rng.normal(size=dim)
+    centers = shared + rng.normal(size=(n_clusters, dim))
+    clusters = np.repeat(np.arange(n_clusters), articles_per_cluster)
+    embeddings = centers[clusters] + \
+        0.5 * rng.normal(size=(len(clusters), dim))
+    clusters[rng.random(len(clusters)) < 0.1] = -1
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return shared, embeddings.astype(np.float32), clusters
+
+
+def main(n_clusters: int = 2000, articles_per_cluster: int = 10):
+    input_embedding, embeddings, clusters = make_clustered_embeddings(
+        n_clusters, articles_per_cluster)
+
+    start = time.perf_counter()
+    result = match_clusters(input_embedding, embeddings, clusters)
+    new_time = time.perf_counter() - start
+
+    print(f"clusters: {n_clusters}, articles: {len(clusters)}")
+    print(f"centroid matrix: {new_time:.3f}s")
+
+    # The previous implementation is quadratic in the number of clusters; compare on a slice
+    legacy_clusters = min(n_clusters, 300)
+    keep = clusters < legacy_clusters
+    start = time.perf_counter()
+    expected = match_clusters_legacy(
+        input_embedding, embeddings[keep], clusters[keep])
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = match_clusters(input_embedding, embeddings[keep], clusters[keep])
+    subset_time = time.perf_counter() - start
+
+    assert list(result) == list(expected), "Rankings differ from the previous implementation"
+    print(f"on {legacy_clusters} clusters: previous {legacy_time:.2f}s, "
+          f"centroid matrix {subset_time:.3f}s ({legacy_time / subset_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,105 @@
+"""
+Benchmark the vectorized preprocess_data_summary against the previous row-wise implementation.
+
+Usage:
+    poetry run python benchmarks/bench_preprocessor.py [n_rows]
+"""
+import sys
+import time
+import random
+
+import pandas as pd
+
+from em_news_analysis.preprocessor import safe_get, preprocess_data_summary
+
+
+def preprocess_legacy(entry: str, column_type: str, max_entities: int = 10) -> str:
+    """
+    The previous preprocess: splits every mention (twice for locations) and dedupes the full list.
+    """
+    if not isinstance(entry, str) or pd.isna(entry):
+        return ""
+    mentions = entry.split(";")
+    if column_type == "location":
+        names = [mention.split("#")[2]
+                 for mention in mentions if len(mention.split("#")) > 2]
+    else:
+        names = [mention.split(",")[0].replace(" ", "_")
+                 for mention in mentions]
+    unique_names = list(dict.fromkeys(names))
+    return ", ".join(unique_names[:max_entities])
+
+
+def preprocess_data_summary_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The previous implementation: four Series.apply passes over preprocess_legacy and a row-wise DataFrame.apply.
+    """
+    df['processed_persons'] = df['V2Persons'].apply(
+        lambda x: preprocess_legacy(x, "person", max_entities=10))
+    df['processed_organizations'] = df['V2Organizations'].apply(
+        lambda x: preprocess_legacy(x, "organization", max_entities=10))
+    df['processed_locations'] = df['V2Locations'].apply(
+        lambda x: preprocess_legacy(x, "location", max_entities=10))
+    df['processed_themes'] = df['V2Themes'].apply(
+        lambda x: preprocess_legacy(x, "theme", max_entities=4))
+    df['combined'] = df.apply(
+        lambda row: (
+            f"On {safe_get(row, 'SQLDATE', 'an unknown date')}, an event occurred with the following details. "
+            f"Involved persons: {row['processed_persons'] or 'None mentioned'}. "
+            f"Involved organizations: {row['processed_organizations'] or 'None mentioned'}. "
+            f"Locations: {row['processed_locations'] or 'None mentioned'}. "
+            f"Themes associated: {row['processed_themes'] or 'None mentioned'}."
+        ),
+        axis=1
+    )
+    return df
+
+
+def make_gkg_like_data(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic DataFrame shaped like the joined GDELT events/GKG data.
+    """
+    rng = random.Random(seed)
+    people = [f"Person {i}" for i in range(500)]
+    orgs = [f"Organization {i}" for i in range(300)]
+    places = [f"City {i}" for i in range(200)]
+    themes = [f"THEME_{i}" for i in range(400)]
+
+    def entities(pool, fmt, k_max):
+        if rng.random() < 0.1:
+            return None
+        return ";".join(fmt(name) for name in rng.choices(pool, k=rng.randint(1, k_max)))
+
+    data = {
+        'V2Persons': [entities(people, lambda n: f"{n},{rng.randint(0, 5000)}", 30) for _ in range(n_rows)],
+        'V2Organizations': [entities(orgs, lambda n: f"{n},{rng.randint(0, 5000)}", 30) for _ in range(n_rows)],
+        'V2Locations': [entities(places, lambda n: f"1#{n}#{n}, Country#XX#0#0#XX", 20) for _ in range(n_rows)],
+        'V2Themes': [entities(themes, lambda n: f"{n},{rng.randint(0, 5000)}", 60) for _ in range(n_rows)],
+        'SQLDATE': pd.to_datetime([rng.choice(['20240901', '20240902']) for _ in range(n_rows)], format='%Y%m%d'),
+    }
+    for column in ["EventCode", "AvgTone", "GoldsteinScale", "QuadClass", "Actor1Name",
+                   "Actor2Name", "NumMentions", "NumSources", "NumArticles"]:
+        data[column] = [rng.random() for _ in range(n_rows)]
+    return pd.DataFrame(data)
+
+
+def main(n_rows: int = 50000):
+    df = make_gkg_like_data(n_rows)
+
+    start = time.perf_counter()
+    expected = preprocess_data_summary_rowwise(df.copy())['combined']
+    rowwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = preprocess_data_summary(df.copy())['combined']
+    vectorized_time = time.perf_counter() - start
+
+    assert result.equals(expected), "Vectorized output differs from the row-wise output"
+    print(f"rows: {n_rows}")
+    print(f"row-wise:   {rowwise_time:.2f}s")
+    print(f"vectorized: {vectorized_time:.2f}s")
+    print(f"speedup:    {rowwise_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,99 @@
+"""
+Benchmark the vectorized MMR sample_articles against the previous implementation, which
+rescored every candidate against all selected embeddings on each pick.
+
+Usage:
+    poetry run python benchmarks/bench_sampling.py [n_articles] [max_articles]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from em_news_analysis.sampling import sample_articles
+
+
+def sample_articles_legacy(urls, cluster_embeddings, articles_metadata, max_articles, lambda_param=0.9):
+    """
+    The previous sample_articles loop, returning indices in selection order.
+    """
+    centroid = cluster_embeddings.mean(axis=0).reshape(1, -1)
+    similarities = cosine_similarity(cluster_embeddings, centroid).flatten()
+    similarities = (similarities - similarities.min()) / \
+        (similarities.max() - similarities.min() + 1e-10)
+    quality_scores = (
+        articles_metadata['NumMentions'].fillna(0) +
+        articles_metadata['GoldsteinScale'].fillna(0) +
+        articles_metadata['AvgTone'].fillna(0)
+    )
+    quality_scores = (quality_scores - quality_scores.min()) / \
+        (quality_scores.max() - quality_scores.min() + 1e-10)
+    combined_scores = lambda_param * similarities + \
+        (1 - lambda_param) * quality_scores.values
+
+    selected_indices = []
+    candidate_indices = list(range(len(urls)))
+    selected_urls = set()
+    for _ in range(min(max_articles, len(urls))):
+        mmr_scores = []
+        for idx in candidate_indices:
+            if urls[idx] in selected_urls:
+                continue
+            if not selected_indices:
+                diversity = 0
+            else:
+                diversity = cosine_similarity(
+                    cluster_embeddings[idx].reshape(1, -1),
+                    cluster_embeddings[selected_indices]
+                ).max()
+            mmr_scores.append(
+                (combined_scores[idx] - lambda_param * diversity, idx))
+        if not mmr_scores:
+            break
+        mmr_scores.sort(reverse=True)
+        _, best_idx = mmr_scores[0]
+        selected_indices.append(best_idx)
+        selected_urls.add(urls[best_idx])
+        candidate_indices.remove(best_idx)
+    return [urls[i] for i in selected_indices]
+
+
+def make_cluster(n_articles: int, dim: int = 256, seed: int = 0):
+    """
+    Random embeddings and GDELT-like metadata for one cluster; about a fifth of the URLs repeat.
+    """
+    rng = np.random.default_rng(seed)
+    embeddings = (rng.normal(size=dim) + rng.normal(size=(n_articles, dim))
+                  ).astype(np.float32)
+    urls = [f"https://example.com/{i}"
+            for i in rng.integers(0, int(n_articles * 0.8), n_articles)]
+    metadata = pd.DataFrame({
+        'SOURCEURL': urls,
+        'NumMentions': rng.integers(1, 50, n_articles),
+        'GoldsteinScale': rng.uniform(-10, 10, n_articles),
+        'AvgTone': rng.normal(0, 3, n_articles),
+    })
+    return urls, embeddings, metadata
+
+
+def main(n_articles: int = 5000, max_articles: int = 25):
+    urls, embeddings, metadata = make_cluster(n_articles)
+
+    start = time.perf_counter()
+    result = sample_articles(urls, embeddings, metadata, max_articles)
+    new_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = sample_articles_legacy(urls, embeddings, metadata, max_articles)
+    legacy_time = time.perf_counter() - start
+
+    assert result == expected, "Selections differ from the previous implementation"
+    print(f"articles: {n_articles}, sampled: {len(result)}")
+    print(f"previous: {legacy_time:.2f}s, vectorized: {new_time * 1000:.1f}ms "
+          f"({legacy_time / new_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
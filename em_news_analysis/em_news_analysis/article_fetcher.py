@@ -0,0 +1,247 @@
+import asyncio
+import io
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import httpx
+from bs4 import BeautifulSoup
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Referer": "https://www.google.com/",
+}
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 15.0
+DEFAULT_DEADLINE = 30.0
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+
+@dataclass
+class FetchedArticle:
+    """
+    A downloaded article and its extracted text.
+    """
+    url: str
+    status_code: int
+    content_type: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """
+        Whether the server answered a conditional request with 304 Not Modified.
+        """
+        return self.status_code == 304
+
+
+def is_pdf(url: str, content_type: str = "") -> bool:
+    """
+    Whether a response holds a PDF, judging by its content type or, failing that, its URL.
+    """
+    return "application/pdf" in content_type.lower() or url.lower().split("?")[0].endswith(".pdf")
+
+
+def extract_text(url: str, body: bytes, content_type: str, encoding: str = None) -> str:
+    """
+    Extract the text of a downloaded article.
+
+    PDFs are parsed from the downloaded bytes; anything else is treated as HTML and reduced to
+    its text the same way WebBaseLoader does.
+
+    Args:
+        url (str): The URL of the article.
+        body (bytes): The response body.
+        content_type (str): The response Content-Type header.
+        encoding (str, optional): The response encoding. Defaults to None (UTF-8).
+
+    Returns:
+        str: The text of the article.
+    """
+    if is_pdf(url, content_type):
+        reader = PdfReader(io.BytesIO(body))
+        return ' '.join(page.extract_text() or '' for page in reader.pages)
+    html = body.decode(encoding or "utf-8", errors="replace")
+    return BeautifulSoup(html, "html.parser").get_text()
+
+
+class AsyncArticleFetcher:
+    """
+    Asyncio article fetcher sharing one HTTP connection pool across every request.
+
+    Each host gets its own concurrency cap, so a slow site cannot hold every connection.
+    Requests have connect and read timeouts plus an overall deadline, and bodies larger
+    than max_bytes are abandoned while streaming. PDFs are downloaded once and parsed
+    from memory.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        deadline: float = DEFAULT_DEADLINE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        headers: Dict[str, str] = None,
+        client: httpx.AsyncClient = None
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            max_connections (int, optional): Size of the shared connection pool. Defaults to DEFAULT_MAX_CONNECTIONS.
+            max_per_host (int, optional): Maximum number of in-flight requests per host. Defaults to DEFAULT_MAX_PER_HOST.
+            connect_timeout (float, optional): Seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+            read_timeout (float, optional): Seconds to wait between received chunks. Defaults to DEFAULT_READ_TIMEOUT.
+            deadline (float, optional): Seconds allowed for a whole fetch, including waiting for a host slot. Defaults to DEFAULT_DEADLINE.
+            max_bytes (int, optional): Largest body to download. Defaults to DEFAULT_MAX_BYTES.
+            headers (Dict[str, str], optional): Request headers. Defaults to DEFAULT_HEADERS.
+            client (httpx.AsyncClient, optional): HTTP client to use. If None, one is created. Defaults to None.
+        """
+        self.max_per_host = max_per_host
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.client = client if client is not None else httpx.AsyncClient(
+            headers=headers or DEFAULT_HEADERS,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            follow_redirects=True)
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self.host_limits[host]
+
+    async def _download(self, url: str, etag: str = None, last_modified: str = None) -> FetchedArticle:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with self._host_limit(url):
+            self.requests += 1
+            async with self.client.stream("GET", url, headers=headers) as response:
+                validators = {"etag": response.headers.get("etag"),
+                              "last_modified": response.headers.get("last-modified")}
+                # httpx treats every 3xx as an error, including 304
+                if response.status_code == 304:
+                    return FetchedArticle(url=url, status_code=304, content_type="", text="", **validators)
+                response.raise_for_status()
+                content_length = response.headers.get("content-length")
+                if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+                    raise ValueError(
+                        f"Article is {content_length} bytes, above the limit of {self.max_bytes}")
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ValueError(
+                            f"Article exceeds the limit of {self.max_bytes} bytes")
+                    chunks.append(chunk)
+                content_type = response.headers.get("content-type", "")
+                encoding = response.charset_encoding
+                status_code = response.status_code
+        body = b''.join(chunks)
+        # Parsing is CPU-bound, so keep it off the event loop
+        text = await asyncio.to_thread(extract_text, url, body, content_type, encoding)
+        return FetchedArticle(url=url, status_code=status_code, content_type=content_type, text=text, **validators)
+
+    async def fetch(self, url: str, etag: str = None, last_modified: str = None) -> FetchedArticle:
+        """
+        Download an article and extract its text.
+
+        When validators from an earlier download are given, the request is conditional and an
+        unchanged article comes back as a FetchedArticle with status 304 and no text.
+
+        Args:
+            url (str): The URL of the article.
+            etag (str, optional): ETag of the copy already held. Defaults to None.
+            last_modified (str, optional): Last-Modified date of the copy already held. Defaults to None.
+
+        Returns:
+            FetchedArticle: The article.
+
+        Raises:
+            httpx.HTTPError: If the request fails or times out.
+            ValueError: If the body is larger than max_bytes.
+            asyncio.TimeoutError: If the fetch takes longer than the deadline.
+        """
+        return await asyncio.wait_for(self._download(url, etag, last_modified), self.deadline)
+
+    async def fetch_many(self, urls: List[str]) -> List[Union[FetchedArticle, Exception]]:
+        """
+        Fetch several articles concurrently.
+
+        Args:
+            urls (List[str]): The URLs to fetch.
+
+        Returns:
+            List[Union[FetchedArticle, Exception]]: The article, or the error it failed with, for each URL.
+        """
+        return await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+
+    async def aclose(self):
+        """
+        Close the underlying HTTP client.
+        """
+        await self.client.aclose()
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_article_fetcher(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> AsyncArticleFetcher:
+    """
+    Get the process-wide article fetcher, creating it on first use.
+
+    The settings are those given on first use; later calls return the same fetcher, so every
+    pipeline in the process shares one connection pool. Its connection pool must only be used
+    from the background event loop (see async_runtime).
+
+    Args:
+        max_connections (int, optional): Size of the shared connection pool. Defaults to DEFAULT_MAX_CONNECTIONS.
+        max_per_host (int, optional): Maximum number of in-flight requests per host. Defaults to DEFAULT_MAX_PER_HOST.
+        connect_timeout (float, optional): Seconds to wait for a connection. Defaults to DEFAULT_CONNECT_TIMEOUT.
+        read_timeout (float, optional): Seconds to wait between received chunks. Defaults to DEFAULT_READ_TIMEOUT.
+        deadline (float, optional): Seconds allowed for a whole fetch, including waiting for a host slot. Defaults to DEFAULT_DEADLINE.
+        max_bytes (int, optional): Largest body to download. Defaults to DEFAULT_MAX_BYTES.
+
+    Returns:
+        AsyncArticleFetcher: The shared fetcher.
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = AsyncArticleFetcher(
+                max_connections=max_connections,
+                max_per_host=max_per_host,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                deadline=deadline,
+                max_bytes=max_bytes)
+    return _fetcher
@@ -1,16 +1,22 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
 import concurrent.futures
 import logging
 
 from langchain_openai import ChatOpenAI
 
-from langchain_community.document_loaders import WebBaseLoader, PyPDFLoader, PlaywrightURLLoader
 from tenacity import retry, stop_after_attempt, wait_fixed
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 import re
 from bs4 import BeautifulSoup
 from datetime import datetime
+from .article_fetcher import AsyncArticleFetcher, FetchedArticle, get_article_fetcher, is_pdf
+from .async_runtime import get_event_loop, run_async
+from .browser_pool import AsyncBrowserPool, get_browser_pool
+from .llm_scheduler import ARTICLE_LANE, get_llm_scheduler
+from .token_budget import count_tokens, get_token_budget, truncate_to_tokens
+from .cache import ArticleCache, CachedArticle, SummaryCache
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,37 @@ open_ai_llm = ChatOpenAI(
 )
 
 
+# Patterns used by clean_text, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_WEB_ELEMENTS_RE = re.compile(
+    r'(Cookie Policy|Privacy Policy|Terms of Service|Copyright ©)', flags=re.IGNORECASE)
+_URL_RE = re.compile(
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_SPECIAL_CHARACTERS_RE = re.compile(r'[^a-zA-Z0-9\s.,;:!?()"-]')
+
+
+class _NonPrintableTable(dict):
+    """
+    str.translate table that deletes non-printable characters, filled in as characters are first seen.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = codepoint if chr(codepoint).isprintable() else None
+        self[codepoint] = value
+        return value
+
+
+_NON_PRINTABLE = _NonPrintableTable()
+
+
+def exceeds_words(text: str, max_words: int) -> bool:
+    """
+    Whether text has more than max_words words, without splitting past the limit.
+    """
+    return len(text.split(maxsplit=max_words)) > max_words
+
+
 def clean_text(text: str, level: int = 1, max_words: int = 50000) -> str:
     """
     Clean the input text with different levels of aggressiveness and truncate if necessary.
@@ -43,24 +80,25 @@ def clean_text(text: str, level: int = 1, max_words: int = 50000) -> str:
         None, but logs a warning if the text is truncated.
     """
     # Level 1: Basic cleaning
-    text = BeautifulSoup(text, "html.parser").get_text()
-    text = re.sub(r'\s+', ' ', text).strip()
-    text = ''.join(char for char in text if char.isprintable())
+    if '<' in text or '&' in text:
+        # Only markup and character references need an HTML parse
+        text = BeautifulSoup(text, "html.parser").get_text()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if not text.isprintable():
+        text = text.translate(_NON_PRINTABLE)
 
     if level >= 2:
         # Level 2: Remove common web elements and URLs
-        text = re.sub(r'(Cookie Policy|Privacy Policy|Terms of Service|Copyright ©)',
-                      '', text, flags=re.IGNORECASE)
-        text = re.sub(
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        text = _WEB_ELEMENTS_RE.sub('', text)
+        text = _URL_RE.sub('', text)
 
     if level >= 3:
         # Level 3: Remove email addresses and special characters
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[^a-zA-Z0-9\s.,;:!?()"-]', '', text)
+        text = _EMAIL_RE.sub('', text)
+        text = _SPECIAL_CHARACTERS_RE.sub('', text)
 
-    # Truncate to max_words if necessary
-    words = text.split()
+    # Truncate to max_words if necessary, splitting no further than needed
+    words = text.split(maxsplit=max_words)
     if len(words) > max_words:
         logger.warning(
             f"Text exceeds the maximum of {max_words} words. Truncating.")
@@ -69,7 +107,182 @@ def clean_text(text: str, level: int = 1, max_words: int = 50000) -> str:
     return text
 
 
-def article_summarizer(url: str, objective: str, model: int = 3, max_words: int = 50000) -> str:
+CONSENT_WALL_MARKER = "Enable JavaScript and cookies to continue"
+
+
+def load_with_playwright(url: str, browser_pool: AsyncBrowserPool = None) -> str:
+    """
+    Load an article in the shared headless browser, for pages that only render behind a consent wall.
+
+    Args:
+        url (str): The URL of the article.
+        browser_pool (AsyncBrowserPool, optional): Browser pool to load the page with. Defaults to the shared pool.
+
+    Returns:
+        str: The text of the article.
+    """
+    logger.info(
+        f"Article requires consent: {url}. Trying to load with the headless browser pool")
+    browser_pool = browser_pool if browser_pool is not None else get_browser_pool()
+    return run_async(browser_pool.load(url))
+
+
+def resolve_article_content(url: str, fetched: Union[FetchedArticle, Exception]) -> Optional[str]:
+    """
+    Turn the result of a fetch into article text, falling back to a headless browser for consent walls.
+
+    Args:
+        url (str): The URL of the article.
+        fetched (Union[FetchedArticle, Exception]): The fetched article, or the error the fetch failed with.
+
+    Returns:
+        Optional[str]: The text of the article, or None if it is inaccessible.
+    """
+    if isinstance(fetched, BaseException):
+        logger.error(f"Error accessing URL {url}: {fetched!r}")
+        return None
+    if is_pdf(url, fetched.content_type) or CONSENT_WALL_MARKER not in fetched.text:
+        return fetched.text
+    try:
+        return load_with_playwright(url)
+    except Exception as e:
+        logger.error(
+            f"Error loading article with the headless browser pool: {e}")
+        return None
+
+
+def clean_article_content(article_content: str, max_words: int = 50000) -> str:
+    """
+    Clean article text with increasingly aggressive levels until it fits in max_words, then truncate.
+
+    Parameters:
+    article_content (str): The raw text of the article.
+    max_words (int, optional): Maximum number of words to keep. Defaults to 50000.
+
+    Returns:
+    str: The cleaned text.
+    """
+    for cleaning_level in range(1, 4):
+        article_content = clean_text(
+            article_content, level=cleaning_level, max_words=max_words)
+        if not exceeds_words(article_content, max_words):
+            break
+
+    if exceeds_words(article_content, max_words):
+        logger.warning(
+            f"Article content still exceeds the maximum of {max_words} words after cleaning. "
+            f"Truncating to {max_words} words.")
+        article_content = ' '.join(
+            article_content.split(maxsplit=max_words)[:max_words])
+
+    return article_content
+
+
+def start_article_fetch(
+    url: str,
+    fetcher: AsyncArticleFetcher,
+    cache: ArticleCache = None
+) -> Tuple[Optional[CachedArticle], Optional[concurrent.futures.Future]]:
+    """
+    Look an article up in the cache and, unless the cached copy is fresh, start downloading it.
+
+    Stale copies with an ETag or Last-Modified date are revalidated with a conditional GET.
+
+    Parameters:
+    url (str): The URL of the article.
+    fetcher (AsyncArticleFetcher): Fetcher to download the article with.
+    cache (ArticleCache, optional): Cache of article contents. Defaults to None (no caching).
+
+    Returns:
+    Tuple[Optional[CachedArticle], Optional[concurrent.futures.Future]]: The cached article, if any, and the
+        future of the download, or None if the cached copy can be used as it is.
+    """
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and cache.is_fresh(cached):
+        return cached, None
+    if cached is not None and cache.can_revalidate(cached):
+        coro = fetcher.fetch(url, etag=cached.etag,
+                             last_modified=cached.last_modified)
+    else:
+        coro = fetcher.fetch(url)
+    return cached, asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def finish_article_fetch(
+    url: str,
+    cached: Optional[CachedArticle],
+    fetch_future: Optional[concurrent.futures.Future],
+    cache: ArticleCache = None,
+    max_words: int = 50000
+) -> Optional[str]:
+    """
+    Wait for a download started by start_article_fetch and return the cleaned article text, updating the cache.
+
+    Parameters:
+    url (str): The URL of the article.
+    cached (Optional[CachedArticle]): The cached article returned by start_article_fetch.
+    fetch_future (Optional[concurrent.futures.Future]): The download returned by start_article_fetch.
+    cache (ArticleCache, optional): Cache of article contents. Defaults to None (no caching).
+    max_words (int, optional): Maximum number of words to keep. Defaults to 50000.
+
+    Returns:
+    Optional[str]: The cleaned text of the article, or None if it is inaccessible. If the download
+        fails and a stale cached copy has text, that copy is returned and kept.
+    """
+    if fetch_future is None:
+        return cached.text
+
+    try:
+        fetched = fetch_future.result()
+    except Exception as e:
+        fetched = e
+
+    if isinstance(fetched, FetchedArticle) and fetched.not_modified and cached is not None:
+        cache.refresh(cached, fetched.etag, fetched.last_modified)
+        return cached.text
+
+    if isinstance(fetched, BaseException) and cached is not None and cached.accessible:
+        # Serve the stale copy rather than replacing good text with a failure; it is retried next time
+        logger.warning(
+            f"Error revalidating URL {url}: {fetched!r}. Using the cached copy.")
+        return cached.text
+
+    article_content = resolve_article_content(url, fetched)
+    if article_content is not None:
+        article_content = clean_article_content(article_content, max_words)
+
+    if cache is not None:
+        if isinstance(fetched, FetchedArticle):
+            cache.set(url, article_content, fetched.status_code,
+                      fetched.etag, fetched.last_modified)
+        else:
+            response = getattr(fetched, "response", None)
+            cache.set(url, None, getattr(response, "status_code", 0))
+    return article_content
+
+
+def summary_model_name(model: int = 3) -> str:
+    """
+    Name of the language model article_summarizer uses for a given model number.
+    """
+    return (open_ai_llm_mini if model == 3 else open_ai_llm).model_name
+
+
+def cache_summary(summary_cache: Optional[SummaryCache], url: str, objective: str, model: int, summary: str):
+    """
+    Store a summary or verdict in the summary cache, if there is one.
+
+    Any summary mentioning INACCESSIBLE is stored as the bare verdict, so that it expires after
+    the cache's failure TTL.
+    """
+    if summary_cache is None:
+        return
+    if "INACCESSIBLE" in summary:
+        summary = SummaryCache.INACCESSIBLE
+    summary_cache.set(url, objective, summary_model_name(model), summary)
+
+
+def article_summarizer(url: str, objective: str, model: int = 3, max_words: int = 50000, fetcher: AsyncArticleFetcher = None, cache: ArticleCache = None, summary_cache: SummaryCache = None, max_article_tokens: Dict[str, int] = None) -> str:
     """
     Summarizes an online article using OpenAI's language models.
 
@@ -81,79 +294,48 @@ def article_summarizer(url: str, objective: str, model: int = 3, max_words: int
     url (str): The URL of the online article to summarize.
     objective(str): This provides an objective for the summary of the article, including the relevant meta-data
     model (int, optional): The model to use for summarization. If 3, uses "gpt-4o-mini". Otherwise, uses "gpt-4o". Defaults to 3.
+    fetcher (AsyncArticleFetcher, optional): Fetcher to download the article with. Defaults to the shared fetcher.
+    cache (ArticleCache, optional): Cache of article contents, read before going to the network. Defaults to None.
+    summary_cache (SummaryCache, optional): Cache of summaries, read before loading the article. Defaults to None.
+    max_article_tokens (Dict[str, int], optional): Per-model caps on the article's tokens. Defaults to the caps in MODEL_BUDGETS.
 
     Returns:
     str: The summary of the article. If there was an error loading the article, returns an appropriate message.
     """
-
-    if url.endswith('.pdf'):
-        try:
-            import requests
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Referer': 'https://www.google.com/'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()  # This will raise an exception for HTTP errors
-        except Exception as e:
-            logger.error(f"Error accessing URL: {e}")
-            return "INACCESSIBLE"
-
-        loader = PyPDFLoader(url, headers=headers)
-
+    if summary_cache is not None:
+        summary = summary_cache.get(url, objective, summary_model_name(model))
+        if summary is not None:
+            return summary
+
+    fetcher = fetcher if fetcher is not None else get_article_fetcher()
+    cached, fetch_future = start_article_fetch(url, fetcher, cache)
+    article_content = finish_article_fetch(
+        url, cached, fetch_future, cache, max_words)
+    if article_content is None:
+        summary = "INACCESSIBLE"
     else:
-        custom_headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Referer": "https://www.google.com/",
-        }
-        try:
-            loader = WebBaseLoader(url, header_template=custom_headers)
-            docs = loader.load()
-
-            article_content = ' '.join([doc.page_content for doc in docs])
-
-            if "Enable JavaScript and cookies to continue" in article_content:
-                try:
-                    logger.info(
-                        f"Article requires consent: {url}. Trying to load with PlaywrightURLLoader")
-                    loader = PlaywrightURLLoader(
-                        urls=[url],
-                        remove_selectors=["header", "footer", "nav"],
-                        headless=True
-                    )
-                    docs = loader.load()
-                    article_content = ' '.join(
-                        [doc.page_content for doc in docs])
-                except Exception as e:
-                    logger.error(
-                        f"Error loading article with PlaywrightURLLoader: {e}")
-                    return "INACCESSIBLE"
+        summary = summarize_article_content(
+            url, article_content, objective, model, max_article_tokens)
 
-        except Exception as e:
-            logger.error(f"Error accessing URL: {e}")
-            return "INACCESSIBLE"
+    cache_summary(summary_cache, url, objective, model, summary)
+    return summary
 
-    # Clean and check the word count of the article content
-    article_content = ' '.join([doc.page_content for doc in docs])
-    original_word_count = len(article_content.split())
 
-    for cleaning_level in range(1, 4):
-        article_content = clean_text(
-            article_content, level=cleaning_level, max_words=max_words)
-        if len(article_content.split()) <= max_words:
-            break
+def summarize_article_content(url: str, article_content: str, objective: str, model: int = 3, max_article_tokens: Dict[str, int] = None, priority: float = 0) -> str:
+    """
+    Summarizes the cleaned text of an article that has already been loaded.
 
-    if len(article_content.split()) > max_words:
-        logger.warning(
-            f"Article content still exceeds the maximum of {max_words} words after cleaning. "
-            f"Original word count: {original_word_count}, Cleaned word count: {len(article_content.split())}. "
-            f"Truncating to {max_words} words.")
-        article_content = ' '.join(article_content.split()[:max_words])
+    Parameters:
+    url (str): The URL of the article, used for logging.
+    article_content (str): The cleaned text of the article, as returned by clean_article_content.
+    objective(str): This provides an objective for the summary of the article, including the relevant meta-data
+    model (int, optional): The model to use for summarization. If 3, uses "gpt-4o-mini". Otherwise, uses "gpt-4o". Defaults to 3.
+    max_article_tokens (Dict[str, int], optional): Per-model caps on the article's tokens. Defaults to the caps in MODEL_BUDGETS.
+    priority (float, optional): Priority of the call in the LLM scheduler's article lane; lower runs first. Defaults to 0.
 
+    Returns:
+    str: The summary of the article.
+    """
     if model == 3:
         llm = open_ai_llm_mini
 
@@ -170,12 +352,21 @@ def article_summarizer(url: str, objective: str, model: int = 3, max_words: int
     ])
 
     chain = prompt | llm | StrOutputParser()
+
+    # Fit the article in the model's context, leaving room for the prompt and the answer
+    instructions = "Below is the article content. Return the summary of the article in English.:\n\n<article>\n\n\n\n</article>"
+    budget = get_token_budget(llm.model_name, max_article_tokens)
+    prompt_tokens = count_tokens(system_prompt + instructions, llm.model_name)
+    article_content = truncate_to_tokens(
+        article_content, budget.article_tokens(prompt_tokens), llm.model_name)
+
     input_prompt = f"Below is the article content. Return the summary of the article in English.:\n\n<article>\n\n{article_content}\n\n</article>"
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
     def invoke_with_retry():
         try:
-            response_value = chain.invoke({"input": input_prompt})
+            with get_llm_scheduler().slot(ARTICLE_LANE, priority):
+                response_value = chain.invoke({"input": input_prompt})
         except Exception as e:
             logger.error(f"Error in generating article summary: {str(e)}")
             raise e
@@ -197,23 +388,63 @@ def article_summarizer(url: str, objective: str, model: int = 3, max_words: int
         raise Exception(f"Error in generating article summary: {str(e)}")
 
 
-def generate_summaries(article_urls: List[str], objective: str, max_workers: int = 3) -> List[str]:
+def generate_summaries(article_urls: List[str], objective: str, max_workers: int = 3, fetcher: AsyncArticleFetcher = None, cache: ArticleCache = None, summary_cache: SummaryCache = None, max_article_tokens: Dict[str, int] = None, priority: float = 0) -> List[str]:
     """
-    Generate summaries for the given article URLs using the article_summarizer function.
+    Generate summaries for the given article URLs.
+
+    Summaries already in the summary cache are returned without loading the article. Other articles
+    are read from the content cache when it holds a fresh copy; the rest are downloaded concurrently
+    by the async fetcher. Each article is summarized on the thread pool as soon as its text is available,
+    with the LLM calls themselves capped by the process-wide LLM scheduler.
 
     Parameters:
     article_urls (List[str]): List of URLs to summarize
     objective (str): Objective for the summary
-    max_workers (int): Maximum number of concurrent workers
+    max_workers (int): Maximum number of concurrent summarization workers
+    fetcher (AsyncArticleFetcher, optional): Fetcher to download the articles with. Defaults to the shared fetcher.
+    cache (ArticleCache, optional): Cache of article contents. Defaults to None (no caching).
+    summary_cache (SummaryCache, optional): Cache of summaries. Defaults to None (no caching).
+    max_article_tokens (Dict[str, int], optional): Per-model caps on the article's tokens. Defaults to the caps in MODEL_BUDGETS.
+    priority (float, optional): Priority of the LLM calls in the scheduler's article lane; lower runs first. Defaults to 0.
 
     Returns:
     List[str]: List of summaries or error messages
     """
+    fetcher = fetcher if fetcher is not None else get_article_fetcher()
     summaries = [None] * \
         len(article_urls)  # Pre-allocate list with None values
+
+    def summarize(url: str, cached: Optional[CachedArticle], fetch_future: Optional[concurrent.futures.Future]) -> str:
+        article_content = finish_article_fetch(
+            url, cached, fetch_future, cache)
+        if article_content is None:
+            summary = "INACCESSIBLE"
+        else:
+            summary = summarize_article_content(
+                url, article_content, objective, max_article_tokens=max_article_tokens, priority=priority)
+        cache_summary(summary_cache, url, objective, 3, summary)
+        return summary
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_index = {executor.submit(article_summarizer, url, objective): i
-                           for i, url in enumerate(article_urls)}
+        future_to_index = {}
+        pending_fetches = {}
+        model_name = summary_model_name()
+        for i, url in enumerate(article_urls):
+            summary = summary_cache.get(
+                url, objective, model_name) if summary_cache is not None else None
+            if summary is not None:
+                summaries[i] = summary
+                continue
+            cached, fetch_future = start_article_fetch(url, fetcher, cache)
+            if fetch_future is None:
+                future_to_index[executor.submit(
+                    summarize, url, cached, None)] = i
+            else:
+                pending_fetches[fetch_future] = (i, cached)
+        for fetch_future in concurrent.futures.as_completed(pending_fetches):
+            index, cached = pending_fetches[fetch_future]
+            future_to_index[executor.submit(
+                summarize, article_urls[index], cached, fetch_future)] = index
         for future in concurrent.futures.as_completed(future_to_index):
             index = future_to_index[future]
             url = article_urls[index]
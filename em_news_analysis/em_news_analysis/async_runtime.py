@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import logging
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide background event loop, starting it on first use.
+
+    The loop runs forever in a daemon thread. Long-lived async resources (HTTP connection
+    pools, rate limiters) live on it so they can be shared by every synchronous caller,
+    regardless of which thread they run on or whether that thread has its own loop.
+
+    Returns:
+        asyncio.AbstractEventLoop: The background event loop.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="em-news-analysis-loop", daemon=True)
+            _loop_thread.start()
+            logger.info("Started background event loop")
+    return _loop
+
+
+def run_async(coro: Coroutine, timeout: float = None) -> Any:
+    """
+    Run a coroutine on the background event loop and wait for its result.
+
+    Safe to call from any thread, including one that is running its own event loop
+    (e.g. a synchronous pipeline called from an async request handler).
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+        timeout (float, optional): Maximum number of seconds to wait. Defaults to None (no limit).
+
+    Returns:
+        Any: The coroutine's result.
+
+    Raises:
+        RuntimeError: If called from the background loop itself, which would deadlock.
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError(
+            "run_async cannot be called from the background event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import threading
+from typing import List
+
+from playwright.async_api import async_playwright, Browser, Page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = 4
+DEFAULT_PAGE_TIMEOUT = 20.0
+DEFAULT_REMOVE_SELECTORS = ["header", "footer", "nav"]
+
+
+class AsyncBrowserPool:
+    """
+    Long-lived headless Chromium shared by every consent-walled article.
+
+    The browser is launched on first use and keeps at most max_pages pages open, each in its own
+    context. Pages are reused across articles; callers beyond max_pages wait in a queue for a
+    free page instead of launching more browsers. A page that fails is closed and replaced.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+        remove_selectors: List[str] = None
+    ):
+        """
+        Initialize the pool. No browser is started until the first load.
+
+        Args:
+            max_pages (int, optional): Maximum number of open pages (and contexts). Defaults to DEFAULT_MAX_PAGES.
+            page_timeout (float, optional): Seconds allowed for a page to load. Defaults to DEFAULT_PAGE_TIMEOUT.
+            remove_selectors (List[str], optional): Elements removed before reading the text. Defaults to DEFAULT_REMOVE_SELECTORS.
+        """
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.remove_selectors = remove_selectors if remove_selectors is not None else DEFAULT_REMOVE_SELECTORS
+        self._playwright = None
+        self._browser: Browser = None
+        self._start_lock = None
+        self._idle: asyncio.Queue = None
+        self._slots: asyncio.Semaphore = None
+        self.loads = 0
+
+    async def _start(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._idle = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_pages)
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                logger.info("Launched headless browser for the Playwright fallback")
+
+    async def _acquire(self) -> Page:
+        await self._slots.acquire()
+        try:
+            while not self._idle.empty():
+                page = self._idle.get_nowait()
+                if not page.is_closed():
+                    return page
+                # The page died while idle (e.g. a renderer crash); its context is still open
+                await self._close_context(page)
+            context = await self._browser.new_context()
+            return await context.new_page()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, page: Page):
+        self._idle.put_nowait(page)
+        self._slots.release()
+
+    async def _close_context(self, page: Page):
+        try:
+            await page.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {e}")
+
+    async def _discard(self, page: Page):
+        try:
+            await self._close_context(page)
+        finally:
+            self._slots.release()
+
+    async def load(self, url: str) -> str:
+        """
+        Load a page in the shared browser and return its visible text.
+
+        Args:
+            url (str): The URL to load.
+
+        Returns:
+            str: The text of the page body, without the removed selectors.
+
+        Raises:
+            playwright.async_api.Error: If the page fails to load or times out.
+        """
+        await self._start()
+        page = await self._acquire()
+        try:
+            self.loads += 1
+            await page.goto(url, timeout=self.page_timeout * 1000, wait_until="domcontentloaded")
+            for selector in self.remove_selectors:
+                await page.evaluate(
+                    "selector => document.querySelectorAll(selector).forEach(element => element.remove())",
+                    selector)
+            text = await page.inner_text("body", timeout=self.page_timeout * 1000)
+        except Exception:
+            await self._discard(page)
+            raise
+        self._release(page)
+        return text
+
+    async def aclose(self):
+        """
+        Close the browser and stop Playwright.
+        """
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> AsyncBrowserPool:
+    """
+    Get the process-wide browser pool with default settings, creating it on first use.
+
+    It must only be used from the background event loop (see async_runtime).
+
+    Returns:
+        AsyncBrowserPool: The shared pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AsyncBrowserPool()
+    return _pool
@@ -0,0 +1,553 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_CHUNK_SIZE = 500
+
+# Query parameters that only track where a visitor came from
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid")
+
+
+class SQLiteCache:
+    """
+    Size-bounded key/value store persisted in a SQLite file.
+
+    Entries are evicted least-recently-used first once the number of entries exceeds max_entries.
+    The file can be shared by several threads and processes; SQLite handles the locking.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, table: str = "cache"):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int, optional): Maximum number of entries to keep. Defaults to 10000.
+            table (str, optional): Name of the table holding the entries. Defaults to "cache".
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)")
+
+    def get(self, key: str, max_age: float = None) -> Optional[bytes]:
+        """
+        Get the value stored for a key.
+
+        Args:
+            key (str): The key to look up.
+            max_age (float, optional): Ignore entries older than this many seconds. Defaults to None (no limit).
+
+        Returns:
+            Optional[bytes]: The stored value, or None if missing or expired.
+        """
+        return self.get_many([key], max_age=max_age).get(key)
+
+    def get_many(self, keys: Iterable[str], max_age: float = None) -> Dict[str, bytes]:
+        """
+        Get the values stored for several keys and mark them as recently used.
+
+        Args:
+            keys (Iterable[str]): The keys to look up.
+            max_age (float, optional): Ignore entries older than this many seconds. Defaults to None (no limit).
+
+        Returns:
+            Dict[str, bytes]: Mapping of the keys that were found to their values.
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_CHUNK_SIZE):
+                chunk = keys[start:start + _SQLITE_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({placeholders})",
+                    chunk).fetchall()
+                for key, value, created_at in rows:
+                    if max_age is None or now - created_at <= max_age:
+                        found[key] = value
+            hits = list(found)
+            for start in range(0, len(hits), _SQLITE_CHUNK_SIZE):
+                chunk = hits[start:start + _SQLITE_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key IN ({placeholders})",
+                    [now] + chunk)
+        return found
+
+    def set(self, key: str, value: bytes):
+        """
+        Store a value for a key, replacing any existing entry.
+
+        Args:
+            key (str): The key to store.
+            value (bytes): The value to store.
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, bytes]]):
+        """
+        Store several values and evict the least recently used entries if the cache is full.
+
+        Args:
+            items (Iterable[Tuple[str, bytes]]): (key, value) pairs to store.
+        """
+        now = time.time()
+        rows = [(key, value, now, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    rows)
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str):
+        """
+        Remove a key from the cache.
+
+        Args:
+            key (str): The key to remove.
+        """
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge(self, max_age: float) -> int:
+        """
+        Remove every entry older than max_age.
+
+        Args:
+            max_age (float): Age in seconds beyond which entries are removed.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            removed = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - max_age,)).rowcount
+        if removed:
+            logger.info(f"Purged {removed} expired entries from {self.path}")
+        return removed
+
+    def _evict(self):
+        count = self._conn.execute(
+            f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,))
+            logger.info(f"Evicted {excess} entries from {self.path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by hash(model, text).
+
+    Embeddings are stored on disk as float32 in a SQLiteCache, fronted by a small in-memory LRU.
+    """
+
+    def __init__(self, path: str, max_entries: int = 50000, memory_size: int = 1000):
+        """
+        Open (or create) the embedding cache.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int, optional): Maximum number of embeddings kept on disk. Defaults to 50000.
+            memory_size (int, optional): Number of embeddings kept in memory. Defaults to 1000.
+        """
+        self.store = SQLiteCache(
+            path, max_entries=max_entries, table="embeddings")
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, model: str) -> str:
+        """
+        Build the cache key for a text embedded with a given model.
+
+        Args:
+            text (str): The text that was embedded.
+            model (str): The embedding model.
+
+        Returns:
+            str: The hex digest identifying the (model, text) pair.
+        """
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: List[str], model: str) -> Dict[str, np.ndarray]:
+        """
+        Look up the embeddings for several texts.
+
+        Args:
+            texts (List[str]): The texts to look up.
+            model (str): The embedding model.
+
+        Returns:
+            Dict[str, np.ndarray]: Mapping of the texts that were found to their float32 embeddings.
+        """
+        keys = {text: self.make_key(text, model) for text in texts}
+        found = {}
+        missing = {}
+        with self._lock:
+            for text, key in keys.items():
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+                else:
+                    missing[key] = text
+        if missing:
+            stored = self.store.get_many(missing.keys())
+            loaded = {key: np.frombuffer(value, dtype=np.float32)
+                      for key, value in stored.items()}
+            self._remember(loaded)
+            for key, embedding in loaded.items():
+                found[missing[key]] = embedding
+        return found
+
+    def get(self, text: str, model: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding for a single text.
+
+        Args:
+            text (str): The text to look up.
+            model (str): The embedding model.
+
+        Returns:
+            Optional[np.ndarray]: The float32 embedding, or None if it is not cached.
+        """
+        return self.get_many([text], model).get(text)
+
+    def set_many(self, embeddings: Dict[str, List[float]], model: str):
+        """
+        Store embeddings for several texts.
+
+        Args:
+            embeddings (Dict[str, List[float]]): Mapping of texts to their embeddings.
+            model (str): The embedding model.
+        """
+        arrays = {self.make_key(text, model): np.asarray(embedding, dtype=np.float32)
+                  for text, embedding in embeddings.items()}
+        self.store.set_many((key, array.tobytes())
+                            for key, array in arrays.items())
+        self._remember(arrays)
+
+    def set(self, text: str, embedding: List[float], model: str):
+        """
+        Store the embedding for a single text.
+
+        Args:
+            text (str): The embedded text.
+            embedding (List[float]): Its embedding.
+            model (str): The embedding model.
+        """
+        self.set_many({text: embedding}, model)
+
+    def _remember(self, arrays: Dict[str, np.ndarray]):
+        if self.memory_size <= 0:
+            return
+        with self._lock:
+            for key, array in arrays.items():
+                self._memory[key] = array
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different spellings of an article share a cache entry.
+
+    The scheme and host are lowercased, the fragment and tracking parameters are dropped and
+    the remaining query parameters are sorted.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith(_TRACKING_PARAMS))
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+@dataclass
+class CachedArticle:
+    """
+    Cleaned article text, or the status of a failed fetch, with the validators needed to revalidate it.
+    """
+    url: str
+    text: Optional[str]
+    status_code: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def accessible(self) -> bool:
+        """
+        Whether the fetch succeeded and the text is available.
+        """
+        return self.text is not None
+
+
+class ArticleCache:
+    """
+    Cleaned article content keyed by canonical URL, persisted in a SQLiteCache.
+
+    Entries younger than ttl are served as they are. Older successful entries are revalidated
+    with a conditional GET using their ETag/Last-Modified, and anything older than max_age is
+    purged. Failed fetches are remembered for failure_ttl so dead links are not retried on
+    every run.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 20000,
+        ttl: float = 6 * 3600,
+        max_age: float = 7 * 24 * 3600,
+        failure_ttl: float = 3600
+    ):
+        """
+        Open (or create) the article cache and purge expired entries.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int, optional): Maximum number of articles kept. Defaults to 20000.
+            ttl (float, optional): Seconds an article is served without revalidation. Defaults to 6 hours.
+            max_age (float, optional): Seconds after which an article is dropped. Defaults to 7 days.
+            failure_ttl (float, optional): Seconds a failed fetch is remembered. Defaults to 1 hour.
+        """
+        self.store = SQLiteCache(path, max_entries=max_entries, table="articles")
+        self.ttl = ttl
+        self.max_age = max_age
+        self.failure_ttl = failure_ttl
+        self.store.purge(max_age)
+
+    def get(self, url: str) -> Optional[CachedArticle]:
+        """
+        Look up the cached article for a URL.
+
+        Args:
+            url (str): The URL of the article.
+
+        Returns:
+            Optional[CachedArticle]: The cached article, or None if missing or expired.
+        """
+        value = self.store.get(canonical_url(url), max_age=self.max_age)
+        if value is None:
+            return None
+        return CachedArticle(**json.loads(value))
+
+    def is_fresh(self, article: CachedArticle) -> bool:
+        """
+        Whether a cached article can be used without going to the network.
+
+        Args:
+            article (CachedArticle): The cached article.
+
+        Returns:
+            bool: True if it is younger than ttl (failure_ttl for failed fetches).
+        """
+        ttl = self.ttl if article.accessible else self.failure_ttl
+        return time.time() - article.fetched_at <= ttl
+
+    def can_revalidate(self, article: CachedArticle) -> bool:
+        """
+        Whether a stale cached article carries validators for a conditional GET.
+
+        Args:
+            article (CachedArticle): The cached article.
+
+        Returns:
+            bool: True if the article has text and an ETag or Last-Modified date.
+        """
+        return article.accessible and bool(article.etag or article.last_modified)
+
+    def set(
+        self,
+        url: str,
+        text: Optional[str],
+        status_code: int,
+        etag: str = None,
+        last_modified: str = None
+    ) -> CachedArticle:
+        """
+        Store the result of a fetch.
+
+        Args:
+            url (str): The URL of the article.
+            text (Optional[str]): The cleaned text, or None if the fetch failed.
+            status_code (int): The HTTP status of the fetch (0 if no response was received).
+            etag (str, optional): The response ETag. Defaults to None.
+            last_modified (str, optional): The response Last-Modified date. Defaults to None.
+
+        Returns:
+            CachedArticle: The stored article.
+        """
+        article = CachedArticle(url=url, text=text, status_code=status_code, etag=etag,
+                                last_modified=last_modified, fetched_at=time.time())
+        self.store.set(canonical_url(url), json.dumps(asdict(article)).encode("utf-8"))
+        return article
+
+    def refresh(self, article: CachedArticle, etag: str = None, last_modified: str = None) -> CachedArticle:
+        """
+        Mark a cached article as revalidated, after the server answered 304 Not Modified.
+
+        Args:
+            article (CachedArticle): The cached article.
+            etag (str, optional): A new ETag, if the server sent one. Defaults to None.
+            last_modified (str, optional): A new Last-Modified date, if the server sent one. Defaults to None.
+
+        Returns:
+            CachedArticle: The refreshed article.
+        """
+        return self.set(article.url, article.text, article.status_code,
+                        etag or article.etag, last_modified or article.last_modified)
+
+
+def normalize_objective(objective: str) -> str:
+    """
+    Normalize a summarization objective so that whitespace and case differences share a cache entry.
+
+    Args:
+        objective (str): The objective.
+
+    Returns:
+        str: The normalized objective.
+    """
+    return " ".join(objective.split()).casefold()
+
+
+class SummaryCache:
+    """
+    Article summaries keyed by hash(model, canonical URL, normalized objective), persisted in a SQLiteCache.
+
+    Verdicts are cached along with summaries: NOT_RELEVANT is kept as long as a summary, while
+    INACCESSIBLE is kept for failure_ttl only, since the article may become reachable again.
+    """
+
+    INACCESSIBLE = "INACCESSIBLE"
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 50000,
+        ttl: float = 7 * 24 * 3600,
+        failure_ttl: float = 3600
+    ):
+        """
+        Open (or create) the summary cache and purge expired entries.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int, optional): Maximum number of summaries kept. Defaults to 50000.
+            ttl (float, optional): Seconds a summary or NOT_RELEVANT verdict is kept. Defaults to 7 days.
+            failure_ttl (float, optional): Seconds an INACCESSIBLE verdict is kept. Defaults to 1 hour.
+        """
+        self.store = SQLiteCache(path, max_entries=max_entries, table="summaries")
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.store.purge(ttl)
+
+    @staticmethod
+    def make_key(url: str, objective: str, model: str) -> str:
+        """
+        Build the cache key for the summary of an article.
+
+        Args:
+            url (str): The URL of the article.
+            objective (str): The summarization objective.
+            model (str): The name of the summarization model.
+
+        Returns:
+            str: The hex digest identifying the (model, URL, objective) triple.
+        """
+        objective_hash = hashlib.sha256(
+            normalize_objective(objective).encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            f"{model}\0{canonical_url(url)}\0{objective_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, url: str, objective: str, model: str) -> Optional[str]:
+        """
+        Look up the summary of an article.
+
+        Args:
+            url (str): The URL of the article.
+            objective (str): The summarization objective.
+            model (str): The name of the summarization model.
+
+        Returns:
+            Optional[str]: The summary or verdict, or None if missing or expired.
+        """
+        value = self.store.get(self.make_key(url, objective, model), max_age=self.ttl)
+        if value is None:
+            return None
+        entry = json.loads(value)
+        if entry["summary"] == self.INACCESSIBLE and time.time() - entry["created_at"] > self.failure_ttl:
+            return None
+        return entry["summary"]
+
+    def set(self, url: str, objective: str, model: str, summary: str):
+        """
+        Store the summary of an article.
+
+        Args:
+            url (str): The URL of the article.
+            objective (str): The summarization objective.
+            model (str): The name of the summarization model.
+            summary (str): The summary or verdict.
+        """
+        value = json.dumps({"summary": summary, "created_at": time.time()})
+        self.store.set(self.make_key(url, objective, model), value.encode("utf-8"))
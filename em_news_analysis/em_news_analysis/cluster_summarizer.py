@@ -5,6 +5,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from datetime import datetime
 from tenacity import retry, stop_after_attempt, wait_exponential
 from .models import Event
+from .llm_scheduler import CLUSTER_LANE, get_llm_scheduler
 
 
 logger = logging.getLogger(__name__)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 # Should be consistent with backend and Frontend. Add tests to ensure
 
 
-def combined_summary(summaries_list: List[str], objective: str, model: int = 4, retry_attempts: int = 3) -> str:
+def combined_summary(summaries_list: List[str], objective: str, model: int = 4, retry_attempts: int = 3, priority: float = 0) -> str:
     """
     Combine multiple summaries into a final summary.
 
@@ -21,6 +22,7 @@ def combined_summary(summaries_list: List[str], objective: str, model: int = 4,
         objective (str): Provides an objective for the summary of the article, including the relevant meta-data.
         model (int, optional): The model to use for summarization. If 3, uses "gpt-4o-mini". Otherwise, uses "gpt-4o". Defaults to 4.
         retry_attempts (int, optional): Number of retry attempts for the API call. Defaults to 3.
+        priority (float, optional): Priority of the call in the LLM scheduler's cluster lane; lower runs first. Defaults to 0.
 
     Returns:
         str: The combined summary.
@@ -60,7 +62,8 @@ def combined_summary(summaries_list: List[str], objective: str, model: int = 4,
     @retry(stop=stop_after_attempt(retry_attempts), wait=wait_exponential(multiplier=1, min=4, max=10))
     def invoke_with_retry():
         try:
-            return chain.invoke({"input": input_prompt})
+            with get_llm_scheduler().slot(CLUSTER_LANE, priority):
+                return chain.invoke({"input": input_prompt})
         except Exception as e:
             logger.error(f"Error generating cluster summary: {str(e)}")
             raise e
@@ -68,19 +71,20 @@ def combined_summary(summaries_list: List[str], objective: str, model: int = 4,
     return invoke_with_retry()
 
 
-def generate_cluster_summary(summaries: List[str], objective: str) -> Event:
+def generate_cluster_summary(summaries: List[str], objective: str, priority: float = 0) -> Event:
     """
     Generate a combined summary for a cluster using the combined_summary function.
 
     Args:
         summaries (List[str]): List of summaries to combine.
         objective (str): Objective for the summary generation.
+        priority (float, optional): Priority of the call in the LLM scheduler's cluster lane; lower runs first. Defaults to 0.
 
     Returns:
         Event: An Event object containing the generated summary, title, and relevance information.
     """
     try:
-        event = combined_summary(summaries, objective)
+        event = combined_summary(summaries, objective, priority=priority)
         if "INACCESSIBLE" in event.title or "INACCESSIBLE" in event.summary:
             logger.error(
                 f"Error generating cluster summary: {event.title} {event.summary}")
@@ -2,20 +2,34 @@
 import numpy as np
 from sklearn.metrics import silhouette_score, davies_bouldin_score
 from sklearn.model_selection import ParameterGrid
-from joblib import Parallel, delayed
-from typing import List, Any, Callable, Dict, Tuple
+from joblib import Parallel, delayed, effective_n_jobs
+from typing import List, Any, Callable, Dict, Optional, Tuple, Union
+import math
+import time
 import warnings
 from sklearn.model_selection import ParameterGrid
 from sklearn.metrics import silhouette_score
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import HDBSCAN
 from sklearn.decomposition import PCA
 import umap
+from sklearn.metrics import DistanceMetric
+from sklearn.neighbors import NearestNeighbors
+from sklearn.metrics import pairwise_distances
 from .config import BaseConfig
+from .scoring import DEFAULT_SILHOUETTE_SAMPLE_SIZE, composite_score, score_clustering
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    # Private HDBSCAN building blocks, used to share the single-linkage tree between settings
+    from sklearn.cluster._hdbscan.hdbscan import _process_mst
+    from sklearn.cluster._hdbscan._linkage import mst_from_data_matrix
+    from sklearn.cluster._hdbscan._tree import tree_to_labels
+    HAS_HDBSCAN_INTERNALS = True
+except ImportError:
+    HAS_HDBSCAN_INTERNALS = False
+
 
 def cluster_embeddings(
     embeddings: np.ndarray,
@@ -78,6 +92,483 @@ def cluster_embeddings(
         raise ValueError(f"Clustering failed: {str(e)}")
 
 
+REDUCTION_PARAMS = ('reduce_dimensionality', 'reducer_algorithm', 'n_components')
+
+
+def reduction_key(params: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """
+    Identify the dimensionality reduction a parameter set asks for.
+
+    Args:
+        params (Dict[str, Any]): A parameter set from the grid.
+
+    Returns:
+        Optional[Tuple[str, int]]: (reducer_algorithm, n_components), or None if the embeddings are used as is.
+    """
+    reducer_algorithm_name = params.get('reducer_algorithm', 'umap')
+    if not params.get('reduce_dimensionality', True) or reducer_algorithm_name == 'none':
+        return None
+    return reducer_algorithm_name, params.get('n_components', 50)
+
+
+def clustering_params_of(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip the dimensionality reduction parameters from a parameter set.
+    """
+    return {key: value for key, value in params.items() if key not in REDUCTION_PARAMS}
+
+
+def deduplicate_params(param_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop parameter sets that are equivalent to an earlier one.
+
+    Two sets are equivalent when they ask for the same reduction and the same clustering
+    parameters, e.g. every n_components value when reduce_dimensionality is False.
+    The first set of each group is kept, so grid order is preserved.
+
+    Args:
+        param_list (List[Dict[str, Any]]): Parameter sets in grid order.
+
+    Returns:
+        List[Dict[str, Any]]: The distinct parameter sets.
+    """
+    seen = set()
+    unique = []
+    for params in param_list:
+        key = (reduction_key(params), repr(
+            sorted(clustering_params_of(params).items())))
+        if key not in seen:
+            seen.add(key)
+            unique.append(params)
+    return unique
+
+
+def reduce_embeddings(
+    embeddings: np.ndarray,
+    input_embedding: np.ndarray,
+    key: Optional[Tuple[str, int]],
+    reducer_algorithms: Dict[str, Callable]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply one dimensionality reduction to the embeddings and the input embedding.
+
+    Args:
+        embeddings (np.ndarray): Embeddings to reduce.
+        input_embedding (np.ndarray): Embedding of the input sentence.
+        key (Optional[Tuple[str, int]]): The reduction, as returned by reduction_key.
+        reducer_algorithms (Dict[str, Callable]): Mapping from reducer_algorithm name to the reducer class.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The reduced embeddings and the reduced input embedding (as a single row).
+    """
+    if key is None:
+        return embeddings, input_embedding.reshape(1, -1)
+
+    reducer_algorithm_name, n_components = key
+    if reducer_algorithm_name not in reducer_algorithms:
+        raise ValueError(
+            f"Unsupported reducer_algorithm: {reducer_algorithm_name}")
+    reducer = reducer_algorithms[reducer_algorithm_name](
+        n_components=n_components)
+    embeddings_reduced = reducer.fit_transform(embeddings)
+    input_embedding_reduced = reducer.transform(
+        input_embedding.reshape(1, -1))
+    return embeddings_reduced, input_embedding_reduced
+
+
+def score_labels(
+    embeddings_reduced: np.ndarray,
+    input_embedding_reduced: np.ndarray,
+    labels: np.ndarray,
+    probabilities: np.ndarray,
+    params: Dict[str, Any],
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE,
+    distances: np.ndarray = None
+) -> Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]:
+    """
+    Score a clustering of already-reduced embeddings.
+
+    Args:
+        embeddings_reduced (np.ndarray): Embeddings after the parameter set's reduction.
+        input_embedding_reduced (np.ndarray): Input embedding after the same reduction, as a single row.
+        labels (np.ndarray): Cluster label of each embedding, -1 for noise.
+        probabilities (np.ndarray): Cluster membership strength of each embedding.
+        params (Dict[str, Any]): The parameter set that produced the labels.
+        silhouette_sample_size (int, optional): Maximum number of points used for the silhouette.
+            Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+        distances (np.ndarray, optional): Precomputed pairwise distances between the embeddings. Defaults to None.
+
+    Returns:
+        Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]: Composite score, labels,
+            parameters, scores by component and number of noise points.
+    """
+    noise_count = np.sum(labels == -1)
+    scores = score_clustering(
+        embeddings_reduced, input_embedding_reduced, labels, probabilities,
+        silhouette_sample_size=silhouette_sample_size, distances=distances)
+    return (composite_score(scores), labels, params, scores, noise_count)
+
+
+def evaluate_params(
+    embeddings_reduced: np.ndarray,
+    input_embedding_reduced: np.ndarray,
+    params: Dict[str, Any],
+    clustering_algorithm: Callable,
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE
+) -> Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]:
+    """
+    Cluster already-reduced embeddings with one parameter set and score the result.
+
+    Args:
+        embeddings_reduced (np.ndarray): Embeddings after the parameter set's reduction.
+        input_embedding_reduced (np.ndarray): Input embedding after the same reduction, as a single row.
+        params (Dict[str, Any]): The full parameter set; its reduction parameters are ignored here.
+        clustering_algorithm (Callable): Clustering algorithm to use.
+        silhouette_sample_size (int, optional): Maximum number of points used for the silhouette.
+            Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+
+    Returns:
+        Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]: Composite score, labels,
+            parameters, scores by component and number of noise points. The composite score is
+            -inf if clustering failed.
+    """
+    # Suppress warnings for cleaner output (this may run in a worker process)
+    warnings.filterwarnings("ignore")
+    try:
+        clusterer = clustering_algorithm(**clustering_params_of(params))
+        labels = clusterer.fit_predict(embeddings_reduced)
+        return score_labels(embeddings_reduced, input_embedding_reduced,
+                            labels, clusterer.probabilities_, params, silhouette_sample_size)
+    except Exception as e:
+        logger.error(f"Failed for parameters {params}: {str(e)}")
+        return (-np.inf, None, params, {}, 0)
+
+
+SHARED_TREE_PARAMS = {'min_cluster_size', 'min_samples',
+                      'cluster_selection_epsilon', 'metric'}
+
+
+def shared_tree_key(params: Dict[str, Any], clustering_algorithm: Callable) -> Optional[Tuple[Any, int]]:
+    """
+    Identify the HDBSCAN single-linkage tree a parameter set can share with others.
+
+    The tree depends only on the reduced embeddings and min_samples; min_cluster_size and
+    cluster_selection_epsilon only change how it is cut. Parameter sets using other HDBSCAN
+    options, another metric or another clustering algorithm are clustered from scratch.
+
+    Args:
+        params (Dict[str, Any]): A parameter set from the grid.
+        clustering_algorithm (Callable): Clustering algorithm in use.
+
+    Returns:
+        Optional[Tuple[Any, int]]: (reduction_key, min_samples), or None if the tree can't be shared.
+    """
+    if not HAS_HDBSCAN_INTERNALS or clustering_algorithm is not HDBSCAN:
+        return None
+    clustering_params = clustering_params_of(params)
+    if not set(clustering_params) <= SHARED_TREE_PARAMS or clustering_params.get('metric', 'euclidean') != 'euclidean':
+        return None
+    min_cluster_size = clustering_params.get('min_cluster_size', 5)
+    min_samples = clustering_params.get('min_samples')
+    return reduction_key(params), min_cluster_size if min_samples is None else min_samples
+
+
+def neighbor_distances(embeddings_reduced: np.ndarray, n_neighbors: int) -> np.ndarray:
+    """
+    Distances from each point to its n_neighbors nearest neighbors (itself included), as HDBSCAN computes them.
+
+    Column k - 1 holds the core distances for min_samples = k.
+    """
+    X = np.ascontiguousarray(embeddings_reduced, dtype=np.float64)
+    nbrs = NearestNeighbors(
+        n_neighbors=n_neighbors, algorithm='kd_tree', leaf_size=40, metric='euclidean').fit(X)
+    distances, _ = nbrs.kneighbors(X, n_neighbors, return_distance=True)
+    return distances
+
+
+def evaluate_shared_tree(
+    embeddings_reduced: np.ndarray,
+    input_embedding_reduced: np.ndarray,
+    core_distances: np.ndarray,
+    params_list: List[Dict[str, Any]],
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE
+) -> List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]:
+    """
+    Evaluate HDBSCAN parameter sets that share a single-linkage tree.
+
+    The mutual-reachability minimum spanning tree is built once from the core distances, and
+    each parameter set only extracts its labels from the condensed tree, which gives the same
+    labels as HDBSCAN(**params).fit_predict. When every point fits in the silhouette sample,
+    the pairwise distances are also computed once and shared by all the silhouette scores.
+    The tree is built and cut with private sklearn helpers; if they fail (e.g. their signature
+    changed), the parameter sets are clustered with evaluate_params instead.
+
+    Args:
+        embeddings_reduced (np.ndarray): Embeddings after the shared reduction.
+        input_embedding_reduced (np.ndarray): Input embedding after the same reduction, as a single row.
+        core_distances (np.ndarray): Distance of each point to its min_samples-th nearest neighbor.
+        params_list (List[Dict[str, Any]]): Parameter sets with the same shared_tree_key.
+        silhouette_sample_size (int, optional): Maximum number of points used for the silhouette.
+            Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+
+    Returns:
+        List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]: The result of each
+            parameter set, as evaluate_params would return it.
+    """
+    # Suppress warnings for cleaner output (this may run in a worker process)
+    warnings.filterwarnings("ignore")
+    try:
+        X = np.ascontiguousarray(embeddings_reduced, dtype=np.float64)
+        min_spanning_tree = mst_from_data_matrix(
+            X, np.ascontiguousarray(core_distances), DistanceMetric.get_metric('euclidean'), 1.0)
+        single_linkage_tree = _process_mst(min_spanning_tree)
+    except Exception as e:
+        logger.warning(
+            f"Could not build a shared HDBSCAN tree ({str(e)}); clustering each parameter set separately.")
+        return [evaluate_params(embeddings_reduced, input_embedding_reduced, params, HDBSCAN,
+                                silhouette_sample_size)
+                for params in params_list]
+
+    distances = None
+    if len(params_list) > 1 and len(X) <= silhouette_sample_size:
+        distances = pairwise_distances(X)
+
+    results = []
+    for position, params in enumerate(params_list):
+        try:
+            labels, probabilities = tree_to_labels(
+                single_linkage_tree,
+                params.get('min_cluster_size', 5),
+                'eom',
+                False,
+                float(params.get('cluster_selection_epsilon', 0.0)),
+                None,
+            )
+        except (TypeError, AttributeError, ImportError) as e:
+            # The private sklearn API changed; the remaining parameter sets are clustered the public way
+            logger.warning(
+                f"Could not cut the shared HDBSCAN tree ({str(e)}); clustering each parameter set separately.")
+            return results + [evaluate_params(embeddings_reduced, input_embedding_reduced, remaining,
+                                              HDBSCAN, silhouette_sample_size)
+                              for remaining in params_list[position:]]
+        try:
+            results.append(score_labels(
+                embeddings_reduced, input_embedding_reduced, labels, probabilities, params,
+                silhouette_sample_size, distances))
+        except Exception as e:
+            logger.error(f"Failed for parameters {params}: {str(e)}")
+            results.append((-np.inf, None, params, {}, 0))
+    return results
+
+
+def _try_reduce_embeddings(*args) -> Any:
+    try:
+        return reduce_embeddings(*args)
+    except Exception as e:
+        return e
+
+
+def _try_neighbor_distances(*args) -> Any:
+    try:
+        return neighbor_distances(*args)
+    except Exception as e:
+        return e
+
+
+def _evaluate_one(*args) -> List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]:
+    return [evaluate_params(*args)]
+
+
+def evaluate_candidates(
+    embeddings: np.ndarray,
+    input_embedding: np.ndarray,
+    candidates: List[Dict[str, Any]],
+    clustering_algorithm: Callable,
+    reducer_algorithms: Dict[str, Callable],
+    n_jobs: int = -1,
+    deadline: float = None,
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE
+) -> List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]:
+    """
+    Evaluate parameter sets on the given embeddings, fitting each distinct reduction once.
+
+    Args:
+        embeddings (np.ndarray): Embeddings to cluster.
+        input_embedding (np.ndarray): Embedding of the input sentence for relevance scoring.
+        candidates (List[Dict[str, Any]]): Parameter sets to evaluate.
+        clustering_algorithm (Callable): Clustering algorithm to use.
+        reducer_algorithms (Dict[str, Callable]): Mapping from reducer_algorithm name to the reducer class.
+        n_jobs (int, optional): Number of jobs to run in parallel. -1 means using all processors.
+        deadline (float, optional): time.monotonic() value after which no further chunk of
+            evaluations is started. At least one chunk is always evaluated. Defaults to None (no limit).
+        silhouette_sample_size (int, optional): Maximum number of points used for the silhouette.
+            Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+
+    Returns:
+        List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]: The evaluate_params
+            result of each evaluated candidate, in candidate order.
+    """
+    reduction_keys = list(dict.fromkeys(
+        reduction_key(params) for params in candidates))
+
+    # Fit each distinct reduction once
+    reduced = Parallel(n_jobs=n_jobs)(
+        delayed(_try_reduce_embeddings)(
+            embeddings, input_embedding, key, reducer_algorithms)
+        for key in reduction_keys
+    )
+    reductions = {}
+    for key, result in zip(reduction_keys, reduced):
+        if isinstance(result, Exception):
+            logger.error(f"Reduction {key} failed: {str(result)}")
+        else:
+            reductions[key] = result
+
+    # Group the parameter sets that can share an HDBSCAN tree, and find the nearest-neighbor
+    # distances of each reduction once for all of its min_samples values
+    groups = {}
+    for params in candidates:
+        key = shared_tree_key(params, clustering_algorithm)
+        if key is not None and key[0] in reductions:
+            groups.setdefault(key, []).append(params)
+    max_min_samples = {}
+    for reduction, min_samples in groups:
+        max_min_samples[reduction] = max(
+            min_samples, max_min_samples.get(reduction, 0))
+    distances = Parallel(n_jobs=n_jobs)(
+        delayed(_try_neighbor_distances)(reductions[reduction][0], n_neighbors)
+        for reduction, n_neighbors in max_min_samples.items()
+    )
+    distances = dict(zip(max_min_samples, distances))
+
+    # One task per shared tree, or per parameter set that is clustered from scratch
+    tasks = []
+    for params in candidates:
+        key = reduction_key(params)
+        if key not in reductions:
+            continue
+        tree_key = shared_tree_key(params, clustering_algorithm)
+        if tree_key is None or isinstance(distances.get(key), Exception):
+            tasks.append(([params], delayed(_evaluate_one)(
+                *reductions[key], params, clustering_algorithm, silhouette_sample_size)))
+        elif tree_key in groups:
+            group = groups.pop(tree_key)
+            tasks.append((group, delayed(evaluate_shared_tree)(
+                *reductions[key], distances[key][:, tree_key[1] - 1], group,
+                silhouette_sample_size)))
+
+    # Evaluate in parallel; joblib memory-maps large reduced arrays so every worker reads the same copy
+    chunk_size = max(1, len(tasks)) if deadline is None else max(
+        1, 2 * effective_n_jobs(n_jobs))
+    evaluated = {}
+    with Parallel(n_jobs=n_jobs, max_nbytes='1M', mmap_mode='r') as parallel:
+        for start in range(0, len(tasks), chunk_size):
+            if evaluated and deadline is not None and time.monotonic() > deadline:
+                logger.warning(
+                    f"Clustering time budget exhausted after {len(evaluated)} of {len(candidates)} evaluations.")
+                break
+            chunk = tasks[start:start + chunk_size]
+            for (group, _), group_results in zip(chunk, parallel(task for _, task in chunk)):
+                for params, result in zip(group, group_results):
+                    evaluated[id(params)] = result
+
+    results = []
+    for params in candidates:
+        if reduction_key(params) not in reductions:
+            results.append((-np.inf, None, params, {}, 0))
+        elif id(params) in evaluated:
+            results.append(evaluated[id(params)])
+    return results
+
+
+def grid_search(
+    candidates: List[Dict[str, Any]],
+    evaluate: Callable,
+    n_samples: int,
+    deadline: float = None
+) -> List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]:
+    """
+    Evaluate every candidate on the full data, in grid order, until the deadline.
+
+    Args:
+        candidates (List[Dict[str, Any]]): Parameter sets to evaluate.
+        evaluate (Callable): evaluate(candidates, indices, deadline) scores candidates on the
+            rows at indices, or on all rows if indices is None.
+        n_samples (int): Number of rows in the data.
+        deadline (float, optional): time.monotonic() value to stop at. Defaults to None (no limit).
+
+    Returns:
+        List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]: Results on the full data.
+    """
+    return evaluate(candidates, None, deadline)
+
+
+def successive_halving_search(
+    candidates: List[Dict[str, Any]],
+    evaluate: Callable,
+    n_samples: int,
+    deadline: float = None,
+    factor: int = 3,
+    min_subsample: int = 100,
+    random_state: int = 0
+) -> List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]:
+    """
+    Successive halving: score all candidates on a small random subsample, keep the best
+    1/factor of them, and repeat on a factor times larger subsample until the survivors are
+    scored on the full data.
+
+    If the deadline passes between rounds, only the current leader is scored on the full data.
+
+    Args:
+        candidates (List[Dict[str, Any]]): Parameter sets to evaluate.
+        evaluate (Callable): evaluate(candidates, indices, deadline) scores candidates on the
+            rows at indices, or on all rows if indices is None.
+        n_samples (int): Number of rows in the data.
+        deadline (float, optional): time.monotonic() value to stop at. Defaults to None (no limit).
+        factor (int, optional): Fraction of candidates (1/factor) kept after each round. Defaults to 3.
+        min_subsample (int, optional): Smallest subsample size. Defaults to 100.
+        random_state (int, optional): Seed for drawing the subsamples. Defaults to 0.
+
+    Returns:
+        List[Tuple[float, np.ndarray, Dict[str, Any], Dict[str, float], int]]: Results on the full data.
+    """
+    rng = np.random.default_rng(random_state)
+
+    # Enough rounds to narrow the candidates down to a few, as long as the first
+    # subsample keeps at least min_subsample rows
+    n_rounds = 1
+    while (len(candidates) / factor ** (n_rounds - 1) > factor
+           and n_samples / factor ** n_rounds >= min_subsample):
+        n_rounds += 1
+
+    survivors = candidates
+    for round_index in range(n_rounds - 1):
+        sample_size = n_samples // factor ** (n_rounds - 1 - round_index)
+        indices = np.sort(rng.choice(n_samples, sample_size, replace=False))
+        results = evaluate(survivors, indices, deadline)
+        # Stable sort, so ties keep grid order
+        results = sorted((result for result in results if result[0] > -np.inf),
+                         key=lambda result: result[0], reverse=True)
+        if not results:
+            break
+        logger.info(
+            f"Successive halving round {round_index + 1}: scored {len(survivors)} candidates "
+            f"on {sample_size} rows, best score {results[0][0]}")
+        if deadline is not None and time.monotonic() > deadline:
+            survivors = [results[0][2]]
+            break
+        survivors = [result[2]
+                     for result in results[:math.ceil(len(survivors) / factor)]]
+
+    return evaluate(survivors, None, deadline)
+
+
+SEARCH_STRATEGIES = {
+    'grid': grid_search,
+    'halving': successive_halving_search,
+}
+
+
 def optimize_clustering(
     embeddings: np.ndarray,
     param_grid: Dict[str, List[Any]],
@@ -85,13 +576,27 @@ def optimize_clustering(
     scoring_functions: Dict[str, Callable] = None,
     clustering_algorithm: Callable = None,
     reducer_algorithms: Dict[str, Callable] = None,
-    n_jobs: int = -1
+    n_jobs: int = -1,
+    search: Union[str, Callable] = 'grid',
+    max_evaluations: int = None,
+    time_budget: float = None,
+    random_state: int = 0,
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE
 ) -> Tuple[np.ndarray, Dict[str, Any], Dict[str, float], int]:
     """
     Optimize clustering and dimensionality reduction hyperparameters using parallel grid search.
     Uses an ensemble of scoring functions to evaluate clustering performance.
     Now includes options for clustering without dimensionality reduction.
 
+    Equivalent parameter sets are evaluated once, and each distinct reduction
+    (reducer_algorithm, n_components) is fitted once and shared by every clustering setting
+    that uses it. Large reduced arrays are passed to the workers as read-only memory maps.
+
+    The search strategy decides which candidates are scored on which rows. 'grid' scores every
+    candidate on all rows; 'halving' (successive_halving_search) scores them on growing random
+    subsamples and only scores the most promising ones on all rows. A custom strategy is a
+    callable with the signature of grid_search.
+
     Args:
         embeddings (np.ndarray): Embeddings to cluster.
         param_grid (Dict[str, List[Any]]): Grid of hyperparameters to search.
@@ -100,6 +605,14 @@ def optimize_clustering(
         clustering_algorithm (Callable, optional): Clustering algorithm to use.
         reducer_algorithms (Dict[str, Callable], optional): Mapping from reducer_algorithm name to the reducer class.
         n_jobs (int, optional): Number of jobs to run in parallel. -1 means using all processors.
+        search (Union[str, Callable], optional): Search strategy, 'grid' or 'halving', or a callable. Defaults to 'grid'.
+        max_evaluations (int, optional): Maximum number of distinct parameter sets to consider; a random
+            subset of the grid is used if it is larger. Defaults to None (the whole grid).
+        time_budget (float, optional): Seconds after which no new evaluations are started. The best
+            candidate found so far is always scored on all rows. Defaults to None (no limit).
+        random_state (int, optional): Seed for sampling the grid when max_evaluations applies. Defaults to 0.
+        silhouette_sample_size (int, optional): Maximum number of points used for each silhouette score;
+            larger clusterings are scored on a stratified subsample. Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
 
     Returns:
         Tuple[np.ndarray, Dict[str, Any], Dict[str, float], int]: Best cluster labels, best hyperparameters, best scores by component, and number of noise points.
@@ -120,97 +633,34 @@ def optimize_clustering(
             'none': lambda **kwargs: None  # No reduction
         }
 
-    param_list = list(ParameterGrid(param_grid))
+    grid_size = len(ParameterGrid(param_grid))
+    param_list = deduplicate_params(list(ParameterGrid(param_grid)))
+    if max_evaluations is not None and len(param_list) > max_evaluations:
+        rng = np.random.default_rng(random_state)
+        chosen = np.sort(rng.choice(
+            len(param_list), max_evaluations, replace=False))
+        param_list = [param_list[i] for i in chosen]
+    logger.info(
+        f"Searching {len(param_list)} distinct parameter sets out of {grid_size} "
+        f"using {len({reduction_key(params) for params in param_list})} distinct reductions.")
+
+    if isinstance(search, str):
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unsupported search strategy: {search}")
+        search = SEARCH_STRATEGIES[search]
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
 
     # Suppress warnings for cleaner output
     warnings.filterwarnings("ignore")
 
-    def evaluate_params(params):
-        try:
-            # Extract dimensionality reduction parameters
-            reduce_dimensionality = params.get('reduce_dimensionality', True)
-            reducer_algorithm_name = params.get('reducer_algorithm', 'umap')
-            n_components = params.get('n_components', 50)
-
-            # Remove dimensionality reduction parameters from params
-            clustering_params = params.copy()
-            clustering_params.pop('reduce_dimensionality', None)
-            clustering_params.pop('reducer_algorithm', None)
-            clustering_params.pop('n_components', None)
-
-            # Dimensionality Reduction
-            if reduce_dimensionality and reducer_algorithm_name != 'none':
-                if reducer_algorithm_name not in reducer_algorithms:
-                    raise ValueError(
-                        f"Unsupported reducer_algorithm: {reducer_algorithm_name}")
-                reducer_class = reducer_algorithms[reducer_algorithm_name]
-                reducer = reducer_class(n_components=n_components)
-                embeddings_reduced = reducer.fit_transform(embeddings)
-                input_embedding_reduced = reducer.transform(
-                    input_embedding.reshape(1, -1))
-            else:
-                embeddings_reduced = embeddings
-                input_embedding_reduced = input_embedding.reshape(1, -1)
-
-            # Clustering
-            clusterer = clustering_algorithm(**clustering_params)
-            labels = clusterer.fit_predict(embeddings_reduced)
-
-            # Count noise points
-            noise_count = np.sum(labels == -1)
-
-            # Compute individual scores
-            scores = {}
-
-            # Silhouette Score (Higher is better)
-            silhouette_avg = silhouette_score(
-                embeddings_reduced[labels != -1], labels[labels != -1]) if len(set(labels[labels != -1])) > 1 else 0
-            scores['silhouette'] = silhouette_avg
-
-            # Davies-Bouldin Index (Lower is better)
-            davies_bouldin = davies_bouldin_score(
-                embeddings_reduced[labels != -1], labels[labels != -1]) if len(set(labels[labels != -1])) > 1 else np.inf
-            # Invert Davies-Bouldin Index so that higher is better
-            scores['davies_bouldin'] = -davies_bouldin
-
-            # Cluster Stability (Higher is better)
-            cluster_stabilities = clusterer.probabilities_[labels != -1]
-            stability_avg = np.mean(cluster_stabilities)
-            scores['stability'] = stability_avg
-
-            # Relevance Score (Higher is better)
-            # Compute cluster centroids
-            centroids = []
-            for label in set(labels[labels != -1]):
-                cluster_points = embeddings_reduced[labels == label]
-                centroid = np.mean(cluster_points, axis=0)
-                centroids.append(centroid)
-            centroids = np.array(centroids)
-
-            # Compute similarities to input embedding
-            similarities = cosine_similarity(
-                input_embedding_reduced, centroids)[0]
-            relevance_score = np.max(similarities)
-            scores['relevance'] = relevance_score
-
-            # Combine scores into a composite score
-            # You can adjust the weights as needed
-            composite_score = (
-                scores['silhouette'] * 0.7
-                + scores['davies_bouldin'] * 0.2
-                + scores['stability'] * 0.05
-                + scores['relevance'] * 0.05
-            )
-
-            return (composite_score, labels, params, scores, noise_count)
-        except Exception as e:
-            logger.error(f"Failed for parameters {params}: {str(e)}")
-            return (-np.inf, None, params, {}, 0)
+    def evaluate(candidates, indices, deadline):
+        data = embeddings if indices is None else embeddings[indices]
+        return evaluate_candidates(
+            data, input_embedding, candidates, clustering_algorithm, reducer_algorithms,
+            n_jobs=n_jobs, deadline=deadline, silhouette_sample_size=silhouette_sample_size)
 
-    # Run the parameter evaluations in parallel
-    results = Parallel(n_jobs=n_jobs)(
-        delayed(evaluate_params)(params) for params in param_list
-    )
+    results = search(param_list, evaluate, len(embeddings), deadline)
 
     # Find the best result
     best_score = -np.inf
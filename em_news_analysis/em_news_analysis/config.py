@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import timedelta
+from typing import Dict
 
 
 @dataclass(frozen=True)
@@ -22,6 +23,43 @@ class BaseConfig:
     use_cache: bool = True
     embeddings_dir: str = "embeddings_cache"
     save_embeddings: bool = False
+    embedding_store_max_rows: int = 100000
+    embedding_batch_size: int = 256
+    embedding_batch_max_tokens: int = 100000
+    embedding_requests_per_minute: int = 3000
+    embedding_tokens_per_minute: int = 1000000
+    embedding_max_concurrency: int = 5
+    use_embedding_cache: bool = True
+    embedding_cache_file: str = "embeddings.sqlite"
+    embedding_cache_max_entries: int = 50000
+    clustering_search: str = "halving"
+    clustering_time_budget: float = 300.0
+    clustering_max_evaluations: int = None
+    clustering_silhouette_sample_size: int = 2000
+    article_fetch_max_connections: int = 50
+    article_fetch_max_per_host: int = 4
+    article_fetch_connect_timeout: float = 5.0
+    article_fetch_read_timeout: float = 15.0
+    article_fetch_deadline: float = 30.0
+    article_fetch_max_bytes: int = 10 * 1024 * 1024
+    use_article_cache: bool = True
+    article_cache_file: str = "articles.sqlite"
+    article_cache_max_entries: int = 20000
+    article_cache_ttl: timedelta = field(
+        default_factory=lambda: timedelta(hours=6))
+    article_cache_max_age: timedelta = field(
+        default_factory=lambda: timedelta(days=7))
+    use_summary_cache: bool = True
+    summary_cache_file: str = "summaries.sqlite"
+    summary_cache_max_entries: int = 50000
+    summary_cache_ttl: timedelta = field(
+        default_factory=lambda: timedelta(days=3))
+    summary_max_article_tokens: Dict[str, int] = field(
+        default_factory=lambda: {"gpt-4o-mini": 60000, "gpt-4o": 30000})
+    llm_max_in_flight: int = 8
+    llm_article_concurrency: int = 6
+    llm_cluster_concurrency: int = 3
+    stream_to_mongo: bool = True
 
     def __hash__(self):
         return hash((self.embedding_model, self.cache_size, self.min_cluster_size,
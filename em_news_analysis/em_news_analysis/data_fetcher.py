@@ -1,7 +1,10 @@
 import os
-import pickle
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Tuple, Union
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.cloud import bigquery
 from .config import BaseConfig
 # Set up logging
@@ -10,27 +13,161 @@ from itertools import combinations
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns read by preprocess_data_summary, sample_data and the per-cluster article sampling.
+# The wide GKG columns (GCAM, AllNames, Amounts, ...) are cached but never loaded by the pipeline.
+PIPELINE_COLUMNS = [
+    "GlobalEventID", "DATEADDED", "SQLDATE", "SOURCEURL",
+    "EventCode", "QuadClass", "GoldsteinScale", "AvgTone",
+    "Actor1Name", "Actor2Name", "NumMentions", "NumSources", "NumArticles",
+    "Actor1Geo_CountryCode", "Actor2Geo_CountryCode", "ActionGeo_CountryCode",
+    "V2Persons", "V2Organizations", "V2Locations", "V2Themes",
+]
 
-def fetch_gdelt_data(client: bigquery.Client, country: str, hours: int, config: BaseConfig) -> pd.DataFrame:
-    """
-    Fetch GDELT data from BigQuery for a specific country and time range, using both Events and GKG tables.
-    Performs a LEFT JOIN to ensure all events are included, even if there is no matching GKG data.
-    Removes duplicates and logs the number of duplicates removed.
+# Low-cardinality string columns that are loaded as pandas categoricals
+DICTIONARY_COLUMNS = [
+    "EventCode", "EventBaseCode", "EventRootCode", "Actor1Name", "Actor2Name",
+    "Actor1Geo_CountryCode", "Actor2Geo_CountryCode", "ActionGeo_CountryCode",
+    "SourceCommonName",
+]
+
+CACHE_TIME_KEY = b"em_news_analysis.cache_time"
+
+# GDELT publishes a new update every 15 minutes
+GDELT_UPDATE_INTERVAL = timedelta(minutes=15)
+
+# Longest window the pipeline is run with; hourly buckets older than this plus the cache expiry are pruned
+MAX_WINDOW_HOURS = 24
+
+
+def write_parquet_cache(df: pd.DataFrame, path: str, cache_time: datetime = None):
     """
-    if config.use_cache:
-        cache_file = os.path.join(config.gdelt_cache_dir,
-                                  f"{country}_{hours}hours.pkl")
+    Write a DataFrame to a Parquet cache file with dictionary-encoded strings and the cache time in the file metadata.
 
-        # Check if cached data exists and is not expired
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                cache_time, df = pickle.load(f)
-            if datetime.now() - cache_time <= config.gdelt_cache_expiry:
-                logger.info(f"Using cached data from {cache_time}.")
-                return df
+    The file is written to a temporary name and atomically renamed, so concurrent readers
+    (including other processes) only ever see a complete file.
 
+    Args:
+        df (pd.DataFrame): The data to cache.
+        path (str): Destination Parquet file.
+        cache_time (datetime, optional): Time the data was fetched (UTC). Defaults to now.
+    """
+    cache_time = cache_time or utc_now()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[CACHE_TIME_KEY] = cache_time.isoformat().encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
     try:
-        query = f"""
+        pq.write_table(table, tmp_path, use_dictionary=True,
+                       compression="zstd")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_parquet_cache_time(path: str) -> datetime:
+    """
+    Read the cache time of a Parquet cache file from its metadata, without reading any data.
+
+    Args:
+        path (str): The Parquet cache file.
+
+    Returns:
+        datetime: The time the cached data was fetched.
+    """
+    metadata = pq.read_schema(path).metadata or {}
+    return datetime.fromisoformat(metadata[CACHE_TIME_KEY].decode())
+
+
+def read_parquet_table(path: str, columns: List[str] = None) -> pa.Table:
+    """
+    Read a Parquet cache file as an Arrow table, loading only the requested columns.
+
+    Args:
+        path (str): The Parquet cache file.
+        columns (List[str], optional): Columns to load. Columns missing from the file are skipped. Defaults to None (all columns).
+
+    Returns:
+        pa.Table: The cached data, with low-cardinality string columns dictionary-encoded.
+    """
+    schema = pq.read_schema(path)
+    if columns is not None:
+        columns = [column for column in columns if column in schema.names]
+    loaded = columns if columns is not None else schema.names
+    return pq.read_table(
+        path,
+        columns=columns,
+        read_dictionary=[
+            column for column in DICTIONARY_COLUMNS if column in loaded],
+    )
+
+
+def read_parquet_cache(path: str, columns: List[str] = None) -> Tuple[datetime, pd.DataFrame]:
+    """
+    Read a Parquet cache file, loading only the requested columns.
+
+    Args:
+        path (str): The Parquet cache file.
+        columns (List[str], optional): Columns to load. Columns missing from the file are skipped. Defaults to None (all columns).
+
+    Returns:
+        Tuple[datetime, pd.DataFrame]: The cache time and the cached data.
+    """
+    return read_parquet_cache_time(path), read_parquet_table(path, columns).to_pandas()
+
+
+def select_columns(df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Project a DataFrame onto the given columns, skipping those it doesn't have.
+    """
+    if columns is None:
+        return df
+    return df[[column for column in columns if column in df.columns]]
+
+
+def utc_now() -> datetime:
+    """
+    Current UTC time as a naive datetime, comparable with GDELT's DATEADDED.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def floor_hour(timestamp: datetime) -> datetime:
+    """
+    Truncate a datetime to the start of its hour.
+    """
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def format_gdelt_timestamp(timestamp: datetime) -> str:
+    """
+    Format a datetime as a GDELT YYYYMMDDHHMMSS integer literal.
+    """
+    return timestamp.strftime('%Y%m%d%H%M%S')
+
+
+def build_gdelt_query(countries: Union[str, List[str]], start: datetime, end: datetime = None) -> str:
+    """
+    Build the Events/GKG LEFT JOIN query for events about one or more countries added in [start, end).
+
+    Args:
+        countries (Union[str, List[str]]): FIPS 10-4 country code, or a list of codes.
+        start (datetime): Earliest DATEADDED (UTC), inclusive.
+        end (datetime, optional): Latest DATEADDED (UTC), exclusive. Defaults to None (no upper bound).
+
+    Returns:
+        str: The SQL query.
+    """
+    if isinstance(countries, str):
+        countries = [countries]
+    country_list = ", ".join(f"'{country}'" for country in countries)
+    start_literal = format_gdelt_timestamp(start)
+    partition_start = (start - timedelta(hours=24)
+                       ).strftime('%Y-%m-%d %H:%M:%S')
+    end_filter = f"AND DATEADDED < {format_gdelt_timestamp(end)}" if end is not None else ""
+    return f"""
             WITH events AS (
                 SELECT
                     GlobalEventID,
@@ -55,9 +192,10 @@ def fetch_gdelt_data(client: bigquery.Client, country: str, hours: int, config:
                 FROM
                     `gdelt-bq.gdeltv2.events_partitioned`
                 WHERE
-                    _PARTITIONTIME >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours + 24} HOUR)
-                    AND DATEADDED >= CAST(FORMAT_TIMESTAMP('%Y%m%d%H%M%S', TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours} HOUR)) AS INT64)
-                    AND (Actor1Geo_CountryCode = '{country}' OR Actor2Geo_CountryCode = '{country}' OR ActionGeo_CountryCode = '{country}')
+                    _PARTITIONTIME >= TIMESTAMP('{partition_start}')
+                    AND DATEADDED >= {start_literal}
+                    {end_filter}
+                    AND (Actor1Geo_CountryCode IN ({country_list}) OR Actor2Geo_CountryCode IN ({country_list}) OR ActionGeo_CountryCode IN ({country_list}))
             ),
             gkg AS (
                 SELECT
@@ -78,8 +216,8 @@ def fetch_gdelt_data(client: bigquery.Client, country: str, hours: int, config:
                 FROM
                     `gdelt-bq.gdeltv2.gkg_partitioned`
                 WHERE
-                    _PARTITIONTIME >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours + 24} HOUR)
-                    AND DATE >= CAST(FORMAT_TIMESTAMP('%Y%m%d%H%M%S', TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours} HOUR)) AS INT64)
+                    _PARTITIONTIME >= TIMESTAMP('{partition_start}')
+                    AND DATE >= {start_literal}
             )
             SELECT
                 e.*,
@@ -104,44 +242,334 @@ def fetch_gdelt_data(client: bigquery.Client, country: str, hours: int, config:
                 e.SOURCEURL = g.DocumentIdentifier
         """
 
-        # Run the query
+
+def drop_duplicate_urls(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove rows with a duplicate SOURCEURL, keeping the first, and log how many were removed.
+    """
+    # Remove duplicates based on the chosen subset
+    # You can change this based on the results
+    chosen_subset = ['SOURCEURL']
+    rows_before = len(df)
+    df = df.drop_duplicates(subset=chosen_subset, keep='first')
+    duplicates_removed = rows_before - len(df)
+    logger.info(
+        f"Removed {duplicates_removed} duplicate rows based on {chosen_subset}.")
+    return df
+
+
+def partition_by_country(df: pd.DataFrame, countries: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split rows by country, using the same actor/action geography match as the query.
+
+    A row that involves several of the countries is included for each of them.
+
+    Args:
+        df (pd.DataFrame): Rows returned by query_gdelt_data.
+        countries (List[str]): FIPS 10-4 country codes.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The rows for each country, with duplicate URLs removed per country.
+    """
+    partitions = {}
+    for country in countries:
+        mask = ((df['Actor1Geo_CountryCode'] == country)
+                | (df['Actor2Geo_CountryCode'] == country)
+                | (df['ActionGeo_CountryCode'] == country))
+        partitions[country] = drop_duplicate_urls(df[mask])
+    return partitions
+
+
+def parse_gdelt_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert GDELT's integer date columns to datetimes, in place.
+    """
+    df['SQLDATE'] = pd.to_datetime(df['SQLDATE'], format='%Y%m%d')
+    df['GKG_DATE'] = pd.to_datetime(df['GKG_DATE'], format='%Y%m%d%H%M%S')
+    df['DATEADDED'] = pd.to_datetime(df['DATEADDED'], format='%Y%m%d%H%M%S')
+    return df
+
+
+# Arrow types of BigQuery's scalar column types; other types are read as strings
+BIGQUERY_ARROW_TYPES = {
+    "INTEGER": pa.int64(), "INT64": pa.int64(),
+    "FLOAT": pa.float64(), "FLOAT64": pa.float64(), "NUMERIC": pa.float64(),
+    "BOOLEAN": pa.bool_(), "BOOL": pa.bool_(),
+}
+
+
+def empty_gdelt_frame(schema: List[bigquery.SchemaField]) -> pd.DataFrame:
+    """
+    Build an empty frame with the columns and dtypes of a query result, with parsed dates.
+    """
+    arrow_schema = pa.schema([
+        (field.name, BIGQUERY_ARROW_TYPES.get(field.field_type, pa.string())) for field in schema])
+    return parse_gdelt_dates(arrow_schema.empty_table().to_pandas())
+
+
+def stream_gdelt_data(client: bigquery.Client, countries: Union[str, List[str]], start: datetime, end: datetime = None) -> Iterator[pd.DataFrame]:
+    """
+    Query BigQuery for events about one or more countries added in [start, end), yielding the
+    joined rows one Arrow record batch at a time as they are downloaded.
+
+    Duplicate URLs are not removed here, since a URL can belong to several countries;
+    see drop_duplicate_urls and partition_by_country.
+
+    Args:
+        client (bigquery.Client): BigQuery client.
+        countries (Union[str, List[str]]): FIPS 10-4 country code, or a list of codes.
+        start (datetime): Earliest DATEADDED (UTC), inclusive.
+        end (datetime, optional): Latest DATEADDED (UTC), exclusive. Defaults to None (no upper bound).
+
+    Yields:
+        pd.DataFrame: A batch of joined rows with parsed dates. An empty result yields one empty frame.
+    """
+    try:
         job_config = bigquery.QueryJobConfig(use_query_cache=True)
-        query_job = client.query(query, job_config=job_config)
-        merged_df = query_job.to_dataframe()
-
-        # Convert DATE columns to datetime
-        merged_df['SQLDATE'] = pd.to_datetime(
-            merged_df['SQLDATE'], format='%Y%m%d')
-        merged_df['GKG_DATE'] = pd.to_datetime(
-            merged_df['GKG_DATE'], format='%Y%m%d%H%M%S')
-        merged_df['DATEADDED'] = pd.to_datetime(
-            merged_df['DATEADDED'], format='%Y%m%d%H%M%S')
-
-        # Log the number of rows before removing duplicates
-        rows_before = len(merged_df)
-        logger.info(f"Fetched {rows_before} rows of data.")
-
-        # Log all columns
-        logger.info(f"Columns in the dataframe: {merged_df.columns.tolist()}")
-
-        # Remove duplicates based on the chosen subset
-        # You can change this based on the results
-        chosen_subset = ['SOURCEURL']
-        merged_df.drop_duplicates(
-            subset=chosen_subset, keep='first', inplace=True)
-
-        # Log the number of duplicates removed
-        rows_after = len(merged_df)
-        duplicates_removed = rows_before - rows_after
-        logger.info(
-            f"Removed {duplicates_removed} duplicate rows based on {chosen_subset}.")
-        logger.info(f"Final dataset contains {rows_after} rows.")
+        query_job = client.query(build_gdelt_query(
+            countries, start, end), job_config=job_config)
+        rows = query_job.result()
 
-        if config.use_cache:
-            with open(cache_file, 'wb') as f:
-                pickle.dump((datetime.now(), merged_df), f)
+        total_rows = 0
+        for record_batch in rows.to_arrow_iterable():
+            total_rows += record_batch.num_rows
+            yield parse_gdelt_dates(record_batch.to_pandas())
 
-        return merged_df
+        if total_rows == 0:
+            yield empty_gdelt_frame(rows.schema)
+        logger.info(
+            f"Fetched {total_rows} rows of data added between {start} and {end or 'now'}.")
 
     except Exception as e:
         raise ValueError(f"Error fetching data from BigQuery: {str(e)}")
+
+
+def query_gdelt_data(client: bigquery.Client, countries: Union[str, List[str]], start: datetime, end: datetime = None) -> pd.DataFrame:
+    """
+    Query BigQuery for events about one or more countries added in [start, end), joined with their GKG records.
+
+    Duplicate URLs are not removed here, since a URL can belong to several countries;
+    see drop_duplicate_urls and partition_by_country.
+
+    Args:
+        client (bigquery.Client): BigQuery client.
+        countries (Union[str, List[str]]): FIPS 10-4 country code, or a list of codes.
+        start (datetime): Earliest DATEADDED (UTC), inclusive.
+        end (datetime, optional): Latest DATEADDED (UTC), exclusive. Defaults to None (no upper bound).
+
+    Returns:
+        pd.DataFrame: The joined rows with parsed dates.
+    """
+    frames = list(stream_gdelt_data(client, countries, start, end))
+    merged_df = frames[0] if len(frames) == 1 else pd.concat(
+        frames, ignore_index=True)
+    logger.info(f"Columns in the dataframe: {merged_df.columns.tolist()}")
+    return merged_df
+
+
+def bucket_path(config: BaseConfig, country: str, hour: datetime) -> str:
+    """
+    Path of the cache file holding a country's events added during a given UTC hour.
+    """
+    return os.path.join(config.gdelt_cache_dir, country, f"{hour.strftime('%Y%m%d%H')}.parquet")
+
+
+def is_bucket_fresh(path: str, hour: datetime, now: datetime, config: BaseConfig) -> bool:
+    """
+    Check whether an hourly bucket can be served from the cache.
+
+    A bucket fetched after its hour was fully published is complete and stays valid until it
+    expires. A bucket fetched while its hour was still in progress is only reused until GDELT's
+    next 15 minute update.
+
+    Args:
+        path (str): The bucket's cache file.
+        hour (datetime): The start of the bucket's hour (UTC).
+        now (datetime): The current time (UTC).
+        config (BaseConfig): Configuration with the cache expiry.
+
+    Returns:
+        bool: True if the cached bucket can be used as-is.
+    """
+    if not os.path.exists(path):
+        return False
+    cache_time = read_parquet_cache_time(path)
+    if now - cache_time > config.gdelt_cache_expiry:
+        return False
+    if cache_time >= hour + timedelta(hours=1) + GDELT_UPDATE_INTERVAL:
+        return True
+    return now - cache_time < GDELT_UPDATE_INTERVAL
+
+
+def missing_ranges(hours: List[datetime]) -> List[Tuple[datetime, datetime]]:
+    """
+    Group sorted bucket hours into [start, end) ranges of consecutive hours.
+    """
+    ranges = []
+    for hour in hours:
+        if ranges and ranges[-1][1] == hour:
+            ranges[-1] = (ranges[-1][0], hour + timedelta(hours=1))
+        else:
+            ranges.append((hour, hour + timedelta(hours=1)))
+    return ranges
+
+
+def write_buckets(df: pd.DataFrame, config: BaseConfig, country: str, start: datetime, end: datetime, cache_time: datetime):
+    """
+    Split rows by the hour of DATEADDED and write one cache file per hour in [start, end).
+
+    Hours without any rows are written as empty buckets so they are not fetched again.
+    """
+    os.makedirs(os.path.join(config.gdelt_cache_dir, country), exist_ok=True)
+    bucket_hours = df['DATEADDED'].dt.floor('h')
+    hour = start
+    while hour < end:
+        write_parquet_cache(df[bucket_hours == hour], bucket_path(
+            config, country, hour), cache_time)
+        hour += timedelta(hours=1)
+
+
+def prune_buckets(config: BaseConfig, country: str, oldest_hour: datetime):
+    """
+    Delete a country's bucket files for hours before oldest_hour.
+    """
+    country_dir = os.path.join(config.gdelt_cache_dir, country)
+    if not os.path.isdir(country_dir):
+        return
+    oldest_name = f"{oldest_hour.strftime('%Y%m%d%H')}.parquet"
+    for name in os.listdir(country_dir):
+        if name.endswith('.parquet') and name < oldest_name:
+            os.remove(os.path.join(country_dir, name))
+
+
+def read_buckets(config: BaseConfig, country: str, bucket_hours: List[datetime], start: datetime, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Concatenate a country's cached hourly buckets and apply the exact window start and URL dedup.
+    """
+    read_columns = None if columns is None else list(
+        dict.fromkeys(columns + ['DATEADDED', 'SOURCEURL']))
+    tables = [read_parquet_table(bucket_path(config, country, hour), read_columns)
+              for hour in bucket_hours]
+    merged_df = pa.concat_tables(
+        tables, promote_options="default").unify_dictionaries().to_pandas()
+
+    merged_df = merged_df[merged_df['DATEADDED'] >= start]
+    merged_df = drop_duplicate_urls(merged_df).reset_index(drop=True)
+    logger.info(f"Final dataset for {country} contains {len(merged_df)} rows.")
+    return select_columns(merged_df, columns)
+
+
+def fetch_gdelt_data_multi(client: bigquery.Client, countries: List[str], hours: int, config: BaseConfig, columns: List[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch GDELT data for several countries with shared BigQuery queries, and split it per country locally.
+
+    Each query covers every country that needs data for its time range, so the GKG partition
+    window is scanned once for all of them rather than once per country.
+
+    Args:
+        client (bigquery.Client): BigQuery client.
+        countries (List[str]): FIPS 10-4 country codes.
+        hours (int): Number of hours to look back.
+        config (BaseConfig): Configuration with the cache settings.
+        columns (List[str], optional): Columns to return. Defaults to None (all columns).
+
+    Returns:
+        Dict[str, pd.DataFrame]: The data for each country, as fetch_gdelt_data would return it.
+    """
+    countries = list(dict.fromkeys(countries))
+    now = utc_now()
+    start = now - timedelta(hours=hours)
+
+    if not config.use_cache:
+        partitions = partition_by_country(
+            query_gdelt_data(client, countries, start), countries)
+        return {country: select_columns(df.reset_index(drop=True), columns)
+                for country, df in partitions.items()}
+
+    current_hour = floor_hour(now)
+    hour = floor_hour(start)
+    bucket_hours = []
+    while hour <= current_hour:
+        bucket_hours.append(hour)
+        hour += timedelta(hours=1)
+
+    stale = {country: {hour for hour in bucket_hours
+                       if not is_bucket_fresh(bucket_path(config, country, hour), hour, now, config)}
+             for country in countries}
+    for country in countries:
+        logger.info(
+            f"Using {len(bucket_hours) - len(stale[country])} of {len(bucket_hours)} cached hourly buckets for {country}.")
+
+    all_stale_hours = sorted(set().union(*stale.values()))
+    for range_start, range_end in missing_ranges(all_stale_hours):
+        range_countries = [country for country in countries
+                           if any(range_start <= hour < range_end for hour in stale[country])]
+        # The range containing the current hour is left open-ended
+        query_end = range_end if range_end <= current_hour else None
+        partitions = partition_by_country(
+            query_gdelt_data(client, range_countries, range_start, query_end), range_countries)
+        for country, df in partitions.items():
+            write_buckets(df, config, country, range_start, range_end, now)
+
+    oldest_hour = floor_hour(
+        now - config.gdelt_cache_expiry - timedelta(hours=MAX_WINDOW_HOURS))
+    results = {}
+    for country in countries:
+        prune_buckets(config, country, oldest_hour)
+        results[country] = read_buckets(
+            config, country, bucket_hours, start, columns)
+    return results
+
+
+def iter_gdelt_data(client: bigquery.Client, country: str, hours: int, config: BaseConfig, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Fetch GDELT data for a country in batches, so that processing can start before the download ends.
+
+    Without caching, rows are streamed from BigQuery one record batch at a time, and URLs already
+    seen in an earlier batch are dropped, keeping the first row as fetch_gdelt_data does. With
+    caching, the data comes from the hourly buckets and is yielded as a single batch.
+
+    Args:
+        client (bigquery.Client): BigQuery client.
+        country (str): FIPS 10-4 country code.
+        hours (int): Number of hours to look back.
+        config (BaseConfig): Configuration with the cache settings.
+        columns (List[str], optional): Columns to return. Defaults to None (all columns).
+
+    Yields:
+        pd.DataFrame: A batch of rows with unique URLs across all batches.
+    """
+    if config.use_cache:
+        yield fetch_gdelt_data_multi(client, [country], hours, config, columns)[country]
+        return
+
+    start = utc_now() - timedelta(hours=hours)
+    seen_urls = set()
+    duplicates_removed = 0
+    for batch in stream_gdelt_data(client, country, start):
+        urls = batch['SOURCEURL']
+        keep = ~urls.duplicated() & ~urls.isin(seen_urls)
+        duplicates_removed += len(batch) - int(keep.sum())
+        batch = batch[keep].reset_index(drop=True)
+        seen_urls.update(batch['SOURCEURL'])
+        yield select_columns(batch, columns)
+    logger.info(
+        f"Removed {duplicates_removed} duplicate rows based on ['SOURCEURL'].")
+
+
+def fetch_gdelt_data(client: bigquery.Client, country: str, hours: int, config: BaseConfig, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Fetch GDELT data from BigQuery for a specific country and time range, using both Events and GKG tables.
+    Performs a LEFT JOIN to ensure all events are included, even if there is no matching GKG data.
+    Removes duplicates and logs the number of duplicates removed.
+
+    When caching is enabled, data is stored in hourly Parquet buckets keyed by DATEADDED. Only the
+    buckets that are missing or stale are queried (one query per run of consecutive hours), so
+    repeated and overlapping windows reuse what was already fetched. Only the requested columns
+    are loaded from the cache. Without caching, rows are deduplicated batch by batch as they
+    are downloaded, so duplicates are never held in memory all at once.
+    """
+    frames = list(iter_gdelt_data(client, country, hours, config, columns))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,292 @@
+import os
+import json
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fraction of max_rows kept when the store is compacted, so it is not rewritten on every add
+COMPACT_TO = 0.75
+
+
+class EmbeddingStore:
+    """
+    Append-only float32 embedding matrix on disk, with a row index keyed by article URL.
+
+    Vectors are appended to a raw float32 file and read back through a read-only memory map,
+    so slices of consecutive rows are zero-copy views that can be shared between processes.
+    The index is an append-only file with one JSON-encoded key per line, where line i names row i.
+    If a key is added again with a different vector, a new row is appended and the key points to it.
+
+    When the store holds more than max_rows rows, it is compacted: superseded rows are dropped and,
+    if needed, the oldest keys too. Compacted files are written as a new generation and meta.json
+    is switched to them atomically, so readers (and arrays they already hold) never see a mix.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    KEYS_FILE = "keys.jsonl"
+    META_FILE = "meta.json"
+    LOCK_FILE = ".lock"
+
+    def __init__(self, directory: str, max_rows: Optional[int] = None):
+        """
+        Open (or create) the store.
+
+        Args:
+            directory (str): Directory holding the store files.
+            max_rows (Optional[int], optional): Number of rows above which the store is compacted.
+                Defaults to None (never compacted).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_rows = max_rows
+        self.dim = None
+        self.generation = 0
+        self._index: Dict[str, int] = {}
+        self._n_rows = 0
+        self._keys_offset = 0
+        self._mmap = None
+        self._lock = threading.Lock()
+        with self._lock, self._file_lock():
+            self._refresh()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _generation_path(self, name: str, generation: int) -> str:
+        # Generation 0 uses the plain file names, so stores written before compaction existed still open
+        if generation == 0:
+            return self._path(name)
+        stem, extension = os.path.splitext(name)
+        return self._path(f"{stem}.{generation}{extension}")
+
+    def _vectors_path(self) -> str:
+        return self._generation_path(self.VECTORS_FILE, self.generation)
+
+    def _keys_path(self) -> str:
+        return self._generation_path(self.KEYS_FILE, self.generation)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path(self.LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_meta(self, generation: int):
+        meta_path = self._path(self.META_FILE)
+        with open(meta_path + ".tmp", 'w') as f:
+            json.dump({'dim': self.dim, 'generation': generation}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _refresh(self):
+        """
+        Pick up rows appended since the last refresh, possibly by another process.
+
+        Must be called with the file lock held.
+        """
+        meta_path = self._path(self.META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.dim = meta['dim']
+            generation = meta.get('generation', 0)
+            if generation != self.generation:
+                # Another instance compacted the store; read the new generation from the start
+                self.generation = generation
+                self._index = {}
+                self._n_rows = 0
+                self._keys_offset = 0
+                self._mmap = None
+        keys_path = self._keys_path()
+        if not os.path.exists(keys_path):
+            return
+        with open(keys_path, 'rb') as f:
+            f.seek(self._keys_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partially written line of a crashed writer; the next add truncates it
+                    break
+                self._index[json.loads(line)] = self._n_rows
+                self._n_rows += 1
+                self._keys_offset += len(line)
+        if self._n_rows and (self._mmap is None or len(self._mmap) != self._n_rows):
+            self._mmap = np.memmap(self._vectors_path(), dtype=np.float32,
+                                   mode='r', shape=(self._n_rows, self.dim))
+
+    def _append(self, keys: Sequence[str], embeddings: np.ndarray):
+        """
+        Write rows after the last complete row, dropping anything a crashed writer left behind.
+        """
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        # Vectors are written before keys so that a key is never visible without its row
+        with open(self._vectors_path(), 'ab') as f:
+            f.truncate(self._n_rows * row_bytes)
+            f.write(embeddings.tobytes())
+        with open(self._keys_path(), 'ab') as f:
+            f.truncate(self._keys_offset)
+            f.write(b"".join(json.dumps(key).encode("utf-8") + b"\n" for key in keys))
+        self._refresh()
+
+    def _compact(self, keep: Sequence[str]):
+        """
+        Rewrite the store with only the current row of each key, and at most COMPACT_TO * max_rows keys.
+
+        The keys in keep are always kept, even if that exceeds the bound.
+        """
+        keep = set(keep)
+        # Other keys ordered by their current row, so the most recently added ones are kept
+        others = sorted((item for item in self._index.items() if item[0] not in keep),
+                        key=lambda item: item[1])
+        others = others[max(len(others) + len(keep) - int(self.max_rows * COMPACT_TO), 0):]
+        live = sorted(others + [(key, self._index[key]) for key in keep],
+                      key=lambda item: item[1])
+        rows = np.array([row for _, row in live], dtype=np.int64)
+        vectors = np.asarray(self._mmap[rows]) if len(rows) else np.empty(
+            (0, self.dim), dtype=np.float32)
+
+        old_paths = (self._vectors_path(), self._keys_path())
+        generation = self.generation + 1
+        with open(self._generation_path(self.VECTORS_FILE, generation), 'wb') as f:
+            f.write(vectors.tobytes())
+            os.fsync(f.fileno())
+        with open(self._generation_path(self.KEYS_FILE, generation), 'wb') as f:
+            f.write(b"".join(json.dumps(key).encode("utf-8") + b"\n" for key, _ in live))
+            os.fsync(f.fileno())
+        self._write_meta(generation)
+        for path in old_paths:
+            # Arrays already handed out keep the unlinked file's memory map alive
+            os.remove(path)
+        removed = self._n_rows - len(live)
+        self._refresh()
+        logger.info(
+            f"Compacted {self.directory}: removed {removed} rows ({self._n_rows} rows)")
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def _add(self, keys: Sequence[str], embeddings: np.ndarray) -> np.ndarray:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(keys) != len(embeddings):
+            raise ValueError(
+                f"Got {len(keys)} keys for {len(embeddings)} embeddings")
+        if len(keys) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        self._refresh()
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+            self._write_meta(self.generation)
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {embeddings.shape[1]} does not match store dimension {self.dim}")
+
+        new_positions = []
+        for position, key in enumerate(keys):
+            row = self._index.get(key)
+            if row is None or not np.array_equal(self._mmap[row], embeddings[position]):
+                new_positions.append(position)
+
+        if new_positions:
+            self._append([keys[position] for position in new_positions],
+                         embeddings[new_positions])
+            logger.info(
+                f"Appended {len(new_positions)} embeddings to {self.directory} ({self._n_rows} rows)")
+            if self.max_rows is not None and self._n_rows > self.max_rows:
+                self._compact(keys)
+        return np.array([self._index[key] for key in keys], dtype=np.int64)
+
+    def add(self, keys: Sequence[str], embeddings: np.ndarray) -> np.ndarray:
+        """
+        Add embeddings for the given keys, appending only rows that are new or changed.
+
+        Rows can change when the store is compacted; use add_and_view to read the embeddings back.
+
+        Args:
+            keys (Sequence[str]): One key (e.g. article URL) per embedding.
+            embeddings (np.ndarray): 2D array of embeddings, one row per key.
+
+        Returns:
+            np.ndarray: The store row of each key, in input order.
+        """
+        with self._lock, self._file_lock():
+            return self._add(keys, embeddings)
+
+    def add_and_view(self, keys: Sequence[str], embeddings: np.ndarray) -> np.ndarray:
+        """
+        Add embeddings for the given keys and read them back from the store in one step.
+
+        Args:
+            keys (Sequence[str]): One key (e.g. article URL) per embedding.
+            embeddings (np.ndarray): 2D array of embeddings, one row per key.
+
+        Returns:
+            np.ndarray: 2D float32 array of the stored embeddings, a zero-copy view if their rows are consecutive.
+        """
+        with self._lock, self._file_lock():
+            return self._view(self._add(keys, embeddings))
+
+    def rows(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Look up the store rows for the given keys.
+
+        Args:
+            keys (Sequence[str]): The keys to look up.
+
+        Returns:
+            np.ndarray: The row of each key, or -1 for keys that are not in the store.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            return np.array([self._index.get(key, -1) for key in keys], dtype=np.int64)
+
+    def _view(self, rows: np.ndarray) -> np.ndarray:
+        if len(rows) == 0:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        if np.any(rows < 0):
+            raise KeyError("Cannot read rows for keys missing from the store")
+        if np.all(np.diff(rows) == 1):
+            return self._mmap[rows[0]:rows[-1] + 1]
+        return np.asarray(self._mmap[rows])
+
+    def view(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        Read the embeddings stored at the given rows.
+
+        Consecutive ascending rows are returned as a zero-copy view of the memory map;
+        any other selection is gathered into a new float32 array.
+
+        Args:
+            rows (Sequence[int]): The rows to read.
+
+        Returns:
+            np.ndarray: 2D float32 array of embeddings, one per row.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        with self._lock, self._file_lock():
+            self._refresh()
+            return self._view(rows)
+
+    def get(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Read the embeddings stored for the given keys.
+
+        Args:
+            keys (Sequence[str]): The keys to read. All of them must be in the store.
+
+        Returns:
+            np.ndarray: 2D float32 array of embeddings, one per key.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            return self._view(np.array([self._index.get(key, -1) for key in keys], dtype=np.int64))
@@ -1,17 +1,21 @@
 from typing import Callable
 import time
+import asyncio
+import threading
 import concurrent.futures
-from typing import List, Tuple, Callable
+from typing import Dict, List, Tuple, Callable
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 import logging
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, BadRequestError, RateLimitError
 from functools import partial
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from openai import OpenAI
 from functools import lru_cache
 from tenacity import retry, stop_after_attempt, wait_exponential
+from .cache import EmbeddingCache
+from .async_runtime import run_async
 
 
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +23,15 @@ logger = logging.getLogger(__name__)
 
 client = OpenAI()
 
+# OpenAI accepts up to 2048 inputs and ~300k tokens per embeddings request.
+# The defaults stay well below both so a single request never gets rejected for size.
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_BATCH_TOKENS = 100000
+
+# Default OpenAI rate limits for text-embedding-3-small at usage tier 1
+DEFAULT_REQUESTS_PER_MINUTE = 3000
+DEFAULT_TOKENS_PER_MINUTE = 1000000
+
 
 # @lru_cache(maxsize=1000)
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
@@ -54,26 +67,393 @@ def get_embedding(text: str, model: str = "text-embedding-3-small", embedding_fu
         return embedding_function(text)
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate the number of tokens in a text (roughly 4 characters per token for English).
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return len(text) // 4 + 1
+
+
+def make_batches(
+    items: List[Tuple[int, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS
+) -> List[List[Tuple[int, str]]]:
+    """
+    Pack (position, text) items into batches bounded by item count and estimated token count.
+
+    An item that is larger than max_batch_tokens on its own is placed in a batch by itself.
+
+    Args:
+        items (List[Tuple[int, str]]): The (position, text) pairs to pack, in order.
+        batch_size (int, optional): Maximum number of texts per batch. Defaults to DEFAULT_BATCH_SIZE.
+        max_batch_tokens (int, optional): Maximum estimated tokens per batch. Defaults to DEFAULT_MAX_BATCH_TOKENS.
+
+    Returns:
+        List[List[Tuple[int, str]]]: The batches, preserving the input order.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for position, text in items:
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_batch_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append((position, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate, for use on an asyncio event loop.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate_per_minute (float): Number of tokens added per minute.
+            capacity (float, optional): Maximum number of tokens held. Defaults to ten seconds' worth of tokens.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(
+            1.0, rate_per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for the given number of seconds (e.g. after the server throttled us).
+
+        Args:
+            seconds (float): How long to pause for.
+        """
+        self._paused_until = max(
+            self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until the given number of tokens is available and take them.
+
+        Requests larger than the capacity are clamped to the capacity so they can still proceed.
+
+        Args:
+            amount (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Number of seconds spent waiting.
+        """
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return time.monotonic() - start
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Async concurrency limit that halves on throttling and grows back by one after a full window of successes.
+    """
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1):
+        """
+        Initialize the limiter at its maximum concurrency.
+
+        Args:
+            max_concurrency (int): Upper bound (and starting value) for in-flight requests.
+            min_concurrency (int, optional): Lower bound for in-flight requests. Defaults to 1.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            while self.in_flight >= self.limit:
+                await self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        """
+        Record a successful request, raising the limit by one after `limit` consecutive successes.
+        """
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self):
+        """
+        Record a throttled request, halving the limit.
+        """
+        self.limit = max(self.min_concurrency, self.limit // 2)
+        self._successes = 0
+
+
+def _retry_after(error: RateLimitError) -> float:
+    """
+    Read the Retry-After header of a rate limit error, if any.
+    """
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AsyncEmbeddingClient:
+    """
+    Asyncio embedding client that respects requests-per-minute and tokens-per-minute limits.
+
+    Requests first take tokens from two token buckets, then a slot from an adaptive concurrency
+    limiter. A 429 response halves the concurrency and pauses both buckets for the server's
+    Retry-After delay, so throttling slows the whole client down instead of stalling every worker.
+    """
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        max_concurrency: int = 5,
+        max_retries: int = 5,
+        client: AsyncOpenAI = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            model (str, optional): The OpenAI model to use for embedding. Defaults to "text-embedding-3-small".
+            requests_per_minute (int, optional): Requests-per-minute limit. Defaults to DEFAULT_REQUESTS_PER_MINUTE.
+            tokens_per_minute (int, optional): Tokens-per-minute limit. Defaults to DEFAULT_TOKENS_PER_MINUTE.
+            max_concurrency (int, optional): Maximum number of in-flight requests. Defaults to 5.
+            max_retries (int, optional): Retries per request on throttling or transient errors. Defaults to 5.
+            client (AsyncOpenAI, optional): OpenAI client to use. If None, one is created with SDK retries disabled. Defaults to None.
+        """
+        self.model = model
+        self.max_retries = max_retries
+        self.client = client if client is not None else AsyncOpenAI(
+            max_retries=0)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.requests = 0
+        self.throttled = 0
+
+    async def _request(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(estimate_tokens(text) for text in texts)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(tokens)
+            delay = 0
+            async with self.limiter:
+                try:
+                    self.requests += 1
+                    response = await self.client.embeddings.create(input=texts, model=self.model)
+                    self.limiter.on_success()
+                    data = sorted(response.data, key=lambda item: item.index)
+                    return [item.embedding for item in data]
+                except RateLimitError as e:
+                    last_error = e
+                    self.throttled += 1
+                    self.limiter.on_throttle()
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = min(60, 2 ** attempt)
+                    self.request_bucket.pause(delay)
+                    self.token_bucket.pause(delay)
+                    logger.warning(
+                        f"Embedding request throttled. Concurrency reduced to {self.limiter.limit}, pausing {delay}s.")
+                except BadRequestError:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    delay = min(30, 2 ** attempt)
+                    logger.warning(
+                        f"Embedding request failed ({str(e)}). Retrying in {delay}s.")
+            if delay:
+                await asyncio.sleep(delay)
+        raise last_error
+
+    async def embed_batch(self, batch: List[Tuple[int, str]]) -> List[Tuple[int, List[float]]]:
+        """
+        Embed a batch of (position, text) items, isolating failures to the offending items.
+
+        If the request is rejected as invalid, the batch is split in half and each half is retried,
+        so a single bad text only drops itself rather than the whole batch.
+
+        Args:
+            batch (List[Tuple[int, str]]): The (position, text) pairs to embed.
+
+        Returns:
+            List[Tuple[int, List[float]]]: (position, embedding) pairs for the items that succeeded.
+        """
+        if not batch:
+            return []
+        try:
+            embeddings = await self._request([text for _, text in batch])
+            return [(position, embedding) for (position, _), embedding in zip(batch, embeddings)]
+        except BadRequestError as e:
+            if len(batch) == 1:
+                logger.error(
+                    f"Failed to generate embedding for position {batch[0][0]}: {str(e)}")
+                return []
+            logger.warning(
+                f"Embedding batch of {len(batch)} texts was rejected ({str(e)}). Splitting batch.")
+            middle = len(batch) // 2
+            left, right = await asyncio.gather(
+                self.embed_batch(batch[:middle]), self.embed_batch(batch[middle:]))
+            return left + right
+        except Exception as e:
+            logger.error(
+                f"Failed to generate embeddings for batch of {len(batch)} texts: {str(e)}")
+            return []
+
+    async def embed(
+        self,
+        batches: List[List[Tuple[int, str]]],
+        progress: Callable[[int, int, int], None] = None
+    ) -> List[Tuple[int, List[float]]]:
+        """
+        Embed several batches concurrently.
+
+        Args:
+            batches (List[List[Tuple[int, str]]]): Batches of (position, text) pairs, e.g. from make_batches.
+            progress (Callable[[int, int, int], None], optional): Called after each batch with
+                (batches done, total batches, embeddings in that batch). Defaults to None.
+
+        Returns:
+            List[Tuple[int, List[float]]]: (position, embedding) pairs for the items that succeeded, in batch order.
+        """
+        total = len(batches)
+        done = 0
+
+        async def run(batch):
+            nonlocal done
+            result = await self.embed_batch(batch)
+            done += 1
+            logger.debug(
+                f"Embedded batch {done}/{total} ({len(result)}/{len(batch)} texts, concurrency {self.limiter.limit})")
+            if progress is not None:
+                progress(done, total, len(result))
+            return result
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [result for batch_result in results for result in batch_result]
+
+    async def aclose(self):
+        """
+        Close the underlying OpenAI client.
+        """
+        await self.client.close()
+
+
+_embedding_clients: Dict[str, AsyncEmbeddingClient] = {}
+_embedding_clients_lock = threading.Lock()
+
+
+def get_embedding_client(
+    model: str = "text-embedding-3-small",
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+    tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+    max_concurrency: int = 5
+) -> AsyncEmbeddingClient:
+    """
+    Get the process-wide embedding client of a model, creating it on first use.
+
+    Rate limits are per account and model, so every embedding request of the process goes through
+    the same token buckets and concurrency limiter. The limits are those given on first use.
+    The client must only be used from the background event loop (see async_runtime).
+
+    Args:
+        model (str, optional): The OpenAI model to use for embedding. Defaults to "text-embedding-3-small".
+        requests_per_minute (int, optional): Requests-per-minute limit. Defaults to DEFAULT_REQUESTS_PER_MINUTE.
+        tokens_per_minute (int, optional): Tokens-per-minute limit. Defaults to DEFAULT_TOKENS_PER_MINUTE.
+        max_concurrency (int, optional): Maximum number of in-flight requests. Defaults to 5.
+
+    Returns:
+        AsyncEmbeddingClient: The shared client.
+    """
+    with _embedding_clients_lock:
+        if model not in _embedding_clients:
+            _embedding_clients[model] = AsyncEmbeddingClient(
+                model=model,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                max_concurrency=max_concurrency)
+        return _embedding_clients[model]
+
+
 def generate_embeddings(
     df: pd.DataFrame,
     embedding_function: Callable = None,
     max_workers: int = 3,
-    save_embeddings_path: str = None,
-    save_indices_path: str = None,
+    model: str = "text-embedding-3-small",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    cache: EmbeddingCache = None,
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+    tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+    embedding_client: AsyncEmbeddingClient = None,
 ) -> Tuple[np.ndarray, List[int]]:
     """
     Generate embeddings for the 'combined' column of a DataFrame using parallel processing.
 
+    When no custom embedding function is given, texts are packed into batched OpenAI requests
+    (see make_batches) and the batches are sent concurrently by an AsyncEmbeddingClient. Identical texts are embedded once,
+    and texts already present in the cache are not sent at all. Otherwise the embedding function
+    is called once per row.
+
     Args:
         df (pd.DataFrame): The input DataFrame containing a 'combined' column with text to embed.
         embedding_function (Callable, optional): A custom embedding function to use. If None, uses OpenAI's API. Defaults to None.
-        max_workers (int, optional): The maximum number of worker threads to use for parallel processing. Defaults to 3.
-        save_embeddings_path (str, optional): File path to save the generated embeddings. If None, embeddings are not saved. Defaults to None.
-        save_indices_path (str, optional): File path to save the valid position indices. If None, indices are not saved. Defaults to None.
+        max_workers (int, optional): The maximum number of worker threads, or of in-flight batched requests. Defaults to 3.
+        model (str, optional): The OpenAI model to use for batched embedding. Defaults to "text-embedding-3-small".
+        batch_size (int, optional): Maximum number of texts per batched request. Defaults to DEFAULT_BATCH_SIZE.
+        max_batch_tokens (int, optional): Maximum estimated tokens per batched request. Defaults to DEFAULT_MAX_BATCH_TOKENS.
+        cache (EmbeddingCache, optional): Cache consulted before, and filled after, batched requests. Defaults to None.
+        requests_per_minute (int, optional): Requests-per-minute limit for batched requests. Defaults to DEFAULT_REQUESTS_PER_MINUTE.
+        tokens_per_minute (int, optional): Tokens-per-minute limit for batched requests. Defaults to DEFAULT_TOKENS_PER_MINUTE.
+        embedding_client (AsyncEmbeddingClient, optional): Client used for batched requests. Its model and
+            limits take precedence over model, max_workers and the rate limits. Defaults to None, in which case
+            the process-wide client of the model is used (see get_embedding_client).
 
     Returns:
         Tuple[np.ndarray, List[int]]: A tuple containing:
-            - np.ndarray: The generated embeddings as a 2D numpy array.
+            - np.ndarray: The generated embeddings as a 2D float32 numpy array.
             - List[int]: The list of valid position indices corresponding to successful embeddings.
     """
     embeddings = []
@@ -104,24 +484,56 @@ def generate_embeddings(
 
     total_rows = len(df)
     positions = range(total_rows)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(
-            tqdm(executor.map(process_row, positions, df['combined']), total=total_rows))
+    if embedding_function is None:
+        if embedding_client is not None:
+            model = embedding_client.model
+        # Empty or non-string texts can't be embedded; leave them out of the requests
+        texts = {position: text.replace("\n", " ") for position, text in zip(positions, df['combined'])
+                 if isinstance(text, str) and text}
+        unique_texts = list(dict.fromkeys(texts.values()))
+        known = cache.get_many(unique_texts, model) if cache is not None else {}
+        items = [(i, text) for i, text in enumerate(unique_texts)
+                 if text not in known]
+        batches = make_batches(
+            items, batch_size=batch_size, max_batch_tokens=max_batch_tokens)
+        logger.info(
+            f"Embedding {len(items)} unique texts in {len(batches)} batched requests "
+            f"({len(known)} cached, {len(texts) - len(unique_texts)} duplicates).")
+        fetched = {}
+        if batches:
+            if embedding_client is None:
+                embedding_client = get_embedding_client(
+                    model=model,
+                    requests_per_minute=requests_per_minute,
+                    tokens_per_minute=tokens_per_minute,
+                    max_concurrency=max_workers)
+            # The client may be shared, so report this call's share of its counters
+            requests, throttled = embedding_client.requests, embedding_client.throttled
+            with tqdm(total=len(batches)) as progress_bar:
+                batch_result = run_async(embedding_client.embed(
+                    batches, progress=lambda done, total, count: progress_bar.update(1)))
+            fetched = {unique_texts[i]: embedding for i,
+                       embedding in batch_result}
+            throttled = embedding_client.throttled - throttled
+            if throttled:
+                logger.warning(
+                    f"Embedding requests were throttled {throttled} times "
+                    f"out of {embedding_client.requests - requests}.")
+        if cache is not None and fetched:
+            cache.set_many(fetched, model)
+        known.update(fetched)
+        results = [(position, known[text])
+                   for position, text in texts.items() if text in known]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                tqdm(executor.map(process_row, positions, df['combined']), total=total_rows))
     for result in results:
         if result is not None:
             position, embedding = result
             embeddings.append(embedding)
             valid_positions.append(position)
 
-    embeddings_array = np.array(embeddings)
-
-    # Save embeddings to file if path is provided
-    if save_embeddings_path is not None:
-        np.save(save_embeddings_path, embeddings_array)
-        logger.info(f"Embeddings saved to {save_embeddings_path}")
-
-    if save_indices_path is not None:
-        np.save(save_indices_path, np.array(valid_positions))
-        logger.info(f"Valid positions saved to {save_indices_path}")
+    embeddings_array = np.array(embeddings, dtype=np.float32)
 
     return embeddings_array, valid_positions
@@ -0,0 +1,201 @@
+import uuid
+import logging
+import threading
+import concurrent.futures
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_FINISHED_JOBS = 200
+
+# Called by a job's work with (stage, done, total) as it makes progress
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class Job:
+    """
+    A unit of work run in the background by a JobManager.
+
+    Attributes:
+        id (str): The ID of the job.
+        params (Dict[str, Any]): The parameters the job was submitted with, for display.
+        status (str): JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED or JOB_FAILED.
+        stage (Optional[str]): The stage the job last reported progress for.
+        progress (Dict[str, Dict[str, int]]): Done and total counts per stage, in the order stages started.
+        result (Any): The return value of the work, once it succeeded.
+        error (Optional[str]): The error message, if the work raised.
+        created_at, started_at, finished_at (datetime): When the job was queued, started and finished (UTC).
+    """
+    id: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    progress: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobManager:
+    """
+    Runs jobs on a fixed pool of worker threads and keeps their status for polling.
+
+    Jobs run independently of the request that submitted them, so they finish even if the client
+    disconnects. Finished jobs are kept until max_finished_jobs newer ones have finished.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS):
+        """
+        Initialize the manager.
+
+        Args:
+            max_workers (int, optional): Maximum number of jobs running at once. Defaults to DEFAULT_MAX_WORKERS.
+            max_finished_jobs (int, optional): Number of finished jobs kept for polling. Defaults to DEFAULT_MAX_FINISHED_JOBS.
+        """
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._finished: List[str] = []
+
+    def submit(self, work: Callable[[ProgressCallback], Any], params: Dict[str, Any] = None) -> Job:
+        """
+        Queue work to run on the worker pool.
+
+        Args:
+            work (Callable[[ProgressCallback], Any]): The work to run. It is called with a progress
+                callback taking (stage, done, total).
+            params (Dict[str, Any], optional): The parameters of the job, for display. Defaults to None.
+
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(id=uuid.uuid4().hex, params=dict(params or {}))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(
+                self._run, job, work)
+        logger.info(f"Queued job {job.id}")
+        return job
+
+    def _run(self, job: Job, work: Callable[[ProgressCallback], Any]) -> Any:
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now(timezone.utc)
+        try:
+            result = work(lambda stage, done, total: self._report(
+                job, stage, done, total))
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}", exc_info=True)
+            self._finish(job, JOB_FAILED, error=str(e))
+            raise
+        self._finish(job, JOB_SUCCEEDED, result=result)
+        return result
+
+    def _report(self, job: Job, stage: str, done: int, total: int):
+        with self._lock:
+            job.stage = stage
+            job.progress[stage] = {"done": done, "total": total}
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: str = None):
+        with self._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = datetime.now(timezone.utc)
+            self._finished.append(job.id)
+            while len(self._finished) > self.max_finished_jobs:
+                expired = self._finished.pop(0)
+                self._jobs.pop(expired, None)
+                self._futures.pop(expired, None)
+        logger.info(f"Job {job.id} {status}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a snapshot of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job's fields, or None if it is unknown or expired.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job is not None else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Get snapshots of every known job, oldest first.
+
+        Returns:
+            List[Dict[str, Any]]: The jobs' fields.
+        """
+        with self._lock:
+            return [self._snapshot(job) for job in self._jobs.values()]
+
+    def future(self, job_id: str) -> Optional[concurrent.futures.Future]:
+        """
+        Get the future of a job, to wait for it without polling.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[concurrent.futures.Future]: The future, or None if the job is unknown or expired.
+        """
+        with self._lock:
+            return self._futures.get(job_id)
+
+    @staticmethod
+    def _snapshot(job: Job) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "params": dict(job.params),
+            "status": job.status,
+            "stage": job.stage,
+            "progress": {stage: dict(counts) for stage, counts in job.progress.items()},
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting jobs and, if wait is set, wait for the running ones to finish.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the process-wide job manager, creating it with default settings on first use.
+
+    Returns:
+        JobManager: The shared manager.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+    return _manager
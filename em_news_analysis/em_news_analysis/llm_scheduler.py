@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_LANE = "article"
+CLUSTER_LANE = "cluster"
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_LANE_LIMITS = {ARTICLE_LANE: 6, CLUSTER_LANE: 3}
+
+
+class _LaneStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.started = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class LLMScheduler:
+    """
+    Process-wide cap on in-flight LLM calls, shared by every thread pool in the pipeline.
+
+    Calls go through lanes (article summaries, cluster summaries) that each have their own cap,
+    under an overall cap. Within a lane, waiting calls run in priority order (lower first, e.g.
+    the rank of the cluster they belong to) and then in arrival order.
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, lane_limits: Dict[str, int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight (int, optional): Maximum number of LLM calls in flight across all lanes. Defaults to DEFAULT_MAX_IN_FLIGHT.
+            lane_limits (Dict[str, int], optional): Maximum number of calls in flight per lane. Lanes
+                without a limit are only bound by max_in_flight. Defaults to DEFAULT_LANE_LIMITS.
+        """
+        self.max_in_flight = max_in_flight
+        self.lane_limits = dict(
+            lane_limits if lane_limits is not None else DEFAULT_LANE_LIMITS)
+        self._condition = threading.Condition()
+        self._queues: Dict[str, list] = {}
+        self._lanes: Dict[str, _LaneStats] = {}
+        self._in_flight = 0
+        self._counter = itertools.count()
+
+    def set_limits(self, max_in_flight: int = None, lane_limits: Dict[str, int] = None):
+        """
+        Change the caps; waiting calls are re-evaluated immediately.
+
+        Args:
+            max_in_flight (int, optional): New overall cap. Defaults to None (unchanged).
+            lane_limits (Dict[str, int], optional): New per-lane caps, merged into the current ones. Defaults to None.
+        """
+        with self._condition:
+            if max_in_flight is not None:
+                self.max_in_flight = max_in_flight
+            if lane_limits:
+                self.lane_limits.update(lane_limits)
+            self._condition.notify_all()
+
+    def _can_run(self, lane: str, entry: tuple) -> bool:
+        queue = self._queues[lane]
+        limit = self.lane_limits.get(lane, self.max_in_flight)
+        return (queue[0] is entry
+                and self._in_flight < self.max_in_flight
+                and self._lanes[lane].in_flight < limit)
+
+    @contextmanager
+    def slot(self, lane: str, priority: float = 0) -> Iterator[None]:
+        """
+        Wait for a free slot in a lane and hold it for the duration of the block.
+
+        Args:
+            lane (str): The lane of the call, e.g. ARTICLE_LANE or CLUSTER_LANE.
+            priority (float, optional): Lower values run first. Defaults to 0.
+        """
+        queued_at = time.monotonic()
+        entry = (priority, next(self._counter))
+        with self._condition:
+            queue = self._queues.setdefault(lane, [])
+            stats = self._lanes.setdefault(lane, _LaneStats())
+            heapq.heappush(queue, entry)
+            while not self._can_run(lane, entry):
+                self._condition.wait()
+            heapq.heappop(queue)
+            wait = time.monotonic() - queued_at
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            stats.started += 1
+            stats.in_flight += 1
+            self._in_flight += 1
+            # The next call in this lane may be able to start as well
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                stats.in_flight -= 1
+                stats.completed += 1
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current queue depths and in-flight counts, and wait times so far, per lane.
+
+        Returns:
+            Dict[str, Any]: The overall in-flight count and cap, and for each lane its queue depth,
+                in-flight count, completed calls and mean/max wait in seconds.
+        """
+        with self._condition:
+            lanes = {}
+            for lane, stats in self._lanes.items():
+                lanes[lane] = {
+                    "queued": len(self._queues.get(lane, [])),
+                    "in_flight": stats.in_flight,
+                    "limit": self.lane_limits.get(lane, self.max_in_flight),
+                    "completed": stats.completed,
+                    "mean_wait": stats.total_wait / stats.started if stats.started else 0.0,
+                    "max_wait": stats.max_wait,
+                }
+            return {"in_flight": self._in_flight, "max_in_flight": self.max_in_flight, "lanes": lanes}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """
+    Get the process-wide LLM scheduler, creating it with default limits on first use.
+
+    Returns:
+        LLMScheduler: The shared scheduler.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+    return _scheduler
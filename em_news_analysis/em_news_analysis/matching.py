@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 from typing import List
+from .scoring import cluster_centroids
 
 
 def match_clusters(
@@ -17,6 +19,10 @@ def match_clusters(
     Uses an enhanced method that computes average similarity per cluster.
     Selects diverse clusters to avoid repetition.
 
+    Diversity is measured between cluster centroids, which are computed and normalized once;
+    each greedy step then updates the candidates' similarity to the selected clusters with
+    a single matrix-vector product.
+
     Args:
         input_embedding (List[float]): The embedding of the input text.
         embeddings (np.ndarray): The embeddings of all articles.
@@ -55,34 +61,39 @@ def match_clusters(
 
         # Sort clusters by similarity
         sorted_clusters = cluster_similarities.sort_values(ascending=False)
+        if sorted_clusters.empty:
+            return []
+        candidates = sorted_clusters.index
+        relevance = sorted_clusters.to_numpy()
+
+        # Unit-length centroid of each candidate cluster, in sorted order
+        in_candidates = np.isin(clusters, candidates)
+        centroids, _, _ = cluster_centroids(
+            embeddings[in_candidates], clusters[in_candidates])
+        centroid_labels = np.unique(clusters[in_candidates])
+        unit_centroids = normalize(
+            centroids[np.searchsorted(centroid_labels, candidates)])
+
+        # Running sum of each candidate's similarity to the selected clusters
+        similarity_to_selected = np.zeros(len(candidates))
+        available = np.ones(len(candidates), dtype=bool)
 
         selected_clusters = []
-        for _ in range(min(top_n, len(sorted_clusters))):
-            if not selected_clusters:
+        for step in range(min(top_n, len(candidates))):
+            if step == 0:
                 # Select the most similar cluster first
-                next_cluster = sorted_clusters.index[0]
+                next_index = 0
             else:
-                # Compute diversity scores
-                diversity_scores = []
-                for cluster in sorted_clusters.index:
-                    if cluster not in selected_clusters:
-                        avg_similarity_to_selected = np.mean([
-                            cosine_similarity(
-                                embeddings[clusters == cluster].mean(
-                                    axis=0).reshape(1, -1),
-                                embeddings[clusters == sc].mean(
-                                    axis=0).reshape(1, -1)
-                            )[0][0] for sc in selected_clusters
-                        ])
-                        diversity_score = diversity_weight * (1 - avg_similarity_to_selected) + \
-                            (1 - diversity_weight) * sorted_clusters[cluster]
-                        diversity_scores.append((cluster, diversity_score))
-
-                # Select the cluster with the highest diversity score
-                next_cluster = max(diversity_scores, key=lambda x: x[1])[0]
-
-            selected_clusters.append(next_cluster)
-            sorted_clusters = sorted_clusters.drop(next_cluster)
+                # Select the cluster with the highest diversity score;
+                # ties go to the more similar cluster, as in the sorted order
+                diversity_scores = diversity_weight * (1 - similarity_to_selected / step) + \
+                    (1 - diversity_weight) * relevance
+                diversity_scores[~available] = -np.inf
+                next_index = int(np.argmax(diversity_scores))
+
+            selected_clusters.append(candidates[next_index])
+            available[next_index] = False
+            similarity_to_selected += unit_centroids @ unit_centroids[next_index]
 
         return selected_clusters
     except Exception as e:
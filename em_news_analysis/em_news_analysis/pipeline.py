@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import List, Tuple, Dict
+from typing import Any, Callable, List, Tuple, Dict
 import numpy as np
 from openai import OpenAI
 from google.cloud import bigquery
@@ -11,21 +11,36 @@ import json
 from tqdm import tqdm
 import concurrent.futures
 from pymongo import MongoClient
+from bson import ObjectId
 import time
+from datetime import datetime, timezone
 
 
 from .config import BaseConfig
-from .data_fetcher import fetch_gdelt_data
+from .data_fetcher import fetch_gdelt_data, fetch_gdelt_data_multi, iter_gdelt_data, PIPELINE_COLUMNS
 from .preprocessor import preprocess_data_summary
-from .embeddings import get_embedding, generate_embeddings
+from .embeddings import get_embedding, generate_embeddings, get_embedding_client, AsyncEmbeddingClient
+from .cache import EmbeddingCache, ArticleCache, SummaryCache
+from .embedding_store import EmbeddingStore
 from .clustering import cluster_embeddings, optimize_clustering
 from .matching import match_clusters
 from .cluster_summarizer import generate_cluster_summary
+from .llm_scheduler import ARTICLE_LANE, CLUSTER_LANE, get_llm_scheduler
 from .article_summarizer import generate_summaries
+from .article_fetcher import get_article_fetcher
 from .utils import get_country_name
-from .sampling import sample_data, sample_articles
+from .sampling import sample_data, sample_articles, cluster_rows
 from .models import Metadata, ClusterSummary, ClusterArticleSummaries, PydanticEncoder, ClusteringScores
 
+# Status of a run document in MongoDB when clusters are streamed as they finish
+RUN_RUNNING = "running"
+RUN_COMPLETE = "complete"
+RUN_FAILED = "failed"
+
+
+def _ignore_progress(stage: str, done: int, total: int):
+    pass
+
 
 class GDELTNewsPipeline:
     def __init__(self, config: BaseConfig):
@@ -49,6 +64,63 @@ class GDELTNewsPipeline:
         os.makedirs(self.config.gdelt_cache_dir, exist_ok=True)
         os.makedirs(self.config.embeddings_dir, exist_ok=True)
 
+        # Embeddings are cached on disk by (model, text) so they are reused across runs
+        self.embedding_cache = None
+        if self.config.use_embedding_cache:
+            self.embedding_cache = EmbeddingCache(
+                os.path.join(self.config.embeddings_dir,
+                             self.config.embedding_cache_file),
+                max_entries=self.config.embedding_cache_max_entries,
+                memory_size=self.config.cache_size)
+
+        # Run embeddings are persisted in a memory-mapped float32 store keyed by article URL
+        self.embedding_store = None
+        if self.config.save_embeddings:
+            self.embedding_store = EmbeddingStore(os.path.join(
+                self.config.embeddings_dir, "store", self.config.embedding_model),
+                max_rows=self.config.embedding_store_max_rows)
+
+        # Embedding requests of every pipeline in the process share one rate-limited client per model
+        self.embedding_client = get_embedding_client(
+            model=self.config.embedding_model,
+            requests_per_minute=self.config.embedding_requests_per_minute,
+            tokens_per_minute=self.config.embedding_tokens_per_minute,
+            max_concurrency=self.config.embedding_max_concurrency)
+
+        # Articles are downloaded through the process-wide connection pool, capped per host
+        self.article_fetcher = get_article_fetcher(
+            max_connections=self.config.article_fetch_max_connections,
+            max_per_host=self.config.article_fetch_max_per_host,
+            connect_timeout=self.config.article_fetch_connect_timeout,
+            read_timeout=self.config.article_fetch_read_timeout,
+            deadline=self.config.article_fetch_deadline,
+            max_bytes=self.config.article_fetch_max_bytes)
+
+        # Cleaned article contents are cached by canonical URL and revalidated with conditional GETs
+        self.article_cache = None
+        if self.config.use_article_cache:
+            self.article_cache = ArticleCache(
+                os.path.join(self.config.gdelt_cache_dir,
+                             self.config.article_cache_file),
+                max_entries=self.config.article_cache_max_entries,
+                ttl=self.config.article_cache_ttl.total_seconds(),
+                max_age=self.config.article_cache_max_age.total_seconds())
+
+        # Article summaries and verdicts are cached by (URL, objective, model)
+        self.summary_cache = None
+        if self.config.use_summary_cache:
+            self.summary_cache = SummaryCache(
+                os.path.join(self.config.gdelt_cache_dir,
+                             self.config.summary_cache_file),
+                max_entries=self.config.summary_cache_max_entries,
+                ttl=self.config.summary_cache_ttl.total_seconds())
+
+        # LLM calls from every pipeline in the process share one scheduler
+        get_llm_scheduler().set_limits(
+            max_in_flight=self.config.llm_max_in_flight,
+            lane_limits={ARTICLE_LANE: self.config.llm_article_concurrency,
+                         CLUSTER_LANE: self.config.llm_cluster_concurrency})
+
         # Add a directory for exporting CSV files
         self.export_dir = os.path.join(os.getcwd(), 'exported_data')
         os.makedirs(self.export_dir, exist_ok=True)
@@ -76,6 +148,75 @@ class GDELTNewsPipeline:
         """
         return sample_data(df, process_all, sample_size)
 
+    def generate_embeddings(self, df: pd.DataFrame, max_workers: int, embedding_client: AsyncEmbeddingClient = None) -> Tuple[np.ndarray, List[int]]:
+        """
+        Embed the 'combined' column of a DataFrame with the configured model, limits and cache.
+
+        Args:
+            df (pd.DataFrame): Preprocessed data.
+            max_workers (int): Maximum number of workers. Batched requests are bounded by the embedding
+                client instead, whose concurrency for the shared client is config.embedding_max_concurrency.
+            embedding_client (AsyncEmbeddingClient, optional): Client to send the requests with. Defaults to
+                None, in which case the pipeline's shared client is used.
+
+        Returns:
+            Tuple[np.ndarray, List[int]]: The embeddings and the positions of the rows they belong to.
+        """
+        return generate_embeddings(
+            df,
+            max_workers=max_workers,
+            model=self.config.embedding_model,
+            batch_size=self.config.embedding_batch_size,
+            max_batch_tokens=self.config.embedding_batch_max_tokens,
+            cache=self.embedding_cache,
+            requests_per_minute=self.config.embedding_requests_per_minute,
+            tokens_per_minute=self.config.embedding_tokens_per_minute,
+            embedding_client=embedding_client or self.embedding_client,
+        )
+
+    def stream_and_embed(self, country: str, hours: int, max_workers: int) -> Tuple[pd.DataFrame, np.ndarray, List[int]]:
+        """
+        Fetch, preprocess and embed GDELT data batch by batch.
+
+        Each downloaded batch is preprocessed and handed to a background thread for embedding,
+        so embedding requests overlap with the rest of the download. Batches are embedded one
+        at a time with the pipeline's shared client, which keeps the rate limits global.
+
+        Args:
+            country (str): Country code for news filtering.
+            hours (int): Number of hours to look back for news articles.
+            max_workers (int): Passed on to generate_embeddings.
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray, List[int]]: The preprocessed data, the embeddings and
+                the positions of the rows they belong to.
+        """
+        frames = []
+        futures = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            for batch in iter_gdelt_data(self.bigquery_client, country, hours, self.config, PIPELINE_COLUMNS):
+                if batch.empty:
+                    continue
+                batch = preprocess_data_summary(batch)
+                frames.append(batch)
+                futures.append(executor.submit(
+                    self.generate_embeddings, batch, max_workers))
+            results = [future.result() for future in futures]
+
+        if not frames:
+            return pd.DataFrame(), np.empty((0, 0), dtype=np.float32), []
+
+        offset = 0
+        valid_positions = []
+        for frame, (_, positions) in zip(frames, results):
+            valid_positions.extend(offset + position for position in positions)
+            offset += len(frame)
+        embeddings = [batch_embeddings for batch_embeddings, _ in results
+                      if batch_embeddings.size]
+        embeddings = np.concatenate(embeddings) if embeddings else np.empty(
+            (0, 0), dtype=np.float32)
+        return pd.concat(frames, ignore_index=True), embeddings, valid_positions
+
     def run_pipeline(
         self,
         input_sentence: str,
@@ -88,7 +229,9 @@ class GDELTNewsPipeline:
         max_workers_embeddings: int = 5,
         max_workers_summaries: int = 3,
         export_to_local: bool = False,
-        user_id: str = None
+        user_id: str = None,
+        raw_data: pd.DataFrame = None,
+        progress: Callable[[str, int, int], None] = None
     ) -> List[str]:
         """
         Run the GDELT news analysis pipeline.
@@ -103,70 +246,74 @@ class GDELTNewsPipeline:
             sample_size (int, optional): Number of samples to take if not processing all data. Defaults to 1500.
             max_workers_embeddings (int, optional): Maximum number of workers for generating embeddings. Defaults to 5.
             max_workers_summaries (int, optional): Maximum number of workers for generating summaries. Defaults to 3.
-            export_to_local (bool, optional): If True, export data locally. Defaults to False.
+            export_to_local (bool, optional): If True, export data locally. Otherwise the run is exported
+                to MongoDB, cluster by cluster if config.stream_to_mongo is set. Defaults to False.
             user_id (str, optional): User ID for data association. Defaults to None.
+            raw_data (pd.DataFrame, optional): Pre-fetched GDELT data for the country, as returned by
+                fetch_gdelt_data. Defaults to None, in which case the data is fetched.
+            progress (Callable[[str, int, int], None], optional): Called with (stage, done, total) as
+                the run moves through fetching, embedding, clustering, summarizing and exporting. Defaults to None.
 
         Returns:
             List[str]: Information about the pipeline run.
         """
         start_time = time.time()
+        # MongoDB run document, created once clusters are matched when streaming
+        run_id = None
+        run_status = RUN_RUNNING
+        progress = progress or _ignore_progress
         try:
-            self.logger.info("Fetching GDELT data...")
-            raw_data = fetch_gdelt_data(
-                client=self.bigquery_client,
-                country=country,
-                hours=hours,
-                config=self.config,
-            )
-            self.logger.info(f"Fetched {len(raw_data)} rows of data.")
-
-            if raw_data.empty:
-                self.logger.warning(
-                    "No data fetched from GDELT. Returning empty result.")
-                return []
-
-            self.logger.info("Preprocessing data...")
-            preprocessed_data = preprocess_data_summary(raw_data)
-            self.logger.info(
-                f"Preprocessed data shape: {preprocessed_data.shape}")
-
-            self.logger.info("Sampling data...")
-            sampled_data = self.sample_data(
-                preprocessed_data, process_all, sample_size)
-            self.logger.info(f"Sampled data shape: {sampled_data.shape}")
-            sampled_data.reset_index(drop=True, inplace=True)
-
-            # Define paths to save embeddings
-            embeddings_filename = f"embeddings_{country}_{hours}h.npy"
-            embeddings_filepath = os.path.join(
-                self.config.embeddings_dir, embeddings_filename)
-
-            indices_filename = f"embedding_indices_{country}_{hours}h.npy"
-            indices_filepath = os.path.join(
-                self.config.embeddings_dir, indices_filename)
-
-            # Define path to save input embedding
-            input_embedding_filename = f"input_embedding_{country}_{hours}h.npy"
-            input_embedding_filepath = os.path.join(
-                self.config.embeddings_dir, input_embedding_filename)
-
+            progress("fetching", 0, 1)
             self.logger.info("Generating input embedding...")
             input_embedding = self.get_embedding(input_sentence)
-            input_embedding = np.array(input_embedding)
+            input_embedding = np.array(input_embedding, dtype=np.float32)
 
-            # Save input embedding
-            if self.config.save_embeddings:
-                np.save(input_embedding_filepath, input_embedding)
+            if raw_data is None and process_all:
+                # Every row is used, so embed each batch while the next one downloads
                 self.logger.info(
-                    f"Input embedding saved to {input_embedding_filepath}")
-
-            self.logger.info("Generating embeddings...")
-            embeddings, valid_indices = generate_embeddings(
-                sampled_data,
-                max_workers=max_workers_embeddings,
-                save_embeddings_path=embeddings_filepath if self.config.save_embeddings else None,
-                save_indices_path=indices_filepath if self.config.save_embeddings else None
-            )
+                    "Fetching, preprocessing and embedding GDELT data...")
+                sampled_data, embeddings, valid_indices = self.stream_and_embed(
+                    country, hours, max_workers_embeddings)
+                self.logger.info(f"Fetched {len(sampled_data)} rows of data.")
+                progress("fetching", 1, 1)
+                if sampled_data.empty:
+                    self.logger.warning(
+                        "No data fetched from GDELT. Returning empty result.")
+                    return []
+            else:
+                if raw_data is None:
+                    self.logger.info("Fetching GDELT data...")
+                    raw_data = fetch_gdelt_data(
+                        client=self.bigquery_client,
+                        country=country,
+                        hours=hours,
+                        config=self.config,
+                        columns=PIPELINE_COLUMNS,
+                    )
+                    self.logger.info(f"Fetched {len(raw_data)} rows of data.")
+                progress("fetching", 1, 1)
+
+                if raw_data.empty:
+                    self.logger.warning(
+                        "No data fetched from GDELT. Returning empty result.")
+                    return []
+
+                self.logger.info("Preprocessing data...")
+                preprocessed_data = preprocess_data_summary(raw_data)
+                self.logger.info(
+                    f"Preprocessed data shape: {preprocessed_data.shape}")
+
+                self.logger.info("Sampling data...")
+                sampled_data = self.sample_data(
+                    preprocessed_data, process_all, sample_size)
+                self.logger.info(f"Sampled data shape: {sampled_data.shape}")
+                sampled_data.reset_index(drop=True, inplace=True)
+
+                self.logger.info("Generating embeddings...")
+                progress("embedding", 0, len(sampled_data))
+                embeddings, valid_indices = self.generate_embeddings(
+                    sampled_data, max_workers_embeddings)
+            progress("embedding", len(valid_indices), len(valid_indices))
             self.logger.info(f"Generated embeddings shape: {embeddings.shape}")
             self.logger.info(f"Number of valid indices: {len(valid_indices)}")
 
@@ -181,7 +328,15 @@ class GDELTNewsPipeline:
             self.logger.info(
                 f"Filtered sampled data shape: {sampled_data.shape}")
 
+            if self.embedding_store is not None:
+                # Read the embeddings back as a view of the memory-mapped store
+                embeddings = self.embedding_store.add_and_view(
+                    sampled_data['SOURCEURL'].tolist(), embeddings)
+                self.logger.info(
+                    f"Embedding store holds {len(self.embedding_store)} rows.")
+
             self.logger.info("Optimizing clustering parameters...")
+            progress("clustering", 0, 1)
             param_grid = {
                 'reduce_dimensionality': [True, False],
                 'reducer_algorithm': ['umap', 'pca', 'none'],
@@ -195,7 +350,11 @@ class GDELTNewsPipeline:
             clusters, best_params, best_scores, noise_count = optimize_clustering(
                 embeddings=embeddings,
                 param_grid=param_grid,
-                input_embedding=input_embedding
+                input_embedding=input_embedding,
+                search=self.config.clustering_search,
+                max_evaluations=self.config.clustering_max_evaluations,
+                time_budget=self.config.clustering_time_budget,
+                silhouette_sample_size=self.config.clustering_silhouette_sample_size,
             )
 
             self.logger.info(f"Best clustering parameters: {best_params}")
@@ -204,6 +363,7 @@ class GDELTNewsPipeline:
             self.logger.info(f"Generated {num_clusters} clusters.")
             self.logger.info(
                 f"Number of articles in noise cluster: {noise_count}")
+            progress("clustering", 1, 1)
 
             sampled_data['cluster'] = clusters
 
@@ -276,39 +436,54 @@ class GDELTNewsPipeline:
             cluster_article_summaries = ClusterArticleSummaries(
                 metadata=metadata)
 
-            def process_cluster(cluster):
-                cluster_data = sampled_data[sampled_data['cluster'] == cluster].copy(
-                )
-                cluster_urls = cluster_data['SOURCEURL'].tolist()
-                cluster_indices = cluster_data.index
-                cluster_embeddings = embeddings[cluster_indices]
+            if self.config.stream_to_mongo and not export_to_local:
+                # Create the run document up front so clusters can be served as they finish
+                run_id = self.start_run_mongo(
+                    cluster_article_summaries, input_sentence, country, hours, user_id)
+                self.logger.info(
+                    f"Streaming cluster summaries to MongoDB with ID: {run_id}")
 
-                if not cluster_urls:
+            # Row positions of every cluster, and the columns the workers read, built once
+            rows_by_cluster = cluster_rows(clusters)
+            urls = sampled_data['SOURCEURL'].to_numpy()
+            articles_metadata = sampled_data[[
+                'SOURCEURL', 'SQLDATE', 'AvgTone', 'NumMentions', 'GoldsteinScale']]
+
+            # Sampled and read flags, set from the main thread as clusters finish
+            sampled = np.zeros(len(sampled_data), dtype=bool)
+            read = np.zeros(len(sampled_data), dtype=bool)
+
+            def process_cluster(cluster):
+                cluster_indices = rows_by_cluster.get(cluster)
+                if cluster_indices is None or len(cluster_indices) == 0:
                     self.logger.info(f"Skipping empty cluster {cluster}")
                     return None
 
-                # Fetch additional article metadata
-                articles_metadata = cluster_data[[
-                    'SOURCEURL', 'SQLDATE', 'AvgTone', 'NumMentions', 'GoldsteinScale']]
+                cluster_urls = urls[cluster_indices]
+                cluster_embeddings = embeddings[cluster_indices]
 
                 sampled_urls = sample_articles(
-                    urls=cluster_urls,
+                    urls=cluster_urls.tolist(),
                     cluster_embeddings=cluster_embeddings,
-                    articles_metadata=articles_metadata,
+                    articles_metadata=articles_metadata.iloc[cluster_indices],
                     max_articles=self.config.max_articles_per_cluster,
                     lambda_param=self.config.mmr_lambda_param
                 )
 
-                # Mark sampled articles in the cluster data
-                cluster_data['sampled'] = cluster_data['SOURCEURL'].isin(
-                    sampled_urls)
+                # Rows of the sampled articles in the cluster
+                sampled_rows = cluster_indices[np.isin(
+                    cluster_urls, sampled_urls)]
 
                 self.logger.info(
                     f"Generating summaries for {len(sampled_urls)} articles in cluster {cluster}..."
                 )
 
                 article_summaries = generate_summaries(
-                    sampled_urls, article_summarizer_objective
+                    sampled_urls, article_summarizer_objective,
+                    fetcher=self.article_fetcher, cache=self.article_cache,
+                    summary_cache=self.summary_cache,
+                    max_article_tokens=self.config.summary_max_article_tokens,
+                    priority=cluster_ranks[cluster]
                 )
 
                 # Filter out articles with summaries marked as "NOT_RELEVANT" or "INACCESSIBLE"
@@ -319,31 +494,35 @@ class GDELTNewsPipeline:
                     url for summary, url in zip(article_summaries, sampled_urls) if "NOT_RELEVANT" not in summary and "INACCESSIBLE" not in summary
                 ]
 
-                # Mark read articles in the cluster data
-                cluster_data['read'] = cluster_data['SOURCEURL'].isin(
-                    filtered_urls)
-
-                # Update the main sampled_data DataFrame
-                sampled_data.loc[cluster_indices, ['sampled',
-                                                   'read']] = cluster_data[['sampled', 'read']]
+                # Rows of the read articles in the cluster
+                read_rows = cluster_indices[np.isin(
+                    cluster_urls, filtered_urls)]
 
                 if not filtered_summaries:
                     self.logger.info(
                         f"No relevant articles in cluster {cluster}")
-                    return None
+                    return sampled_rows, read_rows, None
 
                 event_obj = generate_cluster_summary(
-                    filtered_summaries, cluster_summarizer_objective
+                    filtered_summaries, cluster_summarizer_objective,
+                    priority=cluster_ranks[cluster]
                 )
-                return cluster, event_obj, filtered_summaries, filtered_urls
+                return sampled_rows, read_rows, (cluster, event_obj, filtered_summaries, filtered_urls)
 
+            progress("summarizing", 0, len(matched_clusters))
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers_summaries) as executor:
                 future_to_cluster = {executor.submit(
                     process_cluster, cluster): cluster for cluster in matched_clusters}
-                for future in tqdm(concurrent.futures.as_completed(future_to_cluster), total=len(matched_clusters), desc="Summarizing clusters"):
+                for done, future in enumerate(tqdm(concurrent.futures.as_completed(future_to_cluster), total=len(matched_clusters), desc="Summarizing clusters"), 1):
                     cluster = future_to_cluster[future]
+                    progress("summarizing", done, len(matched_clusters))
                     try:
-                        result = future.result()
+                        outcome = future.result()
+                        if outcome is None:
+                            continue
+                        sampled_rows, read_rows, result = outcome
+                        sampled[sampled_rows] = True
+                        read[read_rows] = True
                         if result:
                             cluster_id, event_obj, article_summaries, sampled_urls = result
                             cluster_summaries.append(event_obj.summary)
@@ -361,26 +540,35 @@ class GDELTNewsPipeline:
                             # Add cluster summary to ClusterArticleSummaries
                             cluster_article_summaries.add_cluster_summary(
                                 cluster_id, cluster_summary)
+                            if run_id is not None:
+                                self.export_cluster_mongo(
+                                    run_id, cluster_id, cluster_summary, cluster_article_summaries.metadata)
                     except Exception as e:
                         self.logger.error(
                             f"Error processing cluster {cluster}: {str(e)}")
 
             self.logger.info(
                 f"Generated {len(cluster_summaries)} cluster summaries.")
+            self.logger.info(
+                f"LLM scheduler: {get_llm_scheduler().stats()}")
 
-            # Before exporting, ensure 'sampled' and 'read' columns exist
-            if 'sampled' not in sampled_data.columns:
-                sampled_data['sampled'] = False
-            if 'read' not in sampled_data.columns:
-                sampled_data['read'] = False
+            sampled_data['sampled'] = sampled
+            sampled_data['read'] = read
 
             # Export the DataFrame and summaries
+            progress("exporting", 0, 1)
             if export_to_local:
                 csv_path, json_path = self.export_data_local(
                     sampled_data, cluster_article_summaries, input_sentence, country, hours
                 )
                 self.logger.info(f"Exported processed data to {csv_path}")
                 self.logger.info(f"Exported summaries to {json_path}")
+            elif run_id is not None:
+                self.finish_run_mongo(
+                    run_id, cluster_article_summaries, RUN_COMPLETE)
+                run_status = RUN_COMPLETE
+                self.logger.info(
+                    f"Completed MongoDB run with ID: {run_id}")
             else:
                 mongo_id = self.export_data_mongo(
                     sampled_data, cluster_article_summaries, input_sentence, country, hours, user_id
@@ -388,6 +576,8 @@ class GDELTNewsPipeline:
                 self.logger.info(
                     f"Exported data to MongoDB with ID: {mongo_id}")
 
+            progress("exporting", 1, 1)
+
             # Return metadata of run
             run_information = cluster_article_summaries.metadata.model_dump()
 
@@ -405,6 +595,87 @@ class GDELTNewsPipeline:
             self.logger.error(
                 f"Unexpected error in pipeline: {str(e)}", exc_info=True)
             raise ValueError("Pipeline execution failed") from e
+        finally:
+            if run_id is not None and run_status != RUN_COMPLETE:
+                self.finish_run_mongo(
+                    run_id, cluster_article_summaries, RUN_FAILED)
+
+    def run_pipeline_batch(
+        self,
+        country_inputs: Dict[str, Dict[str, Any]],
+        hours: int,
+        process_all: bool = False,
+        sample_size: int = 1500,
+        max_workers_embeddings: int = 5,
+        max_workers_summaries: int = 3,
+        max_workers_countries: int = 2,
+        export_to_local: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline for several countries, sharing a single GDELT fetch between them.
+
+        The data for all countries is fetched together and split per country locally, then each
+        country is processed and exported on its own, with at most max_workers_countries running
+        at once. A failure in one country does not stop the others. All countries send their
+        embedding requests through the pipeline's one client, so together they stay within the
+        configured rate limits.
+
+        Args:
+            country_inputs (Dict[str, Dict[str, Any]]): Mapping of country codes to the run_pipeline
+                arguments specific to that country (input_sentence, article_summarizer_objective,
+                cluster_summarizer_objective and optionally user_id).
+            hours (int): Number of hours to look back for news articles.
+            process_all (bool, optional): If True, process all data. Defaults to False.
+            sample_size (int, optional): Number of samples to take if not processing all data. Defaults to 1500.
+            max_workers_embeddings (int, optional): Maximum number of workers for generating embeddings. Defaults to 5.
+            max_workers_summaries (int, optional): Maximum number of workers for generating summaries. Defaults to 3.
+            max_workers_countries (int, optional): Maximum number of countries processed concurrently. Defaults to 2.
+            export_to_local (bool, optional): If True, export data locally. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Mapping of country codes to their run information, or to the exception
+                raised while processing that country.
+        """
+        countries = list(country_inputs)
+        self.logger.info(
+            f"Fetching GDELT data for {len(countries)} countries...")
+        raw_data = fetch_gdelt_data_multi(
+            client=self.bigquery_client,
+            countries=countries,
+            hours=hours,
+            config=self.config,
+            columns=PIPELINE_COLUMNS,
+        )
+        for country in countries:
+            self.logger.info(
+                f"Fetched {len(raw_data[country])} rows of data for {country}.")
+
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers_countries) as executor:
+            futures = {
+                executor.submit(
+                    self.run_pipeline,
+                    country=country,
+                    hours=hours,
+                    process_all=process_all,
+                    sample_size=sample_size,
+                    max_workers_embeddings=max_workers_embeddings,
+                    max_workers_summaries=max_workers_summaries,
+                    export_to_local=export_to_local,
+                    raw_data=raw_data[country],
+                    **country_inputs[country],
+                ): country
+                for country in countries
+            }
+            for future in concurrent.futures.as_completed(futures):
+                country = futures[future]
+                try:
+                    results[country] = future.result()
+                except Exception as e:
+                    self.logger.error(
+                        f"Pipeline failed for {country}: {str(e)}")
+                    results[country] = e
+        return results
 
     def get_embedding(self, text: str) -> List[float]:
         """
@@ -416,7 +687,16 @@ class GDELTNewsPipeline:
         Returns:
             List[float]: Embedding vector.
         """
-        return get_embedding(text=text, model=self.config.embedding_model)
+        model = self.config.embedding_model
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(text, model)
+            if cached is not None:
+                return cached.tolist()
+
+        embedding = get_embedding(text=text, model=model)
+        if self.embedding_cache is not None and embedding is not None:
+            self.embedding_cache.set(text, embedding, model)
+        return embedding
 
     def export_data_local(self, df: pd.DataFrame, summaries: ClusterArticleSummaries, input_sentence: str, country: str, hours: int) -> Tuple[str, str]:
         """
@@ -486,3 +766,95 @@ class GDELTNewsPipeline:
         except Exception as e:
             self.logger.error(f"Failed to save data to MongoDB: {str(e)}")
             raise
+
+    def start_run_mongo(
+        self,
+        cluster_article_summaries: ClusterArticleSummaries,
+        input_sentence: str,
+        country: str,
+        hours: int,
+        user_id: str
+    ) -> ObjectId:
+        """
+        Create the MongoDB document of a run before its clusters are summarized, with status "running".
+
+        Every write to the document sets updated_at, so readers can tell a live run from one whose
+        process died before it could set a final status.
+
+        Args:
+            cluster_article_summaries (ClusterArticleSummaries): Summaries of the run, usually without clusters yet.
+            input_sentence (str): User's input sentence.
+            country (str): Country code.
+            hours (int): Number of hours looked back.
+            user_id (str): User ID for data association.
+
+        Returns:
+            ObjectId: ID of the inserted MongoDB document.
+        """
+        try:
+            mongo_collection = self.mongo_db['news_summaries']
+            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+            mongo_data = {
+                'timestamp': timestamp,
+                'input_sentence': input_sentence,
+                'country': country,
+                'hours': hours,
+                'summaries': cluster_article_summaries.model_dump(),
+                'user_id': user_id,
+                'status': RUN_RUNNING,
+                'updated_at': datetime.now(timezone.utc)
+            }
+            result = mongo_collection.insert_one(mongo_data)
+            return result.inserted_id
+        except Exception as e:
+            self.logger.error(f"Failed to create run in MongoDB: {str(e)}")
+            raise
+
+    def export_cluster_mongo(self, run_id: ObjectId, cluster_id: int, cluster_summary: ClusterSummary, metadata: Metadata):
+        """
+        Add a finished cluster to the MongoDB document of a running run.
+
+        Failures are logged and not raised: the whole summaries are written again when the run finishes.
+
+        Args:
+            run_id (ObjectId): ID of the run document.
+            cluster_id (int): The ID of the cluster.
+            cluster_summary (ClusterSummary): The summary of the cluster.
+            metadata (Metadata): Metadata of the run, for the count of financially relevant events.
+        """
+        try:
+            self.mongo_db['news_summaries'].update_one(
+                {'_id': run_id},
+                {'$set': {
+                    f'summaries.clusters.{cluster_id}': cluster_summary.model_dump(),
+                    'summaries.metadata.no_financially_relevant_events': metadata.no_financially_relevant_events,
+                    'updated_at': datetime.now(timezone.utc)
+                }}
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Failed to save cluster {cluster_id} to MongoDB: {str(e)}")
+
+    def finish_run_mongo(self, run_id: ObjectId, cluster_article_summaries: ClusterArticleSummaries, status: str):
+        """
+        Write the final summaries of a run to its MongoDB document and set its status.
+
+        Args:
+            run_id (ObjectId): ID of the run document.
+            cluster_article_summaries (ClusterArticleSummaries): Summaries of the run.
+            status (str): RUN_COMPLETE, or RUN_FAILED if the run stopped with an error.
+        """
+        try:
+            self.mongo_db['news_summaries'].update_one(
+                {'_id': run_id},
+                {'$set': {
+                    'summaries': cluster_article_summaries.model_dump(),
+                    'status': status,
+                    'updated_at': datetime.now(timezone.utc)
+                }}
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Failed to set status of MongoDB run {run_id} to {status}: {str(e)}")
+            if status == RUN_COMPLETE:
+                raise
@@ -94,18 +94,64 @@ def preprocess(entry: str, column_type: str, max_entities: int = 10) -> str:
     Preprocesses the given entry based on the specified column type.
     Returns up to 10 unique entities.
     """
-    if not isinstance(entry, str) or pd.isna(entry):
+    if not isinstance(entry, str):
         return ""
-    mentions = entry.split(";")
+    # Dict keys keep insertion order, so this dedupes while preserving the original order.
+    # Stop scanning mentions as soon as enough unique entities have been found.
+    unique_names = {}
     if column_type == "location":
-        names = [mention.split("#")[2]
-                 for mention in mentions if len(mention.split("#")) > 2]
+        for mention in entry.split(";"):
+            parts = mention.split("#", 3)
+            if len(parts) > 2:
+                unique_names[parts[2]] = None
+                if len(unique_names) >= max_entities:
+                    break
     else:
-        names = [mention.split(",")[0].replace(" ", "_")
-                 for mention in mentions]
-    # Remove duplicates and non-informative entities
-    unique_names = list(dict.fromkeys(names))
-    return ", ".join(unique_names[:max_entities])
+        for mention in entry.replace(" ", "_").split(";"):
+            unique_names[mention.partition(",")[0]] = None
+            if len(unique_names) >= max_entities:
+                break
+    return ", ".join(unique_names)
+
+
+def preprocess_column(series: pd.Series, column_type: str, max_entities: int = 10) -> pd.Series:
+    """
+    Preprocess every entry of a column, as `series.apply(preprocess, ...)` would.
+
+    Args:
+        series (pd.Series): Column of raw GKG entity strings (e.g. V2Persons).
+        column_type (str): The column type, as for preprocess.
+        max_entities (int, optional): Maximum number of unique entities to keep per row. Defaults to 10.
+
+    Returns:
+        pd.Series: The preprocessed entity lists, aligned with the input index.
+    """
+    return pd.Series([preprocess(entry, column_type, max_entities) for entry in series.tolist()],
+                     index=series.index, dtype=object)
+
+
+def format_column(series: pd.Series, default: str) -> pd.Series:
+    """
+    Vectorized equivalent of formatting `safe_get(row, key, default)` into an f-string for every row.
+
+    Args:
+        series (pd.Series): The column to format.
+        default (str): The text used for null or empty values.
+
+    Returns:
+        pd.Series: The formatted values.
+    """
+    missing = series.isna()
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        missing |= series.astype(object) == ""
+
+    if (pd.api.types.is_datetime64_dtype(series)
+            and not (series.dt.microsecond.any() or series.dt.nanosecond.any())):
+        # str(Timestamp) only adds a fractional part when there is one
+        formatted = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        formatted = series.map(str)
+    return formatted.where(~missing, default).astype(object)
 
 
 def preprocess_data_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -129,41 +175,26 @@ def preprocess_data_summary(df: pd.DataFrame) -> pd.DataFrame:
         "theme": 4
     }
 
-    df['processed_persons'] = df['V2Persons'].apply(
-        lambda x: preprocess(x, "person", max_entities=max_entities["person"]))
-    df['processed_organizations'] = df['V2Organizations'].apply(
-        lambda x: preprocess(x, "organization", max_entities=max_entities["organization"]))
-    df['processed_locations'] = df['V2Locations'].apply(
-        lambda x: preprocess(x, "location", max_entities=max_entities["location"]))
-    df['processed_themes'] = df['V2Themes'].apply(
-        lambda x: preprocess(x, "theme", max_entities=max_entities["theme"]))
-
-    # df['combined'] = df.apply(
-    #     lambda row: (
-    #         f"On {safe_get(row, 'SQLDATE', 'an unknown date')}, an event occurred with the following details. "
-    #         f"It has the CAMEO code {safe_get(row, 'EventCode', 'unknown')}. "
-    #         f"The event is classified as {interpret_quad_class(safe_get(row, 'QuadClass'))}. "
-    #         f"The Goldstein scale value is {safe_get(row, 'GoldsteinScale', 'unknown')}, indicating {interpret_goldstein_scale(safe_get(row, 'GoldsteinScale'))}. "
-    #         f"The average tone was {safe_get(row, 'AvgTone', 'unknown')}, suggesting {interpret_avg_tone(safe_get(row, 'AvgTone'))}. "
-    #         f"The primary actors involved were {safe_get(row, 'Actor1Name', 'unknown')} and {safe_get(row, 'Actor2Name', 'unknown')}. "
-    #         f"This event was mentioned {safe_get(row, 'NumMentions', 'an unknown number of')} times across {safe_get(row, 'NumSources', 'an unknown number of')} sources in {safe_get(row, 'NumArticles', 'an unknown number of')} articles. "
-    #         f"Involved persons: {row['processed_persons'] or 'None mentioned'}. "
-    #         f"Involved organizations: {row['processed_organizations'] or 'None mentioned'}. "
-    #         f"Locations: {row['processed_locations'] or 'None mentioned'}. "
-    #         f"Themes associated: {row['processed_themes'] or 'None mentioned'}."
-    #     ),
-    #     axis=1
-    # )
-
-    df['combined'] = df.apply(
-        lambda row: (
-            f"On {safe_get(row, 'SQLDATE', 'an unknown date')}, an event occurred with the following details. "
-            f"Involved persons: {row['processed_persons'] or 'None mentioned'}. "
-            f"Involved organizations: {row['processed_organizations'] or 'None mentioned'}. "
-            f"Locations: {row['processed_locations'] or 'None mentioned'}. "
-            f"Themes associated: {row['processed_themes'] or 'None mentioned'}."
-        ),
-        axis=1
+    df['processed_persons'] = preprocess_column(
+        df['V2Persons'], "person", max_entities=max_entities["person"])
+    df['processed_organizations'] = preprocess_column(
+        df['V2Organizations'], "organization", max_entities=max_entities["organization"])
+    df['processed_locations'] = preprocess_column(
+        df['V2Locations'], "location", max_entities=max_entities["location"])
+    df['processed_themes'] = preprocess_column(
+        df['V2Themes'], "theme", max_entities=max_entities["theme"])
+
+    def or_none_mentioned(series):
+        return series.where(series != "", "None mentioned")
+
+    df['combined'] = (
+        "On " + format_column(df['SQLDATE'], 'an unknown date')
+        + ", an event occurred with the following details. "
+        + "Involved persons: " + or_none_mentioned(df['processed_persons']) + ". "
+        + "Involved organizations: " + or_none_mentioned(df['processed_organizations']) + ". "
+        + "Locations: " + or_none_mentioned(df['processed_locations']) + ". "
+        + "Themes associated: " +
+        or_none_mentioned(df['processed_themes']) + "."
     )
 
     return df
@@ -1,7 +1,8 @@
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import numpy as np
-from typing import List
+from typing import Dict, List
 
 
 def sample_data(df: pd.DataFrame, process_all: bool, sample_size: int) -> pd.DataFrame:
@@ -26,6 +27,22 @@ def sample_data(df: pd.DataFrame, process_all: bool, sample_size: int) -> pd.Dat
     return sampled_df
 
 
+def cluster_rows(clusters: np.ndarray) -> Dict[int, np.ndarray]:
+    """
+    Map each cluster label to the positions of its rows, with a single sort.
+
+    Args:
+        clusters (np.ndarray): Cluster label of each row.
+
+    Returns:
+        Dict[int, np.ndarray]: Row positions of each cluster, in ascending order.
+    """
+    clusters = np.asarray(clusters)
+    order = np.argsort(clusters, kind='stable')
+    labels, starts = np.unique(clusters[order], return_index=True)
+    return dict(zip(labels.tolist(), np.split(order, starts[1:])))
+
+
 def sample_articles(
     urls: List[str],
     cluster_embeddings: np.ndarray,
@@ -44,7 +61,7 @@ def sample_articles(
         lambda_param (float): Trade-off parameter between relevance and diversity.
 
     Returns:
-        List[str]: List of sampled article URLs.
+        List[str]: List of sampled article URLs, in selection order.
     """
     # Compute the centroid of the cluster
     centroid = cluster_embeddings.mean(axis=0).reshape(1, -1)
@@ -72,36 +89,32 @@ def sample_articles(
     combined_scores = lambda_param * similarities + \
         (1 - lambda_param) * quality_scores.values
 
-    # Initialize selected and candidate indices
+    # Unit-length embeddings, so that cosine similarity is a dot product
+    unit_embeddings = normalize(cluster_embeddings)
+
+    # Articles sharing a URL are picked at most once
+    url_codes, _ = pd.factorize(pd.Series(urls))
+    available = np.ones(len(urls), dtype=bool)
+
+    # Running max similarity of each candidate to the selected articles
+    max_similarity = np.zeros(len(urls))
+
     selected_indices = []
-    candidate_indices = list(range(len(urls)))
-    selected_urls = set()  # Add this line to keep track of selected URLs
-
-    for _ in range(min(max_articles, len(urls))):
-        mmr_scores = []
-        for idx in candidate_indices:
-            if urls[idx] in selected_urls:  # Skip if URL already selected
-                continue
-            if not selected_indices:
-                diversity = 0
-            else:
-                selected_embeddings = cluster_embeddings[selected_indices]
-                diversity = cosine_similarity(
-                    cluster_embeddings[idx].reshape(1, -1),
-                    selected_embeddings
-                ).max()
-            mmr_score = combined_scores[idx] - lambda_param * diversity
-            mmr_scores.append((mmr_score, idx))
-
-        if not mmr_scores:  # Break if no more unique URLs available
+    for step in range(min(max_articles, len(urls))):
+        if not available.any():  # Break if no more unique URLs available
             break
 
-        # Select the candidate with the highest MMR score
-        mmr_scores.sort(reverse=True)
-        _, best_idx = mmr_scores[0]
+        mmr_scores = combined_scores - lambda_param * max_similarity
+        mmr_scores[~available] = -np.inf
+
+        # Select the candidate with the highest MMR score; ties go to the later index
+        best_idx = len(urls) - 1 - int(np.argmax(mmr_scores[::-1]))
         selected_indices.append(best_idx)
-        selected_urls.add(urls[best_idx])
-        candidate_indices.remove(best_idx)
+        available[url_codes == url_codes[best_idx]] = False
+
+        similarity = unit_embeddings @ unit_embeddings[best_idx]
+        max_similarity = similarity if step == 0 else np.maximum(
+            max_similarity, similarity)
 
-    sampled_urls = list(selected_urls)  # Convert set to list
-    return sampled_urls
+    # Sampled URLs in selection order
+    return [urls[i] for i in selected_indices]
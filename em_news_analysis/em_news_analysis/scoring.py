@@ -0,0 +1,182 @@
+import numpy as np
+from sklearn.metrics import silhouette_score
+from sklearn.metrics.pairwise import cosine_similarity, euclidean_distances
+from typing import Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Silhouette is quadratic in the number of points, so larger clusterings are scored on a subsample
+DEFAULT_SILHOUETTE_SAMPLE_SIZE = 2000
+
+# Weights of the individual scores in the composite score
+SCORE_WEIGHTS = {
+    'silhouette': 0.7,
+    'davies_bouldin': 0.2,
+    'stability': 0.05,
+    'relevance': 0.05,
+}
+
+
+def stratified_subsample(labels: np.ndarray, sample_size: int, random_state: int = 0) -> np.ndarray:
+    """
+    Draw a random subsample that keeps each cluster's share of the points.
+
+    Every cluster keeps at least two points (or all of them, if it has fewer), so that each
+    cluster still contributes to the silhouette.
+
+    Args:
+        labels (np.ndarray): Cluster label of each point.
+        sample_size (int): Approximate number of points to keep.
+        random_state (int, optional): Seed for the draw. Defaults to 0.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n_points = len(labels)
+    if sample_size >= n_points:
+        return np.arange(n_points)
+
+    rng = np.random.default_rng(random_state)
+    # Group the points by label, in random order within each label
+    order = np.lexsort((rng.random(n_points), labels))
+    _, starts, counts = np.unique(
+        labels[order], return_index=True, return_counts=True)
+    rank = np.arange(n_points) - np.repeat(starts, counts)
+    quota = np.maximum(np.minimum(counts, 2), np.round(
+        counts * sample_size / n_points).astype(np.int64))
+    return np.sort(order[rank < np.repeat(quota, counts)])
+
+
+def cluster_centroids(embeddings: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the centroid of every cluster in one pass.
+
+    Args:
+        embeddings (np.ndarray): 2D array of points, without noise.
+        labels (np.ndarray): Cluster label of each point.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The centroids (one row per cluster, in label order),
+            the cluster index of each point, and the size of each cluster.
+    """
+    _, cluster_index = np.unique(labels, return_inverse=True)
+    sizes = np.bincount(cluster_index)
+    sums = np.zeros((len(sizes), embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, cluster_index, embeddings)
+    return sums / sizes[:, None], cluster_index, sizes
+
+
+def davies_bouldin(embeddings: np.ndarray, centroids: np.ndarray, cluster_index: np.ndarray, sizes: np.ndarray) -> float:
+    """
+    Davies-Bouldin index from precomputed centroids; equal to sklearn's davies_bouldin_score.
+
+    Args:
+        embeddings (np.ndarray): 2D array of points, without noise.
+        centroids (np.ndarray): Centroid of each cluster.
+        cluster_index (np.ndarray): Cluster index of each point.
+        sizes (np.ndarray): Size of each cluster.
+
+    Returns:
+        float: The index (lower is better).
+    """
+    distances_to_centroid = np.linalg.norm(
+        embeddings - centroids[cluster_index], axis=1)
+    intra_dists = np.bincount(
+        cluster_index, weights=distances_to_centroid) / sizes
+    # Pairwise distances without a k x k x d difference array
+    centroid_distances = euclidean_distances(centroids)
+
+    if np.allclose(intra_dists, 0) or np.allclose(centroid_distances, 0):
+        return 0.0
+
+    centroid_distances[centroid_distances == 0] = np.inf
+    combined_intra_dists = intra_dists[:, None] + intra_dists
+    return float(np.mean(np.max(combined_intra_dists / centroid_distances, axis=1)))
+
+
+def subsample_silhouette(
+    embeddings: np.ndarray,
+    labels: np.ndarray,
+    sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE,
+    distances: np.ndarray = None,
+    positions: np.ndarray = None,
+    random_state: int = 0
+) -> float:
+    """
+    Silhouette score, computed on a stratified subsample when there are more than sample_size points.
+
+    Args:
+        embeddings (np.ndarray): 2D array of points, without noise.
+        labels (np.ndarray): Cluster label of each point.
+        sample_size (int, optional): Maximum number of points to score. Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+        distances (np.ndarray, optional): Precomputed pairwise distances between all points,
+            including noise. Defaults to None (distances are computed).
+        positions (np.ndarray, optional): Row of each point in distances. Required with distances.
+        random_state (int, optional): Seed for the subsample. Defaults to 0.
+
+    Returns:
+        float: The silhouette score (higher is better).
+    """
+    sample = stratified_subsample(labels, sample_size, random_state)
+    if distances is not None:
+        rows = positions[sample]
+        return float(silhouette_score(distances[np.ix_(rows, rows)], labels[sample], metric='precomputed'))
+    return float(silhouette_score(embeddings[sample], labels[sample]))
+
+
+def score_clustering(
+    embeddings_reduced: np.ndarray,
+    input_embedding_reduced: np.ndarray,
+    labels: np.ndarray,
+    probabilities: np.ndarray,
+    silhouette_sample_size: int = DEFAULT_SILHOUETTE_SAMPLE_SIZE,
+    distances: np.ndarray = None
+) -> Dict[str, float]:
+    """
+    Compute the individual clustering scores, each oriented so that higher is better.
+
+    Args:
+        embeddings_reduced (np.ndarray): Clustered embeddings, including noise.
+        input_embedding_reduced (np.ndarray): Input embedding after the same reduction, as a single row.
+        labels (np.ndarray): Cluster label of each embedding, -1 for noise.
+        probabilities (np.ndarray): Cluster membership strength of each embedding.
+        silhouette_sample_size (int, optional): Maximum number of points used for the silhouette.
+            Defaults to DEFAULT_SILHOUETTE_SAMPLE_SIZE.
+        distances (np.ndarray, optional): Precomputed pairwise distances between the embeddings,
+            used for the silhouette. Defaults to None.
+
+    Returns:
+        Dict[str, float]: The silhouette, davies_bouldin (negated), stability and relevance scores.
+
+    Raises:
+        ValueError: If every point is noise.
+    """
+    clustered = np.flatnonzero(labels != -1)
+    if len(clustered) == 0:
+        raise ValueError("All points were labelled as noise")
+    points = embeddings_reduced[clustered]
+    cluster_labels = labels[clustered]
+    centroids, cluster_index, sizes = cluster_centroids(points, cluster_labels)
+
+    scores = {}
+    if len(sizes) > 1:
+        scores['silhouette'] = subsample_silhouette(
+            points, cluster_labels, silhouette_sample_size, distances=distances, positions=clustered)
+        # Invert Davies-Bouldin Index so that higher is better
+        scores['davies_bouldin'] = -davies_bouldin(
+            points, centroids, cluster_index, sizes)
+    else:
+        scores['silhouette'] = 0
+        scores['davies_bouldin'] = -np.inf
+    scores['stability'] = float(np.mean(probabilities[clustered]))
+    scores['relevance'] = float(
+        np.max(cosine_similarity(input_embedding_reduced, centroids)[0]))
+    return scores
+
+
+def composite_score(scores: Dict[str, float]) -> float:
+    """
+    Combine the individual scores into one, using SCORE_WEIGHTS.
+    """
+    return sum(scores[name] * weight for name, weight in SCORE_WEIGHTS.items())
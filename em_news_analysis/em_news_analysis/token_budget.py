@@ -0,0 +1,155 @@
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Encoding used for models tiktoken does not know about
+DEFAULT_ENCODING = "o200k_base"
+
+# Seconds to wait before trying again to load a tokenizer that failed to load
+ENCODING_RETRY_INTERVAL = 60.0
+
+# Loaded tokenizers, and when loading failed for models that have none yet
+_encodings: Dict[str, tiktoken.Encoding] = {}
+_encoding_failures: Dict[str, float] = {}
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    """
+    Token limits of a chat model, and how many tokens an article may use of them.
+
+    Attributes:
+        context_tokens (int): Size of the model's context window.
+        output_tokens (int): Tokens reserved for the model's answer.
+        max_article_tokens (int): Cap on the article itself, to keep prompt cost predictable.
+        margin_tokens (int): Slack for message framing and tokenizer differences.
+    """
+    context_tokens: int
+    output_tokens: int
+    max_article_tokens: int
+    margin_tokens: int = 256
+
+    def article_tokens(self, prompt_tokens: int) -> int:
+        """
+        Tokens left for the article once the rest of the prompt and the answer are accounted for.
+
+        Args:
+            prompt_tokens (int): Tokens used by the system prompt, objective and instructions.
+
+        Returns:
+            int: The article budget (never negative).
+        """
+        available = self.context_tokens - self.output_tokens - \
+            self.margin_tokens - prompt_tokens
+        return max(0, min(self.max_article_tokens, available))
+
+
+MODEL_BUDGETS: Dict[str, TokenBudget] = {
+    "gpt-4o-mini": TokenBudget(context_tokens=128000, output_tokens=4096, max_article_tokens=60000),
+    "gpt-4o": TokenBudget(context_tokens=128000, output_tokens=4096, max_article_tokens=30000),
+}
+
+DEFAULT_BUDGET = TokenBudget(
+    context_tokens=16000, output_tokens=2048, max_article_tokens=8000)
+
+
+def get_token_budget(model: str, max_article_tokens: Dict[str, int] = None) -> TokenBudget:
+    """
+    Get the token budget of a model, applying any configured article cap.
+
+    Args:
+        model (str): The name of the model.
+        max_article_tokens (Dict[str, int], optional): Per-model overrides of max_article_tokens. Defaults to None.
+
+    Returns:
+        TokenBudget: The budget.
+    """
+    budget = MODEL_BUDGETS.get(model, DEFAULT_BUDGET)
+    if max_article_tokens and model in max_article_tokens:
+        budget = TokenBudget(budget.context_tokens, budget.output_tokens,
+                             max_article_tokens[model], budget.margin_tokens)
+    return budget
+
+
+def get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Get the tokenizer of a model, falling back to DEFAULT_ENCODING for unknown models.
+
+    tiktoken downloads encodings on first use; if that fails, None is returned and token counts
+    are bounded by the UTF-8 length of the text instead. Only loaded tokenizers are cached, and
+    a failed load is tried again after ENCODING_RETRY_INTERVAL seconds.
+    """
+    encoding = _encodings.get(model)
+    if encoding is not None:
+        return encoding
+    failed_at = _encoding_failures.get(model)
+    if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_INTERVAL:
+        return None
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(
+            f"Could not load the tokenizer for {model} ({str(e)}). Estimating token counts instead.")
+        _encoding_failures[model] = time.monotonic()
+        return None
+    _encodings[model] = encoding
+    _encoding_failures.pop(model, None)
+    return encoding
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens of a text with a model's tokenizer.
+
+    Args:
+        text (str): The text.
+        model (str): The name of the model.
+
+    Returns:
+        int: The number of tokens, or an upper bound on it (the UTF-8 length) if no tokenizer can be loaded.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        # A token covers at least one byte, whatever the script
+        return len(text.encode("utf-8"))
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Truncate a text to at most max_tokens tokens of a model's tokenizer.
+
+    Args:
+        text (str): The text.
+        max_tokens (int): The token budget.
+        model (str): The name of the model.
+
+    Returns:
+        str: The text, cut at a token boundary if it was over budget.
+    """
+    # A token covers at least one byte, so short texts cannot be over budget
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_tokens:
+        return text
+    encoding = get_encoding(model)
+    if encoding is None:
+        logger.warning(
+            f"Text has {len(encoded)} bytes and no tokenizer is loaded for {model}. Truncating to {max_tokens} bytes.")
+        # Cut at a character boundary, so at most max_tokens bytes and hence tokens remain
+        return encoded[:max_tokens].decode("utf-8", errors="ignore")
+    token_ids = encoding.encode(text, disallowed_special=())
+    tokens = len(token_ids)
+    truncated = encoding.decode(token_ids[:max_tokens])
+    if tokens <= max_tokens:
+        return text
+    logger.warning(
+        f"Text has {tokens} tokens, above the budget of {max_tokens} for {model}. Truncating.")
+    return truncated
@@ -1,6 +1,10 @@
 from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel, Field
+from typing import List
 from em_news_analysis import ProductionConfig, GDELTNewsPipeline
+from em_news_analysis.llm_scheduler import get_llm_scheduler
+from em_news_analysis.jobs import get_job_manager
+import asyncio
 import logging
 
 
@@ -28,26 +32,142 @@ class PipelineInput(BaseModel):
     max_workers_summaries: int = 3
 
 
-@app.post("/run_pipeline")
-async def run_pipeline(input_data: PipelineInput):
+class BatchPipelineInput(BaseModel):
+    runs: List[PipelineInput]
+    hours: int = Field(ge=2, le=24, default=3)
+    process_all: bool = False
+    sample_size: int = 1500
+    max_workers_embeddings: int = 5
+    max_workers_summaries: int = 3
+    max_workers_countries: int = 2
+
+
+def summarize_run(result) -> dict:
+    """Counts and execution time of a run, from the run information returned by run_pipeline."""
+    if not result:
+        return {}
+    return {key: result[key] for key in (
+        "no_clusters", "no_matched_clusters", "no_articles",
+        "no_financially_relevant_events", "execution_time")}
+
+
+def run_pipeline_job(input_data: PipelineInput, progress) -> dict:
+    """
+    Run the pipeline for one country on a job worker thread.
+
+    Args:
+        input_data (PipelineInput): The pipeline parameters.
+        progress (Callable[[str, int, int], None]): Progress callback of the job.
+
+    Returns:
+        dict: Counts and execution time of the run.
+    """
+    config = ProductionConfig()
+    pipeline = GDELTNewsPipeline(config)
+    result = pipeline.run_pipeline(
+        input_sentence=input_data.input_sentence,
+        country=input_data.country_fips_10_4_code,
+        hours=input_data.hours,
+        article_summarizer_objective=input_data.article_summarizer_objective,
+        cluster_summarizer_objective=input_data.cluster_summarizer_objective,
+        process_all=input_data.process_all,
+        sample_size=input_data.sample_size,
+        max_workers_embeddings=input_data.max_workers_embeddings,
+        max_workers_summaries=input_data.max_workers_summaries,
+        user_id=input_data.user_id,
+        progress=progress
+    )
+    logger.info(f"Pipeline result: {result}")
+    return summarize_run(result)
+
+
+def run_pipeline_batch_job(input_data: BatchPipelineInput, progress) -> dict:
+    """
+    Run the pipeline for several countries from one shared GDELT fetch, on a job worker thread.
+
+    Args:
+        input_data (BatchPipelineInput): The pipeline parameters.
+        progress (Callable[[str, int, int], None]): Progress callback of the job.
+
+    Returns:
+        dict: Per country code, the counts of its run, or the error it failed with.
+    """
     config = ProductionConfig()
     pipeline = GDELTNewsPipeline(config)
+    results = pipeline.run_pipeline_batch(
+        country_inputs={
+            run.country_fips_10_4_code: {
+                "input_sentence": run.input_sentence,
+                "article_summarizer_objective": run.article_summarizer_objective,
+                "cluster_summarizer_objective": run.cluster_summarizer_objective,
+                "user_id": run.user_id,
+            }
+            for run in input_data.runs
+        },
+        hours=input_data.hours,
+        process_all=input_data.process_all,
+        sample_size=input_data.sample_size,
+        max_workers_embeddings=input_data.max_workers_embeddings,
+        max_workers_summaries=input_data.max_workers_summaries,
+        max_workers_countries=input_data.max_workers_countries
+    )
+    progress("countries", len(results), len(input_data.runs))
+    return {
+        country: {"error": str(result)} if isinstance(result, Exception) else summarize_run(result)
+        for country, result in results.items()
+    }
+
+
+def submit_pipeline_job(input_data: PipelineInput) -> str:
+    job = get_job_manager().submit(
+        lambda progress: run_pipeline_job(input_data, progress),
+        params={"country": input_data.country, "hours": input_data.hours,
+                "user_id": input_data.user_id})
+    return job.id
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(input_data: PipelineInput):
+    """Queue a pipeline run and return its job ID without waiting for it."""
+    return {"job_id": submit_pipeline_job(input_data)}
+
+
+@app.post("/jobs/batch", status_code=202)
+async def create_batch_job(input_data: BatchPipelineInput):
+    """Queue pipeline runs for several countries that share one GDELT fetch, and return the job ID."""
+    codes = [run.country_fips_10_4_code for run in input_data.runs]
+    if len(set(codes)) != len(codes):
+        raise HTTPException(
+            status_code=422, detail="Each country can only be run once per batch")
+    job = get_job_manager().submit(
+        lambda progress: run_pipeline_batch_job(input_data, progress),
+        params={"countries": [run.country for run in input_data.runs], "hours": input_data.hours})
+    return {"job_id": job.id}
+
 
+@app.get("/jobs")
+async def list_jobs():
+    """Status and progress of every queued, running and recently finished job."""
+    return get_job_manager().list_jobs()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, per-stage progress and result (or error) of a job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/run_pipeline")
+async def run_pipeline(input_data: PipelineInput):
+    """Run the pipeline as a job and wait for it. The job keeps running if the client disconnects."""
+    job_id = submit_pipeline_job(input_data)
+    future = get_job_manager().future(job_id)
     try:
-        result = pipeline.run_pipeline(
-            input_sentence=input_data.input_sentence,
-            country=input_data.country_fips_10_4_code,
-            hours=input_data.hours,
-            article_summarizer_objective=input_data.article_summarizer_objective,
-            cluster_summarizer_objective=input_data.cluster_summarizer_objective,
-            process_all=input_data.process_all,
-            sample_size=input_data.sample_size,
-            max_workers_embeddings=input_data.max_workers_embeddings,
-            max_workers_summaries=input_data.max_workers_summaries,
-            user_id=input_data.user_id
-        )
-        logger.info(f"Pipeline result: {result}")
-        return {"status": "success"}
+        await asyncio.shield(asyncio.wrap_future(future))
+        return {"status": "success", "job_id": job_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -57,6 +177,12 @@ async def root():
     return {"message": "Welcome to the GDELT News Analysis API"}
 
 
+@app.get("/llm_scheduler")
+async def llm_scheduler():
+    """Queue depth, in-flight calls and wait times of the process-wide LLM scheduler."""
+    return get_llm_scheduler().stats()
+
+
 @app.get("/health")
 async def health():
     logger.info("Health check")
@@ -28,30 +28,62 @@ open_ai_llm = ChatOpenAI(
 )
 
 
+# Patterns used by clean_text, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_WEB_ELEMENTS_RE = re.compile(
+    r'(Cookie Policy|Privacy Policy|Terms of Service|Copyright ©)', flags=re.IGNORECASE)
+_URL_RE = re.compile(
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+_EMAIL_RE = re.compile(r'\S+@\S+')
+_SPECIAL_CHARACTERS_RE = re.compile(r'[^a-zA-Z0-9\s.,;:!?()"-]')
+
+
+class _NonPrintableTable(dict):
+    """
+    str.translate table that deletes non-printable characters, filled in as characters are first seen.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = codepoint if chr(codepoint).isprintable() else None
+        self[codepoint] = value
+        return value
+
+
+_NON_PRINTABLE = _NonPrintableTable()
+
+
+def exceeds_words(text: str, max_words: int) -> bool:
+    """
+    Whether text has more than max_words words, without splitting past the limit.
+    """
+    return len(text.split(maxsplit=max_words)) > max_words
+
+
 def clean_text(text: str, level: int = 1, max_words: int = 50000) -> str:
     """Clean the text with different levels of aggressiveness and truncate if necessary."""
     # Level 1: Basic cleaning
-    text = BeautifulSoup(text, "html.parser").get_text()
-    text = re.sub(r'\s+', ' ', text).strip()
-    text = ''.join(char for char in text if char.isprintable())
+    if '<' in text or '&' in text:
+        # Only markup and character references need an HTML parse
+        text = BeautifulSoup(text, "html.parser").get_text()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if not text.isprintable():
+        text = text.translate(_NON_PRINTABLE)
 
     if level >= 2:
         # Level 2: Remove common web elements and URLs
-        text = re.sub(r'(Cookie Policy|Privacy Policy|Terms of Service|Copyright ©)',
-                      '', text, flags=re.IGNORECASE)
-        text = re.sub(
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        text = _WEB_ELEMENTS_RE.sub('', text)
+        text = _URL_RE.sub('', text)
 
     if level >= 3:
         # Level 3: Remove email addresses and special characters
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[^a-zA-Z0-9\s.,;:!?()"-]', '', text)
+        text = _EMAIL_RE.sub('', text)
+        text = _SPECIAL_CHARACTERS_RE.sub('', text)
 
-    # Truncate to max_words if necessary
-    words = text.split()
+    # Truncate to max_words if necessary, splitting no further than needed
+    words = text.split(maxsplit=max_words)
     if len(words) > max_words:
         logger.warning(
-            f"Text exceeds the maximum of {max_words} words. Text length: {len(words)}. Truncating.")
+            f"Text exceeds the maximum of {max_words} words. Truncating.")
         text = ' '.join(words[:max_words])
 
     return text
@@ -103,20 +135,18 @@ def article_summarizer(url: str, model: int = 3, max_words: int = 50000) -> str:
 
     # Clean and check the word count of the article content
     article_content = ' '.join([doc.page_content for doc in docs])
-    original_word_count = len(article_content.split())
-
     for cleaning_level in range(1, 4):
         article_content = clean_text(
             article_content, level=cleaning_level, max_words=max_words)
-        if len(article_content.split()) <= max_words:
+        if not exceeds_words(article_content, max_words):
             break
 
-    if len(article_content.split()) > max_words:
+    if exceeds_words(article_content, max_words):
         logger.warning(
             f"Article content still exceeds the maximum of {max_words} words after cleaning. "
-            f"Original word count: {original_word_count}, Cleaned word count: {len(article_content.split())}. "
             f"Truncating to {max_words} words.")
-        article_content = ' '.join(article_content.split()[:max_words])
+        article_content = ' '.join(
+            article_content.split(maxsplit=max_words)[:max_words])
 
     if model == 3:
         llm = open_ai_llm_mini
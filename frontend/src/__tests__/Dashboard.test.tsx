@@ -11,6 +11,7 @@ jest.mock('@/services/api', () => ({
         getCountries: jest.fn(),
         getAddableCountries: jest.fn(),
         runCountryPipeline: jest.fn(),
+        getPipelineJob: jest.fn(),
         deleteCountry: jest.fn().mockResolvedValue(undefined),
     },
 }));
@@ -15,6 +15,9 @@ import { ToggleGroup, ToggleGroupItem } from "@/components/ui/toggle-group";
 import { useTour } from '@/contexts/TourContext';
 import { useTourSteps } from '@/hooks/useTourSteps';
 
+// Milliseconds between checks of a running pipeline job
+const PIPELINE_POLL_INTERVAL = 5000;
+
 const Dashboard: React.FC = React.memo(() => {
   const [countries, setCountries] = useState<CountryInfo[]>([]);
   const [error, setError] = useState<string | null>(null);
@@ -87,7 +90,16 @@ const Dashboard: React.FC = React.memo(() => {
     }, 100);
 
     try {
-      await api.runCountryPipeline(selectedCountry, timePeriod, countryInterest);
+      // The pipeline runs as a background job; poll it until it finishes
+      const { job_id } = await api.runCountryPipeline(selectedCountry, timePeriod, countryInterest);
+      let job = await api.getPipelineJob(job_id);
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, PIPELINE_POLL_INTERVAL));
+        job = await api.getPipelineJob(job_id);
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Pipeline job failed');
+      }
       // Update user's country interests
       await api.updateUserInterests({ [selectedCountry]: countryInterest });
       clearInterval(interval);
@@ -93,6 +93,19 @@ interface CountryPipelineRequest {
   area_of_interest: string;
 }
 
+export interface PipelineJobSubmission {
+  status: string;
+  job_id: string;
+}
+
+export interface PipelineJob {
+  id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  stage: string | null;
+  progress: { [stage: string]: { done: number; total: number } };
+  error: string | null;
+}
+
 const getAuthHeaders = (): HeadersInit => {
   const token = auth.getToken();
   return token ? { Authorization: `Bearer ${token}` } : {};
@@ -209,7 +222,7 @@ export const api = {
     return data;
   },
 
-  async runCountryPipeline(country: string, hours: number, area_of_interest: string): Promise<void> {
+  async runCountryPipeline(country: string, hours: number, area_of_interest: string): Promise<PipelineJobSubmission> {
     const response = await fetch(`${API_BASE_URL}/run-country-pipeline`, {
       method: 'POST',
       headers: {
@@ -225,6 +238,17 @@ export const api = {
     return handledResponse.json();
   },
 
+  async getPipelineJob(jobId: string): Promise<PipelineJob> {
+    const response = await fetch(`${API_BASE_URL}/pipeline-jobs/${jobId}`, {
+      headers: getAuthHeaders(),
+    });
+    const handledResponse = await handleResponse(response);
+    if (!handledResponse.ok) {
+      throw new Error('Failed to fetch pipeline job');
+    }
+    return handledResponse.json();
+  },
+
   async deleteCountry(country: string): Promise<void> {
     const response = await fetch(`${API_BASE_URL}/countries/${country}`, {
       method: 'DELETE',
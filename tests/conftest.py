@@ -0,0 +1,53 @@
+import json
+import base64
+import httpx
+import numpy as np
+import pytest
+from openai import AsyncOpenAI
+from em_news_analysis.embeddings import AsyncEmbeddingClient
+
+
+class FakeEmbeddingsEndpoint:
+    """
+    Local stand-in for the OpenAI embeddings endpoint.
+
+    The embedding of a text is [len(text)]. Texts listed in `bad_texts` make the request fail
+    with a 400, and the first `throttle` requests are answered with a 429.
+    """
+
+    def __init__(self, bad_texts=(), throttle=0):
+        self.bad_texts = set(bad_texts)
+        self.throttle = throttle
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body["input"])
+        if self.throttle > 0:
+            self.throttle -= 1
+            return httpx.Response(429, headers={"retry-after": "0"},
+                                  json={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}})
+        if self.bad_texts.intersection(body["input"]):
+            return httpx.Response(400, json={"error": {"message": "Invalid input", "type": "invalid_request_error"}})
+        data = []
+        for i, text in enumerate(body["input"]):
+            embedding = [float(len(text))]
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(
+                    np.array(embedding, dtype=np.float32).tobytes()).decode()
+            data.append({"object": "embedding", "index": i,
+                        "embedding": embedding})
+        return httpx.Response(200, json={
+            "object": "list", "data": data, "model": body["model"],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1}})
+
+    def client(self, **kwargs) -> AsyncEmbeddingClient:
+        openai_client = AsyncOpenAI(
+            api_key="test", base_url="http://fake-openai.local/v1", max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.handler)))
+        return AsyncEmbeddingClient(model="test-model", client=openai_client, **kwargs)
+
+
+@pytest.fixture
+def fake_embeddings():
+    return FakeEmbeddingsEndpoint
@@ -0,0 +1,85 @@
+import asyncio
+import httpx
+import pytest
+from em_news_analysis.article_fetcher import AsyncArticleFetcher, get_article_fetcher
+from em_news_analysis.async_runtime import run_async
+
+
+def make_fetcher(handler, **kwargs) -> AsyncArticleFetcher:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncArticleFetcher(client=client, **kwargs)
+
+
+def test_fetch_extracts_html_text():
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"},
+                              content=b"<html><body><p>Rates rise</p></body></html>")
+
+    article = run_async(make_fetcher(handler).fetch("https://news.example/a"))
+
+    assert article.status_code == 200
+    assert article.text == "Rates rise"
+
+
+def test_fetch_many_returns_errors_in_place():
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        if request.url.path == "/large":
+            return httpx.Response(200, content=b"x" * 100)
+        return httpx.Response(200, content=b"<p>ok</p>")
+
+    results = run_async(make_fetcher(handler, max_bytes=50).fetch_many([
+        "https://news.example/ok", "https://news.example/missing", "https://news.example/large"]))
+
+    assert results[0].text == "ok"
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert isinstance(results[2], ValueError)
+
+
+def test_fetch_caps_concurrency_per_host():
+    in_flight = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, content=b"<p>ok</p>")
+
+    urls = [f"https://{host}/{i}" for host in ("a.example", "b.example") for i in range(6)]
+    results = run_async(make_fetcher(handler, max_per_host=2).fetch_many(urls))
+
+    assert all(result.text == "ok" for result in results)
+    assert peak == {"a.example": 2, "b.example": 2}
+
+
+def test_fetch_enforces_deadline():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, content=b"<p>late</p>")
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_async(make_fetcher(handler, deadline=0.05).fetch("https://slow.example/"))
+
+
+def test_fetch_sends_validators_and_reports_not_modified():
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"etag": '"v1"'}, content=b"<p>body</p>")
+
+    fetcher = make_fetcher(handler)
+    first = run_async(fetcher.fetch("https://news.example/a"))
+    second = run_async(fetcher.fetch("https://news.example/a", etag=first.etag))
+
+    assert first.text == "body" and not first.not_modified
+    assert second.not_modified and second.etag == '"v1"'
+
+
+def test_get_article_fetcher_is_shared():
+    fetcher = get_article_fetcher()
+
+    assert get_article_fetcher(max_per_host=1) is fetcher
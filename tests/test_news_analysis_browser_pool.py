@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from em_news_analysis.async_runtime import run_async
+from em_news_analysis.browser_pool import AsyncBrowserPool
+
+
+class FakePage:
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, timeout, wait_until):
+        self.browser.open_loads += 1
+        self.browser.peak_loads = max(self.browser.peak_loads, self.browser.open_loads)
+        try:
+            await asyncio.sleep(0.01)
+            if "fail" in url:
+                raise RuntimeError("Page crashed")
+        finally:
+            self.browser.open_loads -= 1
+        self.url = url
+
+    async def evaluate(self, script, selector):
+        pass
+
+    async def inner_text(self, selector, timeout):
+        return f"Text of {self.url}"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self.browser, self)
+        self.browser.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.pages = []
+        self.open_loads = 0
+        self.peak_loads = 0
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+def make_pool(max_pages) -> AsyncBrowserPool:
+    pool = AsyncBrowserPool(max_pages=max_pages)
+    pool._browser = FakeBrowser()
+    return pool
+
+
+def test_pool_bounds_open_pages_and_reuses_them():
+    pool = make_pool(max_pages=2)
+
+    async def load_all():
+        return await asyncio.gather(*(pool.load(f"https://news.example/{i}") for i in range(6)))
+
+    texts = run_async(load_all())
+
+    assert texts == [f"Text of https://news.example/{i}" for i in range(6)]
+    assert pool._browser.peak_loads == 2
+    assert len(pool._browser.pages) == 2
+    assert pool.loads == 6
+
+
+def test_pool_replaces_failed_and_closed_pages():
+    pool = make_pool(max_pages=1)
+    browser = pool._browser
+
+    with pytest.raises(RuntimeError):
+        run_async(pool.load("https://news.example/fail"))
+    assert browser.contexts[0].closed
+
+    assert run_async(pool.load("https://news.example/a")) == "Text of https://news.example/a"
+    # The idle page dies between loads; its context is closed and a new page is opened
+    browser.pages[1].closed = True
+    assert run_async(pool.load("https://news.example/b")) == "Text of https://news.example/b"
+
+    assert [context.closed for context in browser.contexts] == [True, True, False]
+    assert len(browser.pages) == 3
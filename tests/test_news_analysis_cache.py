@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import concurrent.futures
+import httpx
+from em_news_analysis.article_summarizer import finish_article_fetch
+from em_news_analysis.cache import SQLiteCache, EmbeddingCache, ArticleCache, SummaryCache, canonical_url
+from em_news_analysis.embeddings import generate_embeddings
+
+
+def test_sqlite_cache_roundtrip_and_lru_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    # Touch "a" so that "b" becomes the least recently used entry
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "c"]) == {"a": b"1", "c": b"3"}
+    assert cache.get("a", max_age=-1) is None
+
+
+def test_embedding_cache_is_keyed_by_model_and_text(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(path, memory_size=0)
+    cache.set("text", [0.5, 0.25], "model-a")
+
+    assert np.array_equal(cache.get("text", "model-a"), [0.5, 0.25])
+    assert cache.get("text", "model-b") is None
+    # A new instance reads the same file
+    assert np.array_equal(EmbeddingCache(path).get("text", "model-a"), [0.5, 0.25])
+
+
+def test_generate_embeddings_uses_cache_and_dedupes(tmp_path, fake_embeddings):
+    endpoint = fake_embeddings()
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    cache.set("cached", [9.0], "test-model")
+    df = pd.DataFrame({'combined': ['new', 'cached', 'new']})
+
+    embeddings, valid_indices = generate_embeddings(
+        df, cache=cache, embedding_client=endpoint.client())
+
+    assert endpoint.requests == [['new']]
+    assert valid_indices == [0, 1, 2]
+    assert np.array_equal(embeddings, np.array([[3.0], [9.0], [3.0]]))
+    assert np.array_equal(cache.get("new", "test-model"), [3.0])
+
+
+def test_canonical_url_drops_tracking_and_fragment():
+    assert canonical_url("HTTPS://News.Example/a?utm_source=x&b=2&a=1#top") == \
+        "https://news.example/a?a=1&b=2"
+
+
+def test_article_cache_freshness_and_refresh(tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite"), ttl=60, failure_ttl=0)
+    article = cache.set("https://news.example/a?utm_medium=rss", "text", 200, etag='"v1"')
+
+    cached = cache.get("https://news.example/a")
+    assert cached.text == "text" and cache.is_fresh(cached)
+
+    cached.fetched_at -= 120
+    assert not cache.is_fresh(cached) and cache.can_revalidate(cached)
+    refreshed = cache.refresh(cached)
+    assert refreshed.etag == '"v1"' and cache.is_fresh(cache.get(article.url))
+
+    failed = cache.set("https://news.example/missing", None, 404)
+    assert not failed.accessible and not cache.can_revalidate(failed)
+
+
+def test_finish_article_fetch_serves_stale_copy_on_error(tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite"), ttl=0)
+    cached = cache.set("https://news.example/a", "good text", 200, etag='"v1"')
+    fetch_future = concurrent.futures.Future()
+    fetch_future.set_exception(httpx.ConnectTimeout("timed out"))
+
+    text = finish_article_fetch(
+        "https://news.example/a", cached, fetch_future, cache)
+
+    assert text == "good text"
+    assert cache.get("https://news.example/a").text == "good text"
+
+
+def test_sqlite_cache_purge_removes_expired_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    cache.set("a", b"1")
+
+    assert cache.purge(max_age=3600) == 0
+    assert cache.purge(max_age=-1) == 1
+    assert len(cache) == 0
+
+
+def test_summary_cache_is_keyed_by_url_objective_and_model(tmp_path):
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite"), failure_ttl=-1)
+    cache.set("https://news.example/a", "Events about  Brazil", "gpt-4o-mini", "summary")
+    cache.set("https://news.example/b", "Events about Brazil", "gpt-4o-mini", "INACCESSIBLE")
+
+    assert cache.get("https://news.example/a#top", "events about brazil", "gpt-4o-mini") == "summary"
+    assert cache.get("https://news.example/a", "events about brazil", "gpt-4o") is None
+    assert cache.get("https://news.example/a", "events about chile", "gpt-4o-mini") is None
+    # INACCESSIBLE verdicts expire after failure_ttl
+    assert cache.get("https://news.example/b", "Events about Brazil", "gpt-4o-mini") is None
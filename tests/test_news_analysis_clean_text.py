@@ -0,0 +1,49 @@
+import importlib.util
+import pathlib
+import pytest
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# clean_text is copied into each service; every copy must clean text the same way
+CLEAN_TEXT_MODULES = [
+    "em_news_analysis/em_news_analysis/article_summarizer.py",
+    "em_data_chat/em_data_chat/utils/article_summarizer.py",
+    "em_research_chat/em_research_chat/utils/article_summarizer.py",
+    "em_research_agentic/em_research_agentic/utils/article_summarizer.py",
+]
+
+ARTICLE = ("<p>Rates  rise\u200b at\nhttps://news.example/a?x=1 &amp; the "
+           "Cookie Policy applies. Mail press@news.example, café (GDP) 5.2%</p>")
+
+
+def load_clean_text(path: str):
+    if path.startswith("em_news_analysis/"):
+        from em_news_analysis.article_summarizer import clean_text
+        return clean_text
+    spec = importlib.util.spec_from_file_location(
+        "clean_text_" + path.split("/")[0], REPO_ROOT / path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.clean_text
+
+
+@pytest.fixture(params=CLEAN_TEXT_MODULES)
+def clean_text(request):
+    return load_clean_text(request.param)
+
+
+@pytest.mark.parametrize("level, expected", [
+    (1, "Rates rise at https://news.example/a?x=1 & the Cookie Policy applies. "
+        "Mail press@news.example, café (GDP) 5.2%"),
+    (2, "Rates rise at  & the  applies. Mail press@news.example, café (GDP) 5.2%"),
+    (3, "Rates rise at   the  applies. Mail  caf (GDP) 5.2"),
+])
+def test_clean_text_levels(clean_text, level, expected):
+    assert clean_text(ARTICLE, level=level) == expected
+
+
+def test_clean_text_truncates_to_max_words(clean_text):
+    text = "one  two\tthree\nfour five"
+
+    assert clean_text(text, max_words=3) == "one two three"
+    assert clean_text(text, max_words=5) == "one two three four five"
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from sklearn.cluster import HDBSCAN
+from sklearn.datasets import make_blobs
+from sklearn.decomposition import PCA
+from sklearn.model_selection import ParameterGrid
+from em_news_analysis.clustering import (
+    deduplicate_params, evaluate_params, optimize_clustering, reduce_embeddings, reduction_key,
+    evaluate_shared_tree, neighbor_distances, successive_halving_search)
+
+
+@pytest.fixture
+def blobs():
+    embeddings, _ = make_blobs(
+        n_samples=120, n_features=16, centers=4, random_state=0)
+    return embeddings, embeddings[0] + 0.1
+
+
+PARAM_GRID = {
+    'reduce_dimensionality': [True, False],
+    'reducer_algorithm': ['pca', 'none'],
+    'n_components': [2, 4],
+    'min_cluster_size': [3, 5],
+    'min_samples': [1, 2],
+    'cluster_selection_epsilon': [0.0],
+    'metric': ['euclidean'],
+}
+
+
+class CountingPCA(PCA):
+    fits = 0
+
+    def fit_transform(self, X, y=None):
+        CountingPCA.fits += 1
+        return super().fit_transform(X, y)
+
+
+def test_deduplicate_params_collapses_equivalent_reductions():
+    params = deduplicate_params(list(ParameterGrid(PARAM_GRID)))
+
+    # 2 PCA reductions plus no reduction, times 4 HDBSCAN settings
+    assert len(params) == 12
+    assert len({reduction_key(p) for p in params}) == 3
+
+
+def test_optimize_clustering_fits_each_reduction_once(blobs):
+    embeddings, input_embedding = blobs
+    CountingPCA.fits = 0
+
+    labels, params, scores, noise_count = optimize_clustering(
+        embeddings, PARAM_GRID, input_embedding,
+        reducer_algorithms={'pca': CountingPCA}, n_jobs=1)
+
+    assert CountingPCA.fits == 2
+    assert len(labels) == len(embeddings)
+    assert set(scores) == {'silhouette',
+                           'davies_bouldin', 'stability', 'relevance'}
+
+
+def test_optimize_clustering_matches_exhaustive_search(blobs):
+    embeddings, input_embedding = blobs
+    reducers = {'pca': PCA}
+
+    best = None
+    for candidate in ParameterGrid(PARAM_GRID):
+        reduced = reduce_embeddings(
+            embeddings, input_embedding, reduction_key(candidate), reducers)
+        result = evaluate_params(*reduced, candidate, HDBSCAN)
+        if best is None or result[0] > best[0]:
+            best = result
+
+    labels, params, scores, noise_count = optimize_clustering(
+        embeddings, PARAM_GRID, input_embedding, reducer_algorithms=reducers, n_jobs=1)
+
+    assert params == best[2]
+    np.testing.assert_array_equal(labels, best[1])
+    assert noise_count == best[4]
+
+
+def test_successive_halving_scores_few_candidates_on_all_rows(blobs):
+    embeddings, input_embedding = blobs
+    embeddings = np.repeat(embeddings, 5, axis=0)
+    evaluated = []
+
+    def evaluate(candidates, indices, deadline):
+        evaluated.append((len(candidates), None if indices is None else len(indices)))
+        return [(-i, np.zeros(len(embeddings)), params, {}, 0)
+                for i, params in enumerate(candidates)]
+
+    candidates = deduplicate_params(list(ParameterGrid(PARAM_GRID))) * 3
+    results = successive_halving_search(
+        candidates, evaluate, len(embeddings), factor=3, min_subsample=50)
+
+    assert evaluated == [(36, 66), (12, 200), (4, None)]
+    # The best candidates of each round survive, in order
+    assert [result[2] for result in results] == candidates[:4]
+
+
+def test_optimize_clustering_halving_returns_full_labels(blobs):
+    embeddings, input_embedding = blobs
+
+    labels, params, scores, noise_count = optimize_clustering(
+        embeddings, PARAM_GRID, input_embedding, reducer_algorithms={'pca': PCA},
+        n_jobs=1, search='halving', time_budget=60)
+
+    assert len(labels) == len(embeddings)
+    assert params in list(ParameterGrid(PARAM_GRID))
+
+
+def test_optimize_clustering_rejects_unknown_search(blobs):
+    embeddings, input_embedding = blobs
+    with pytest.raises(ValueError, match="Unsupported search strategy"):
+        optimize_clustering(embeddings, PARAM_GRID,
+                            input_embedding, search='random')
+
+
+def test_shared_tree_matches_hdbscan(blobs):
+    embeddings, input_embedding = blobs
+    params_list = [{'min_cluster_size': size, 'min_samples': 2, 'cluster_selection_epsilon': epsilon}
+                   for size in (3, 5, 8) for epsilon in (0.0, 0.5, 2.0)]
+
+    core_distances = neighbor_distances(embeddings, 3)[:, 1]
+    results = evaluate_shared_tree(
+        embeddings, input_embedding.reshape(1, -1), core_distances, params_list)
+
+    for params, result in zip(params_list, results):
+        expected = HDBSCAN(**params).fit_predict(embeddings)
+        np.testing.assert_array_equal(result[1], expected)
+        assert result[0] == pytest.approx(evaluate_params(
+            embeddings, input_embedding.reshape(1, -1), params, HDBSCAN)[0])
+
+
+def test_shared_tree_falls_back_when_sklearn_internals_change(blobs, monkeypatch):
+    embeddings, input_embedding = blobs
+    params_list = [{'min_cluster_size': size, 'min_samples': 2}
+                   for size in (3, 5)]
+
+    def changed_tree_to_labels(*args):
+        raise TypeError("tree_to_labels() takes 5 positional arguments but 6 were given")
+
+    monkeypatch.setattr(
+        'em_news_analysis.clustering.tree_to_labels', changed_tree_to_labels)
+    core_distances = neighbor_distances(embeddings, 3)[:, 1]
+    results = evaluate_shared_tree(
+        embeddings, input_embedding.reshape(1, -1), core_distances, params_list)
+
+    for params, result in zip(params_list, results):
+        np.testing.assert_array_equal(
+            result[1], HDBSCAN(**params).fit_predict(embeddings))
+        assert result[0] > -np.inf
@@ -0,0 +1,189 @@
+import os
+import re
+import pytest
+import pandas as pd
+import pyarrow as pa
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from em_news_analysis.config import DevelopmentConfig, ProductionConfig
+from em_news_analysis.data_fetcher import (
+    fetch_gdelt_data, fetch_gdelt_data_multi, iter_gdelt_data, read_parquet_cache, write_parquet_cache)
+
+
+def _gdelt_frame():
+    return pd.DataFrame({
+        'SOURCEURL': ['https://a.example/1', 'https://b.example/2'],
+        'EventCode': ['010', '010'],
+        'SQLDATE': pd.to_datetime(['20240901', '20240902'], format='%Y%m%d'),
+        'GoldsteinScale': [1.5, -2.0],
+        'GCAM': ['wc:100,c1.1:2', 'wc:200,c1.1:3'],
+    })
+
+
+def test_parquet_cache_roundtrip_with_projection(tmp_path):
+    path = str(tmp_path / "MX_3hours.parquet")
+    cache_time = datetime(2024, 9, 1, 12, 30)
+    write_parquet_cache(_gdelt_frame(), path, cache_time)
+
+    read_time, df = read_parquet_cache(
+        path, columns=['SOURCEURL', 'EventCode', 'SQLDATE', 'NotAColumn'])
+
+    assert read_time == cache_time
+    assert list(df.columns) == ['SOURCEURL', 'EventCode', 'SQLDATE']
+    assert isinstance(df['EventCode'].dtype, pd.CategoricalDtype)
+    assert df['SQLDATE'].tolist() == _gdelt_frame()['SQLDATE'].tolist()
+    assert [name for name in os.listdir(tmp_path)] == ["MX_3hours.parquet"]
+
+
+def _bigquery_type(arrow_type):
+    if pa.types.is_integer(arrow_type):
+        return "INTEGER"
+    if pa.types.is_floating(arrow_type):
+        return "FLOAT"
+    return "STRING"
+
+
+class FakeBigQuery:
+    """
+    Stand-in BigQuery client that serves rows from a fixed DataFrame, filtered by the query's DATEADDED range,
+    as Arrow record batches of at most batch_rows rows.
+    """
+
+    def __init__(self, rows, batch_rows=2):
+        self.rows = rows
+        self.batch_rows = batch_rows
+        self.ranges = []
+
+    def query(self, query, job_config=None):
+        start = int(re.search(r"DATEADDED >= (\d+)", query).group(1))
+        end = re.search(r"DATEADDED < (\d+)", query)
+        end = int(end.group(1)) if end else None
+        self.ranges.append((start, end))
+        mask = self.rows['DATEADDED'] >= start
+        if end is not None:
+            mask &= self.rows['DATEADDED'] < end
+        table = pa.Table.from_pandas(self.rows[mask], preserve_index=False)
+        result = Mock(
+            to_arrow_iterable=Mock(return_value=iter(
+                table.to_batches(max_chunksize=self.batch_rows))),
+            schema=[SimpleNamespace(name=field.name, field_type=_bigquery_type(field.type))
+                    for field in table.schema])
+        return Mock(result=Mock(return_value=result))
+
+
+def _raw_rows(now):
+    added = [now - timedelta(hours=h, minutes=5) for h in (0, 1, 2, 4, 5)]
+    return pd.DataFrame({
+        'DATEADDED': [int(t.strftime('%Y%m%d%H%M%S')) for t in added],
+        'SQLDATE': [int(t.strftime('%Y%m%d')) for t in added],
+        'GKG_DATE': [int(t.strftime('%Y%m%d%H%M%S')) for t in added],
+        'SOURCEURL': ['u0', 'u1', 'u2', 'u4', 'u0'],
+        'EventCode': ['010'] * 5,
+        'Actor1Geo_CountryCode': ['MX'] * 5,
+        'Actor2Geo_CountryCode': [None] * 5,
+        'ActionGeo_CountryCode': ['MX'] * 5,
+    })
+
+
+def test_fetch_gdelt_data_only_queries_missing_hourly_buckets(tmp_path):
+    config = DevelopmentConfig(gdelt_cache_dir=str(tmp_path))
+    now = datetime(2024, 9, 1, 12, 30)
+    client = FakeBigQuery(_raw_rows(now))
+
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now):
+        three_hours = fetch_gdelt_data(client, "MX", 3, config)
+    assert client.ranges == [(20240901090000, None)]
+    assert sorted(three_hours['SOURCEURL']) == ['u0', 'u1', 'u2']
+
+    # Twenty minutes later the complete hours are served from the cache and only the
+    # still-open hour is refetched; the earlier hours are fetched as one range
+    later = now + timedelta(minutes=20)
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=later):
+        six_hours = fetch_gdelt_data(
+            client, "MX", 6, config, columns=['SOURCEURL', 'EventCode'])
+    assert client.ranges[1:] == [(20240901060000, 20240901090000),
+                                 (20240901120000, None)]
+    assert list(six_hours.columns) == ['SOURCEURL', 'EventCode']
+    # u0 appears twice; the earliest row is kept
+    assert sorted(six_hours['SOURCEURL']) == ['u0', 'u1', 'u2', 'u4']
+    assert len(six_hours) == 4
+
+
+def test_fetch_gdelt_data_without_cache_queries_exact_window(tmp_path):
+    config = ProductionConfig(gdelt_cache_dir=str(tmp_path))
+    now = datetime(2024, 9, 1, 12, 30)
+    client = FakeBigQuery(_raw_rows(now))
+
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now):
+        df = fetch_gdelt_data(client, "MX", 3, config)
+
+    assert client.ranges == [(20240901093000, None)]
+    assert sorted(df['SOURCEURL']) == ['u0', 'u1', 'u2']
+    assert os.listdir(tmp_path) == []
+
+
+def test_fetch_gdelt_data_wraps_query_errors(tmp_path):
+    config = DevelopmentConfig(gdelt_cache_dir=str(tmp_path))
+    client = Mock()
+    client.query.side_effect = RuntimeError("BigQuery unavailable")
+
+    with pytest.raises(ValueError, match="BigQuery unavailable"):
+        fetch_gdelt_data(client, "MX", 3, config)
+
+
+def test_fetch_gdelt_data_multi_shares_queries_across_countries(tmp_path):
+    config = DevelopmentConfig(gdelt_cache_dir=str(tmp_path))
+    now = datetime(2024, 9, 1, 12, 30)
+    rows = _raw_rows(now)
+    # u1 involves both countries, u2 only Brazil
+    rows['Actor2Geo_CountryCode'] = [None, 'BR', None, None, None]
+    rows.loc[2, ['Actor1Geo_CountryCode', 'ActionGeo_CountryCode']] = 'BR'
+    client = FakeBigQuery(rows)
+
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now):
+        data = fetch_gdelt_data_multi(client, ["MX", "BR"], 3, config)
+    assert client.ranges == [(20240901090000, None)]
+    assert sorted(data['MX']['SOURCEURL']) == ['u0', 'u1']
+    assert sorted(data['BR']['SOURCEURL']) == ['u1', 'u2']
+
+    # Each country's buckets are cached, so a single-country fetch only refreshes the open hour
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now + timedelta(minutes=20)):
+        brazil = fetch_gdelt_data(client, "BR", 3, config)
+    assert client.ranges[1:] == [(20240901120000, None)]
+    assert sorted(brazil['SOURCEURL']) == ['u1', 'u2']
+
+
+def test_iter_gdelt_data_streams_batches_without_duplicate_urls(tmp_path):
+    config = ProductionConfig(gdelt_cache_dir=str(tmp_path))
+    now = datetime(2024, 9, 1, 12, 30)
+    rows = _raw_rows(now)
+    # Return the rows newest first so the repeated u0 arrives in a later batch
+    client = FakeBigQuery(rows.iloc[::-1].reset_index(drop=True), batch_rows=2)
+
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now):
+        batches = list(iter_gdelt_data(
+            client, "MX", 6, config, columns=['SOURCEURL', 'DATEADDED']))
+
+    assert [batch['SOURCEURL'].tolist() for batch in batches] == [
+        ['u0', 'u4'], ['u2', 'u1'], []]
+    assert list(batches[0].columns) == ['SOURCEURL', 'DATEADDED']
+    assert pd.api.types.is_datetime64_any_dtype(batches[0]['DATEADDED'])
+
+
+@pytest.mark.parametrize("config_class", [ProductionConfig, DevelopmentConfig])
+def test_fetch_gdelt_data_handles_empty_result(tmp_path, config_class):
+    config = config_class(gdelt_cache_dir=str(tmp_path))
+    now = datetime(2024, 9, 1, 12, 30)
+    client = FakeBigQuery(_raw_rows(now).iloc[:0])
+
+    with patch('em_news_analysis.data_fetcher.utc_now', return_value=now):
+        df = fetch_gdelt_data(client, "MX", 3, config)
+        # Empty hours are cached, so a second call does not query again
+        fetch_gdelt_data(client, "MX", 3, config)
+
+    assert df.empty
+    assert 'SOURCEURL' in df.columns
+    assert pd.api.types.is_datetime64_any_dtype(df['SQLDATE'])
+    if config.use_cache:
+        assert len(client.ranges) == 1
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from em_news_analysis.embedding_store import EmbeddingStore
+
+
+def test_embedding_store_add_and_view(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    embeddings = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+    rows = store.add(["a", "b", "c"], embeddings)
+    view = store.view(rows)
+
+    assert list(rows) == [0, 1, 2]
+    assert view.dtype == np.float32
+    assert isinstance(view, np.memmap)
+    assert np.array_equal(view, embeddings)
+    assert np.array_equal(store.get(["c", "a"]), embeddings[[2, 0]])
+
+
+def test_embedding_store_appends_only_new_or_changed_rows(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.add(["a", "b"], np.array([[1.0, 1.0], [2.0, 2.0]]))
+
+    rows = store.add(["b", "a", "d"], np.array(
+        [[2.0, 2.0], [5.0, 5.0], [3.0, 3.0]]))
+
+    assert list(rows) == [1, 2, 3]
+    assert len(store) == 4
+    assert np.array_equal(store.get(["a"]), [[5.0, 5.0]])
+
+
+def test_embedding_store_is_shared_between_instances(tmp_path):
+    writer = EmbeddingStore(str(tmp_path))
+    reader = EmbeddingStore(str(tmp_path))
+    writer.add(["a"], np.array([[1.0, 2.0]]))
+
+    assert list(reader.rows(["a", "missing"])) == [0, -1]
+    assert np.array_equal(reader.get(["a"]), [[1.0, 2.0]])
+    with pytest.raises(ValueError, match="dimension"):
+        reader.add(["b"], np.array([[1.0, 2.0, 3.0]]))
+
+
+def test_embedding_store_drops_partial_writes(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.add(["a"], np.array([[1.0, 2.0]]))
+    # A writer that crashed mid-append left half a vector and half a key behind
+    with open(tmp_path / EmbeddingStore.VECTORS_FILE, 'ab') as f:
+        f.write(np.float32(9.0).tobytes())
+    with open(tmp_path / EmbeddingStore.KEYS_FILE, 'ab') as f:
+        f.write(b'"x')
+
+    reopened = EmbeddingStore(str(tmp_path))
+    rows = reopened.add(["b", "c"], np.array([[3.0, 4.0], [5.0, 6.0]]))
+
+    assert list(rows) == [1, 2]
+    assert np.array_equal(reopened.get(["a", "b", "c"]), [
+                          [1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    assert (tmp_path / EmbeddingStore.VECTORS_FILE).stat().st_size == 3 * 2 * 4
+
+
+def test_embedding_store_compacts_above_max_rows(tmp_path):
+    store = EmbeddingStore(str(tmp_path), max_rows=5)
+    reader = EmbeddingStore(str(tmp_path))
+    store.add(["a", "b", "c", "d"], np.array(
+        [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0], [4.0, 4.0]]))
+    before = store.get(["a"])
+
+    # Six rows exceed the bound: the old row of b goes, and only the newest other key (d) is kept
+    embeddings = store.add_and_view(
+        ["b", "e"], np.array([[5.0, 5.0], [6.0, 6.0]]))
+
+    assert np.array_equal(embeddings, [[5.0, 5.0], [6.0, 6.0]])
+    assert len(store) == 3
+    assert np.array_equal(before, [[1.0, 1.0]])
+    assert list(reader.rows(["a", "b", "c", "d", "e"])) == [-1, 1, -1, 0, 2]
+    assert np.array_equal(reader.get(["d", "b"]), [[4.0, 4.0], [5.0, 5.0]])
+    assert not (tmp_path / EmbeddingStore.VECTORS_FILE).exists()
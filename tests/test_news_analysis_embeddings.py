@@ -2,7 +2,8 @@ import pytest
 import numpy as np
 import pandas as pd
 from unittest.mock import Mock, patch
-from em_news_analysis.embeddings import get_embedding, generate_embeddings
+from em_news_analysis.embeddings import get_embedding, generate_embeddings, get_embedding_client, make_batches, TokenBucket
+from em_news_analysis.async_runtime import run_async
 
 
 @pytest.fixture
@@ -58,3 +59,70 @@ def test_generate_embeddings_with_error():
 
     assert np.array_equal(embeddings, np.array([[1, 2, 3], [1, 2, 3]]))
     assert valid_indices == [0, 2]
+
+
+
+def test_make_batches_respects_size_and_tokens():
+    items = [(i, "x" * 40) for i in range(10)]
+
+    assert [len(b) for b in make_batches(items, batch_size=4)] == [4, 4, 2]
+    # Each text is ~11 estimated tokens, so only two fit under a 25 token budget
+    assert [len(b) for b in make_batches(
+        items, batch_size=100, max_batch_tokens=25)] == [2] * 5
+
+
+def test_generate_embeddings_batched(fake_embeddings):
+    endpoint = fake_embeddings()
+    df = pd.DataFrame({'combined': ['a', 'bb', '', 'dddd', 'eeeee']})
+
+    embeddings, valid_indices = generate_embeddings(
+        df, batch_size=2, embedding_client=endpoint.client())
+
+    assert valid_indices == [0, 1, 3, 4]
+    assert np.array_equal(embeddings, np.array([[1], [2], [4], [5]]))
+    assert endpoint.requests == [['a', 'bb'], ['dddd', 'eeeee']]
+
+
+def test_generate_embeddings_batched_isolates_bad_items(fake_embeddings):
+    endpoint = fake_embeddings(bad_texts=['bad'])
+    df = pd.DataFrame({'combined': ['a', 'bad', 'ccc', 'dddd']})
+
+    embeddings, valid_indices = generate_embeddings(
+        df, embedding_client=endpoint.client())
+
+    assert valid_indices == [0, 2, 3]
+    assert np.array_equal(embeddings, np.array([[1], [3], [4]]))
+
+
+def test_async_embedding_client_adapts_to_throttling(fake_embeddings):
+    endpoint = fake_embeddings(throttle=2)
+    client = endpoint.client(max_concurrency=4)
+    progress = []
+
+    result = run_async(client.embed(
+        [[(0, 'a')], [(1, 'bb')], [(2, 'ccc')]],
+        progress=lambda done, total, count: progress.append((done, total))))
+
+    assert sorted(result) == [(0, [1.0]), (1, [2.0]), (2, [3.0])]
+    assert client.throttled == 2
+    assert client.limiter.limit < 4
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+
+    async def take_two():
+        await bucket.acquire()
+        return await bucket.acquire()
+
+    # 600 per minute refills one token every 0.1s
+    assert run_async(take_two()) >= 0.05
+
+
+def test_get_embedding_client_is_shared_per_model():
+    client = get_embedding_client("shared-model", requests_per_minute=10)
+
+    assert get_embedding_client("shared-model", requests_per_minute=999) is client
+    assert client.request_bucket.rate == 10 / 60.0
+    assert get_embedding_client("other-model") is not client
@@ -0,0 +1,59 @@
+import threading
+import pytest
+from em_news_analysis.jobs import JobManager, JOB_QUEUED, JOB_SUCCEEDED, JOB_FAILED
+
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def work(progress):
+        progress("summarizing", 1, 3)
+        release.wait(5)
+        progress("summarizing", 3, 3)
+        return {"no_clusters": 3}
+
+    job = manager.submit(work, params={"country": "Brazil"})
+    blocked = manager.submit(lambda progress: None)
+
+    assert manager.get(blocked.id)["status"] == JOB_QUEUED
+    release.set()
+    manager.future(job.id).result(5)
+    manager.future(blocked.id).result(5)
+
+    snapshot = manager.get(job.id)
+    assert snapshot["status"] == JOB_SUCCEEDED
+    assert snapshot["params"] == {"country": "Brazil"}
+    assert snapshot["stage"] == "summarizing"
+    assert snapshot["progress"] == {"summarizing": {"done": 3, "total": 3}}
+    assert snapshot["result"] == {"no_clusters": 3}
+    assert snapshot["finished_at"] >= snapshot["started_at"]
+
+
+def test_failed_job_keeps_error():
+    manager = JobManager(max_workers=1)
+
+    def work(progress):
+        raise RuntimeError("BigQuery unavailable")
+
+    job = manager.submit(work)
+    with pytest.raises(RuntimeError):
+        manager.future(job.id).result(5)
+
+    snapshot = manager.get(job.id)
+    assert snapshot["status"] == JOB_FAILED
+    assert snapshot["error"] == "BigQuery unavailable"
+
+
+def test_finished_jobs_expire():
+    manager = JobManager(max_workers=1, max_finished_jobs=2)
+    release = threading.Event()
+    jobs = [manager.submit(lambda progress, i=i: release.wait(5) and i)
+            for i in range(3)]
+    futures = [manager.future(job.id) for job in jobs]
+    release.set()
+    for future in futures:
+        future.result(5)
+
+    assert manager.get(jobs[0].id) is None
+    assert [job["result"] for job in manager.list_jobs()] == [1, 2]
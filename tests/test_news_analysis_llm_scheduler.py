@@ -0,0 +1,65 @@
+import threading
+import time
+from em_news_analysis.llm_scheduler import LLMScheduler
+
+
+def test_scheduler_caps_lanes_and_total():
+    scheduler = LLMScheduler(max_in_flight=3, lane_limits={"article": 2, "cluster": 2})
+    peak = {"article": 0, "cluster": 0, "total": 0}
+    in_flight = {"article": 0, "cluster": 0, "total": 0}
+    lock = threading.Lock()
+
+    def call(lane):
+        with scheduler.slot(lane):
+            with lock:
+                for key in (lane, "total"):
+                    in_flight[key] += 1
+                    peak[key] = max(peak[key], in_flight[key])
+            time.sleep(0.01)
+            with lock:
+                in_flight[lane] -= 1
+                in_flight["total"] -= 1
+
+    threads = [threading.Thread(target=call, args=(lane,))
+               for lane in ("article", "cluster") for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak["article"] <= 2 and peak["cluster"] <= 2 and peak["total"] <= 3
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["article"]["completed"] == 6
+    assert stats["lanes"]["article"]["queued"] == 0
+
+
+def test_scheduler_runs_waiting_calls_in_priority_order():
+    scheduler = LLMScheduler(max_in_flight=1, lane_limits={})
+    order = []
+    release = threading.Event()
+
+    def blocker():
+        with scheduler.slot("article"):
+            release.wait()
+
+    def call(priority):
+        with scheduler.slot("article", priority):
+            order.append(priority)
+
+    first = threading.Thread(target=blocker)
+    first.start()
+    while scheduler.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+    threads = []
+    for priority in (3, 1, 2):
+        thread = threading.Thread(target=call, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        while scheduler.stats()["lanes"]["article"]["queued"] < len(threads):
+            time.sleep(0.001)
+    release.set()
+    for thread in [first] + threads:
+        thread.join()
+
+    assert order == [1, 2, 3]
@@ -0,0 +1,34 @@
+import numpy as np
+from em_news_analysis.matching import match_clusters
+
+
+def unit(x: float, y: float):
+    return [x, y] / np.hypot(x, y)
+
+
+def test_match_clusters_breaks_ties_by_label_order():
+    # 2 and 9 mirror each other around the input, so their relevance and diversity tie exactly
+    embeddings = np.array([unit(1.0, 0.0), unit(0.8, 0.6), unit(0.8, -0.6),
+                           unit(0.2, 0.98), unit(1.0, 0.0)])
+    clusters = np.array([5, 9, 2, 7, -1])
+
+    # Noise and cluster 7 (similarity 0.2, below the threshold) are never matched
+    assert match_clusters([1.0, 0.0], embeddings, clusters) == [5, 2, 9]
+
+
+def test_match_clusters_trades_relevance_for_diversity():
+    embeddings = np.array([
+        unit(1.0, 0.0), unit(1.0, 0.0),     # 5: relevance 1.0
+        unit(0.9, 0.4359),                  # 1: relevance 0.9, close to 5
+        unit(0.8, 0.6),                     # 2: relevance 0.8, same side as 1
+        unit(0.8, -0.6),                    # 9: relevance 0.8, other side
+        unit(0.6, 0.8),                     # 4: relevance 0.6
+    ])
+    clusters = np.array([5, 5, 1, 2, 9, 4])
+
+    # Hand-computed with diversity_weight 0.3, as 0.3 * (1 - mean similarity to selected) + 0.7 * relevance:
+    # step 1: 1 -> 0.66, 2 and 9 -> 0.62, 4 -> 0.54
+    # step 2: 9 -> 0.671 beats 2 -> 0.593, which is close to both 5 and 1
+    # step 3: 2 -> 0.654, 4 -> 0.571
+    assert match_clusters([1.0, 0.0], embeddings, clusters) == [5, 1, 9, 2, 4]
+    assert match_clusters([1.0, 0.0], embeddings, clusters, top_n=3) == [5, 1, 9]
@@ -0,0 +1,199 @@
+import logging
+import pytest
+import numpy as np
+import pandas as pd
+from types import SimpleNamespace
+from unittest.mock import patch
+from bson import ObjectId
+from em_news_analysis.config import ProductionConfig
+from em_news_analysis.models import ClusterArticleSummaries, ClusterSummary, Metadata
+from em_news_analysis.pipeline import GDELTNewsPipeline, RUN_RUNNING, RUN_COMPLETE, RUN_FAILED
+
+
+def make_pipeline(**attributes) -> GDELTNewsPipeline:
+    """
+    A pipeline without the BigQuery, MongoDB and cache setup of __init__.
+    """
+    pipeline = GDELTNewsPipeline.__new__(GDELTNewsPipeline)
+    pipeline.config = ProductionConfig()
+    pipeline.bigquery_client = None
+    pipeline.embedding_cache = None
+    pipeline.logger = logging.getLogger(__name__)
+    for name, value in attributes.items():
+        setattr(pipeline, name, value)
+    return pipeline
+
+
+def test_run_pipeline_batch_isolates_country_failures(fake_embeddings):
+    endpoint = fake_embeddings()
+    pipeline = make_pipeline(embedding_client=endpoint.client())
+    raw_data = {
+        "MX": pd.DataFrame({'combined': ['a', 'bb']}),
+        "BR": pd.DataFrame({'combined': ['ccc']}),
+        "AR": pd.DataFrame({'combined': ['dddd']}),
+    }
+
+    def run_pipeline(country, raw_data, input_sentence, **kwargs):
+        if country == "AR":
+            raise ValueError("Pipeline execution failed")
+        embeddings, _ = pipeline.generate_embeddings(raw_data, max_workers=1)
+        return {"country": country, "input_sentence": input_sentence,
+                "embeddings": embeddings[:, 0].tolist()}
+
+    pipeline.run_pipeline = run_pipeline
+    with patch('em_news_analysis.pipeline.fetch_gdelt_data_multi', return_value=raw_data) as fetch:
+        results = pipeline.run_pipeline_batch(
+            {country: {"input_sentence": f"Events in {country}"} for country in raw_data},
+            hours=3)
+
+    fetch.assert_called_once()
+    assert fetch.call_args.kwargs["countries"] == ["MX", "BR", "AR"]
+    assert results["MX"] == {"country": "MX", "input_sentence": "Events in MX", "embeddings": [1.0, 2.0]}
+    assert results["BR"] == {"country": "BR", "input_sentence": "Events in BR", "embeddings": [3.0]}
+    assert isinstance(results["AR"], ValueError)
+    # Both countries' requests went through the pipeline's one embedding client
+    assert sorted(map(tuple, endpoint.requests)) == [('a', 'bb'), ('ccc',)]
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for a pymongo collection, supporting insert_one and $set with dotted paths.
+    """
+
+    def __init__(self, fail_updates=False):
+        self.documents = {}
+        self.fail_updates = fail_updates
+
+    def insert_one(self, document):
+        document = dict(document, _id=ObjectId())
+        self.documents[document['_id']] = document
+        return SimpleNamespace(inserted_id=document['_id'])
+
+    def update_one(self, query, update):
+        if self.fail_updates:
+            raise ConnectionError("MongoDB unavailable")
+        document = self.documents[query['_id']]
+        for path, value in update['$set'].items():
+            *parents, key = path.split('.')
+            target = document
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[key] = value
+
+
+def make_summaries() -> ClusterArticleSummaries:
+    metadata = Metadata(
+        input_sentence="Economy", country="MX", country_name="Mexico", hours=3,
+        cluster_summarizer_objective="", no_clusters=2, no_matched_clusters=2, no_articles=10)
+    return ClusterArticleSummaries(metadata=metadata)
+
+
+def make_cluster(score: int) -> ClusterSummary:
+    return ClusterSummary(
+        event_title="Rate decision", event_relevance_rationale="", event_relevance_score=score,
+        event_summary="Rates rise", article_summaries=["summary"], article_urls=["https://news.example/a"])
+
+
+def test_streamed_run_sets_clusters_status_and_heartbeat():
+    collection = FakeCollection()
+    pipeline = make_pipeline(mongo_db={'news_summaries': collection})
+    summaries = make_summaries()
+
+    run_id = pipeline.start_run_mongo(summaries, "Economy", "MX", 3, "user-1")
+    document = collection.documents[run_id]
+    assert document['status'] == RUN_RUNNING and document['summaries']['clusters'] == {}
+    started_at = document['updated_at']
+
+    cluster = make_cluster(score=4)
+    summaries.add_cluster_summary(7, cluster)
+    pipeline.export_cluster_mongo(run_id, 7, cluster, summaries.metadata)
+    assert document['status'] == RUN_RUNNING
+    assert document['summaries']['clusters']['7'] == cluster.model_dump()
+    assert document['summaries']['metadata']['no_financially_relevant_events'] == 1
+    assert document['updated_at'] >= started_at
+
+    pipeline.finish_run_mongo(run_id, summaries, RUN_COMPLETE)
+    assert document['status'] == RUN_COMPLETE
+    assert document['summaries'] == summaries.model_dump()
+
+
+def test_failed_run_keeps_partial_clusters():
+    collection = FakeCollection()
+    pipeline = make_pipeline(mongo_db={'news_summaries': collection})
+    summaries = make_summaries()
+    run_id = pipeline.start_run_mongo(summaries, "Economy", "MX", 3, "user-1")
+    summaries.add_cluster_summary(1, make_cluster(score=1))
+
+    pipeline.finish_run_mongo(run_id, summaries, RUN_FAILED)
+
+    document = collection.documents[run_id]
+    assert document['status'] == RUN_FAILED
+    assert list(document['summaries']['clusters']) == ['1']
+
+
+def test_stream_write_errors_only_fail_the_final_write():
+    collection = FakeCollection()
+    pipeline = make_pipeline(mongo_db={'news_summaries': collection})
+    summaries = make_summaries()
+    run_id = pipeline.start_run_mongo(summaries, "Economy", "MX", 3, "user-1")
+    collection.fail_updates = True
+
+    # A lost cluster update is repaired by the final write, and a failed status is best effort
+    pipeline.export_cluster_mongo(run_id, 1, make_cluster(score=3), summaries.metadata)
+    pipeline.finish_run_mongo(run_id, summaries, RUN_FAILED)
+    with pytest.raises(ConnectionError):
+        pipeline.finish_run_mongo(run_id, summaries, RUN_COMPLETE)
+
+
+def test_sampled_and_read_flags_match_per_cluster_isin():
+    clusters = np.array([7, -1, 3, 7, 12, 3, -1, 7, 12, 3])
+    data = pd.DataFrame({
+        'SOURCEURL': [f"https://news.example/{i}" for i in range(len(clusters))],
+        'SQLDATE': pd.Timestamp("2024-01-01"), 'AvgTone': 0.0, 'NumMentions': 1, 'GoldsteinScale': 0.0,
+    })
+    matched = [7, 3, 12]
+    # The first two URLs of each cluster are sampled, and the second of them is not relevant
+    sampled_urls = {}
+
+    def sample_articles(urls, **kwargs):
+        sampled_urls[urls[0]] = urls[:2]
+        return urls[:2]
+
+    def generate_summaries(urls, objective, **kwargs):
+        return ["Summary", "NOT_RELEVANT"][:len(urls)]
+
+    exported = {}
+
+    def export_data_local(df, summaries, *args):
+        exported['df'] = df.copy()
+        return "data.csv", "summaries.json"
+
+    pipeline = make_pipeline(
+        article_fetcher=None, article_cache=None, summary_cache=None, embedding_store=None,
+        get_embedding=lambda sentence: [1.0, 0.0],
+        sample_data=lambda df, process_all, sample_size: df,
+        generate_embeddings=lambda df, max_workers: (
+            np.ones((len(df), 2), dtype=np.float32), list(df.index)),
+        export_data_local=export_data_local)
+    event = SimpleNamespace(title="Event", relevance_rationale="", relevance_score=3, summary="Summary")
+    with patch('em_news_analysis.pipeline.preprocess_data_summary', side_effect=lambda df: df), \
+            patch('em_news_analysis.pipeline.optimize_clustering', return_value=(clusters, {}, {}, 2)), \
+            patch('em_news_analysis.pipeline.match_clusters', return_value=matched), \
+            patch('em_news_analysis.pipeline.sample_articles', side_effect=sample_articles), \
+            patch('em_news_analysis.pipeline.generate_summaries', side_effect=generate_summaries), \
+            patch('em_news_analysis.pipeline.generate_cluster_summary', return_value=event):
+        pipeline.run_pipeline("Economy", "MX", 3, "", "", raw_data=data,
+                              max_workers_summaries=3, export_to_local=True)
+
+    # Flags as the per-cluster DataFrame filter and isin used to set them
+    expected = data.assign(cluster=clusters, sampled=False, read=False)
+    for cluster in matched:
+        cluster_data = expected[expected['cluster'] == cluster]
+        chosen = sampled_urls[cluster_data['SOURCEURL'].iloc[0]]
+        expected.loc[cluster_data.index, 'sampled'] = cluster_data['SOURCEURL'].isin(chosen)
+        expected.loc[cluster_data.index, 'read'] = cluster_data['SOURCEURL'].isin(chosen[:1])
+
+    df = exported['df']
+    assert df['sampled'].tolist() == expected['sampled'].tolist()
+    assert df['read'].tolist() == expected['read'].tolist()
+    assert df['sampled'].sum() == 6 and df['read'].sum() == 3
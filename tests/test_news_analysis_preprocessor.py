@@ -1,6 +1,6 @@
 import pytest
 import pandas as pd
-from em_news_analysis.preprocessor import preprocess, preprocess_data_summary
+from em_news_analysis.preprocessor import preprocess, preprocess_data_summary, safe_get
 
 
 def test_preprocess():
@@ -68,3 +68,35 @@ def test_preprocess_data_summary_with_empty_values():
 
     assert result['combined'][0] == "Persons: . Organizations: United_Nations. Locations: . Themes: ECON_BANKRUPTCY"
     assert result['combined'][1] == "Persons: John_Doe. Organizations: . Locations: . Themes: "
+
+
+def test_preprocess_data_summary_matches_rowwise_formatting():
+    df = pd.DataFrame({
+        'V2Persons': ['John Doe,12;Jane Smith,40;John Doe,77', None, '', 5],
+        'V2Organizations': ['United Nations,3', 'NASA,1;;WHO,2', None, ''],
+        'V2Locations': ['1#Paris#Paris, France#FR', '4#Tokyo', None, ''],
+        'V2Themes': ['A,1;B,2;C,3;D,4;E,5', 'ECON_BANKRUPTCY', None, ''],
+        'SQLDATE': pd.to_datetime(['20240901', '20240902', None, '20240903'], format='%Y%m%d'),
+        'EventCode': ['010'] * 4, 'AvgTone': [1.0] * 4, 'GoldsteinScale': [1.0] * 4,
+        'QuadClass': [1] * 4, 'Actor1Name': ['A'] * 4, 'Actor2Name': ['B'] * 4,
+        'NumMentions': [1] * 4, 'NumSources': [1] * 4, 'NumArticles': [1] * 4,
+    }, index=[7, 3, 5, 1])
+
+    expected = [
+        f"On {safe_get(row, 'SQLDATE', 'an unknown date')}, an event occurred with the following details. "
+        f"Involved persons: {preprocess(row['V2Persons'], 'person') or 'None mentioned'}. "
+        f"Involved organizations: {preprocess(row['V2Organizations'], 'organization') or 'None mentioned'}. "
+        f"Locations: {preprocess(row['V2Locations'], 'location') or 'None mentioned'}. "
+        f"Themes associated: {preprocess(row['V2Themes'], 'theme', max_entities=4) or 'None mentioned'}."
+        for _, row in df.iterrows()
+    ]
+
+    result = preprocess_data_summary(df.copy())
+
+    assert list(result.index) == [7, 3, 5, 1]
+    assert result['combined'].tolist() == expected
+    assert expected[0] == (
+        "On 2024-09-01 00:00:00, an event occurred with the following details. "
+        "Involved persons: John_Doe, Jane_Smith. Involved organizations: United_Nations. "
+        "Locations: Paris, France. Themes associated: A, B, C, D.")
+    assert expected[2].startswith("On an unknown date,")
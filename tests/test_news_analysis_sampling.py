@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from em_news_analysis.sampling import cluster_rows, sample_articles
+
+
+def test_cluster_rows_with_unsorted_non_contiguous_labels():
+    clusters = np.array([7, -1, 3, 7, 12, 3, -1, 7])
+
+    rows = cluster_rows(clusters)
+
+    assert list(rows) == [-1, 3, 7, 12]
+    assert rows[-1].tolist() == [1, 6]
+    assert rows[3].tolist() == [2, 5]
+    assert rows[7].tolist() == [0, 3, 7]
+    assert rows[12].tolist() == [4]
+    # Same rows as a boolean mask per label
+    for label, positions in rows.items():
+        np.testing.assert_array_equal(
+            positions, np.flatnonzero(clusters == label))
+
+
+def test_cluster_rows_empty():
+    assert cluster_rows(np.array([], dtype=int)) == {}
+
+
+def test_sample_articles_selection_order_and_ties():
+    embeddings = np.array(
+        [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.6, 0.8], [0.6, 0.8]])
+    urls = ["a", "b", "c", "d", "d"]
+    metadata = pd.DataFrame({'SOURCEURL': urls, 'NumMentions': [10, 10, 30, 20, 20],
+                             'GoldsteinScale': 0.0, 'AvgTone': 0.0})
+
+    # With lambda_param 0.5, relevance (0.43, 0.43, 0, 1, 1) and quality (0, 0, 1, 0.5, 0.5) give
+    # combined scores (0.21, 0.21, 0.5, 0.75, 0.75), less 0.5 * the max similarity to the selection:
+    # step 1: the two "d" rows tie, the later one is picked and the other drops out with its URL
+    # step 2: c (0.5 - 0.4 = 0.1) beats a and b (0.21 - 0.3)
+    # step 3: a and b tie exactly, and the later one (b) is picked
+    sampled = sample_articles(urls, embeddings, metadata,
+                              max_articles=5, lambda_param=0.5)
+
+    assert sampled == ["d", "c", "b", "a"]
+    assert sample_articles(urls, embeddings, metadata,
+                           max_articles=2, lambda_param=0.5) == ["d", "c"]
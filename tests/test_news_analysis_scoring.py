@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_blobs
+from sklearn.metrics import davies_bouldin_score, pairwise_distances, silhouette_score
+from em_news_analysis.scoring import (
+    cluster_centroids, davies_bouldin, score_clustering, stratified_subsample, subsample_silhouette)
+
+
+@pytest.fixture
+def clustered():
+    embeddings, labels = make_blobs(
+        n_samples=[300, 60, 6], n_features=8, random_state=1)
+    return embeddings, labels
+
+
+def test_cluster_centroids_and_davies_bouldin_match_reference(clustered):
+    embeddings, labels = clustered
+
+    centroids, cluster_index, sizes = cluster_centroids(embeddings, labels)
+
+    for label in range(3):
+        np.testing.assert_allclose(
+            centroids[label], embeddings[labels == label].mean(axis=0))
+    assert sizes.tolist() == [300, 60, 6]
+    assert davies_bouldin(embeddings, centroids, cluster_index, sizes) == pytest.approx(
+        davies_bouldin_score(embeddings, labels))
+
+
+def test_stratified_subsample_keeps_every_cluster(clustered):
+    _, labels = clustered
+
+    sample = stratified_subsample(labels, 50)
+
+    assert np.all(np.diff(sample) > 0)
+    assert np.bincount(labels[sample]).tolist() == [41, 8, 2]
+    np.testing.assert_array_equal(
+        stratified_subsample(labels, 1000), np.arange(len(labels)))
+
+
+def test_subsample_silhouette_uses_precomputed_distances(clustered):
+    embeddings, labels = clustered
+    distances = pairwise_distances(embeddings)
+    positions = np.arange(len(labels))
+
+    full = subsample_silhouette(embeddings, labels, sample_size=1000)
+    precomputed = subsample_silhouette(
+        embeddings, labels, sample_size=1000, distances=distances, positions=positions)
+
+    assert full == pytest.approx(silhouette_score(embeddings, labels))
+    assert precomputed == pytest.approx(full)
+    assert subsample_silhouette(embeddings, labels, sample_size=100) == pytest.approx(
+        full, abs=0.05)
+
+
+def test_score_clustering_ignores_noise(clustered):
+    embeddings, labels = clustered
+    labels = labels.copy()
+    labels[:10] = -1
+    probabilities = np.where(labels == -1, 0.0, 0.5)
+
+    scores = score_clustering(
+        embeddings, embeddings[20:21], labels, probabilities)
+
+    kept = labels != -1
+    assert set(scores) == {'silhouette', 'davies_bouldin', 'stability', 'relevance'}
+    assert scores['silhouette'] == pytest.approx(
+        silhouette_score(embeddings[kept], labels[kept]))
+    assert scores['davies_bouldin'] == pytest.approx(
+        -davies_bouldin_score(embeddings[kept], labels[kept]))
+    assert scores['stability'] == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        score_clustering(embeddings, embeddings[:1], np.full(
+            len(labels), -1), probabilities)
@@ -0,0 +1,66 @@
+import pytest
+from em_news_analysis import token_budget
+from em_news_analysis.token_budget import (
+    TokenBudget, count_tokens, get_encoding, get_token_budget, truncate_to_tokens)
+
+
+def test_article_budget_reserves_prompt_and_output():
+    budget = TokenBudget(context_tokens=1000, output_tokens=200,
+                         max_article_tokens=700, margin_tokens=50)
+
+    assert budget.article_tokens(prompt_tokens=100) == 650
+    assert budget.article_tokens(prompt_tokens=0) == 700
+    assert budget.article_tokens(prompt_tokens=5000) == 0
+
+
+def test_get_token_budget_applies_overrides():
+    assert get_token_budget("gpt-4o-mini", {"gpt-4o-mini": 1000}).max_article_tokens == 1000
+    assert get_token_budget("gpt-4o", {"gpt-4o-mini": 1000}).max_article_tokens == 30000
+
+
+def test_truncate_to_tokens():
+    if get_encoding("gpt-4o-mini") is None:
+        pytest.skip("tokenizer could not be loaded")
+    text = "Central bank raises rates again. " * 50
+
+    assert truncate_to_tokens("short", 10, "gpt-4o-mini") == "short"
+    truncated = truncate_to_tokens(text, 20, "gpt-4o-mini")
+    assert count_tokens(truncated, "gpt-4o-mini") == 20
+    assert text.startswith(truncated)
+
+
+def test_truncate_to_tokens_bounds_by_bytes_without_tokenizer(monkeypatch):
+    monkeypatch.setattr(token_budget, "get_encoding", lambda model: None)
+    text = "x" * 100
+    # Three UTF-8 bytes per character, and often one token each
+    cjk_text = "央行加息" * 10
+
+    assert count_tokens(text, "gpt-4o-mini") == 100
+    assert truncate_to_tokens(text, 10, "gpt-4o-mini") == "x" * 10
+    assert count_tokens(cjk_text, "gpt-4o-mini") == 120
+    assert truncate_to_tokens(cjk_text, 10, "gpt-4o-mini") == "央行加"
+
+
+def test_get_encoding_retries_after_a_failed_load(monkeypatch):
+    monkeypatch.setattr(token_budget, "_encodings", {})
+    monkeypatch.setattr(token_budget, "_encoding_failures", {})
+    encoding = object()
+    calls = []
+
+    def encoding_for_model(model):
+        calls.append(model)
+        if len(calls) == 1:
+            raise ConnectionError("Could not download the encoding")
+        return encoding
+
+    monkeypatch.setattr(token_budget.tiktoken, "encoding_for_model", encoding_for_model)
+
+    assert get_encoding("gpt-4o-mini") is None
+    # Within the retry interval the failure is reported without trying again
+    assert get_encoding("gpt-4o-mini") is None
+    assert len(calls) == 1
+
+    monkeypatch.setattr(token_budget, "ENCODING_RETRY_INTERVAL", 0.0)
+    assert get_encoding("gpt-4o-mini") is encoding
+    assert get_encoding("gpt-4o-mini") is encoding
+    assert len(calls) == 2